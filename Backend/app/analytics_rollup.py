@@ -0,0 +1,248 @@
+# SkillEdge-API/app/analytics_rollup.py
+"""
+Offline cohort rollups for platform-wide percentile comparisons.
+
+Streams interviews in batches, fetches each batch's verbal and non-verbal
+reports by interview id, groups skill scores by (role, interview_type) cohort
+and stores one compact histogram document per cohort in the
+`analytics_rollups` collection. Dashboards answer questions like
+"your communication score is top 20% for DevOps" with a single point lookup.
+
+Run periodically (e.g. nightly cron):
+    python -m app.analytics_rollup
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
+
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_collection,
+    get_interview_reports_collection,
+    get_verbal_reports_collection,
+    get_nonverbal_reports_collection,
+)
+from app.skill_scores import (
+    VERBAL_SKILLS,
+    NONVERBAL_SKILLS,
+    extract_verbal_skill_scores,
+    extract_nonverbal_skill_scores,
+)
+
+# Wildcard used for role / interview_type in the broader cohorts
+ALL = "*"
+
+# Scores are 0-100; one bin per integer point gives exact percentiles at 1-point resolution
+HISTOGRAM_BINS = 101
+
+ROLLUP_SKILLS = ["overall_score"] + VERBAL_SKILLS + NONVERBAL_SKILLS
+
+# Only the fields the score extractors read are pulled from Mongo
+VERBAL_PROJECTION = {
+    "_id": 0,
+    "interview_id": 1,
+    "overall_score": 1,
+    "metrics.response_structure": 1,
+    "metrics.vocabulary_richness": 1,
+    "metrics.domain_knowledge": 1,
+    "metrics.concepts_understanding": 1,
+    "metrics.answer_correctness": 1,
+    "metrics.depth_of_explanation": 1,
+}
+
+NONVERBAL_PROJECTION = {
+    "_id": 0,
+    "interview_id": 1,
+    "analytics.confidenceScores": 1,
+    "analytics.fillerWordsBreakdown": 1,
+    "analytics.speakingStats": 1,
+}
+
+SCAN_BATCH_SIZE = 1000
+
+
+def get_rollups_collection():
+    """Get cohort rollups collection"""
+    return get_collection("analytics_rollups")
+
+
+def normalize_role(role: Optional[str]) -> str:
+    """Normalize a free-text role so 'DevOps Engineer ' and 'devops engineer' share a cohort"""
+    return " ".join((role or "").lower().split()) or "unknown"
+
+
+def normalize_interview_type(interview_type: Optional[str]) -> str:
+    """Normalize an interview type for cohort keys"""
+    return (interview_type or "").strip().lower() or "unknown"
+
+
+def cohort_keys(role: str, interview_type: str) -> List[Tuple[str, str]]:
+    """All cohorts an interview contributes to, from most to least specific"""
+    return [
+        (role, interview_type),
+        (role, ALL),
+        (ALL, interview_type),
+        (ALL, ALL),
+    ]
+
+
+def _bin(score: float) -> int:
+    """Histogram bin for a 0-100 score"""
+    return max(0, min(HISTOGRAM_BINS - 1, int(round(score))))
+
+
+def percentile_from_histogram(histogram: List[int], score: float) -> Optional[float]:
+    """Percentile rank (0-100) of score in a histogram: share of samples below plus half of ties"""
+    total = sum(histogram)
+    if total == 0:
+        return None
+    b = _bin(score)
+    below = sum(histogram[:b])
+    return round(((below + histogram[b] / 2) / total) * 100, 1)
+
+
+class CohortAccumulator:
+    """In-memory histograms per (role, interview_type, skill) while scanning reports"""
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], Dict[str, List[int]]] = {}
+        self.sums: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def add(self, role: str, interview_type: str, skill: str, score: float):
+        """Record one score for every cohort the interview belongs to"""
+        for key in cohort_keys(role, interview_type):
+            skills = self.histograms.setdefault(key, {})
+            histogram = skills.setdefault(skill, [0] * HISTOGRAM_BINS)
+            histogram[_bin(score)] += 1
+            sums = self.sums.setdefault(key, {})
+            sums[skill] = sums.get(skill, 0.0) + score
+
+    def to_documents(self, computed_at: datetime) -> List[Dict[str, Any]]:
+        """Compact rollup documents, one per cohort"""
+        documents = []
+        for (role, interview_type), skills in self.histograms.items():
+            skill_docs = {}
+            for skill, histogram in skills.items():
+                count = sum(histogram)
+                skill_docs[skill] = {
+                    "count": count,
+                    "mean": round(self.sums[(role, interview_type)][skill] / count, 2),
+                    "histogram": histogram,
+                }
+            documents.append({
+                "role": role,
+                "interview_type": interview_type,
+                "skills": skill_docs,
+                "computed_at": computed_at,
+            })
+        return documents
+
+
+async def _interview_cohort_batches() -> AsyncIterator[Dict[str, Tuple[str, str]]]:
+    """Stream interview_id -> (role, interview_type) maps of up to SCAN_BATCH_SIZE interviews"""
+    interview_reports_collection = get_interview_reports_collection()
+    cursor = interview_reports_collection.find(
+        {},
+        {"_id": 1, "role": 1, "interview_type": 1}
+    ).batch_size(SCAN_BATCH_SIZE)
+
+    cohorts = {}
+    async for interview in cursor:
+        cohorts[str(interview["_id"])] = (
+            normalize_role(interview.get("role")),
+            normalize_interview_type(interview.get("interview_type")),
+        )
+        if len(cohorts) >= SCAN_BATCH_SIZE:
+            yield cohorts
+            cohorts = {}
+    if cohorts:
+        yield cohorts
+
+
+async def compute_cohort_rollups() -> Dict[str, Any]:
+    """Scan all reports, rebuild every cohort histogram and replace the rollup documents"""
+    start_time = time.time()
+    accumulator = CohortAccumulator()
+    scanned = {"interviews": 0, "verbal": 0, "nonverbal": 0}
+
+    # Join one batch of interviews at a time so memory doesn't grow with the number of interviews
+    async for interview_cohorts in _interview_cohort_batches():
+        scanned["interviews"] += len(interview_cohorts)
+        interview_ids = list(interview_cohorts)
+
+        verbal_cursor = get_verbal_reports_collection().find(
+            {"interview_id": {"$in": interview_ids}}, VERBAL_PROJECTION
+        ).batch_size(SCAN_BATCH_SIZE)
+        async for report in verbal_cursor:
+            scanned["verbal"] += 1
+            role, interview_type = interview_cohorts[report["interview_id"]]
+            scores = extract_verbal_skill_scores(report)
+            overall_score = report.get("overall_score")
+            if isinstance(overall_score, (int, float)):
+                scores["overall_score"] = overall_score
+            for skill, score in scores.items():
+                accumulator.add(role, interview_type, skill, score)
+
+        nonverbal_cursor = get_nonverbal_reports_collection().find(
+            {"interview_id": {"$in": interview_ids}}, NONVERBAL_PROJECTION
+        ).batch_size(SCAN_BATCH_SIZE)
+        async for report in nonverbal_cursor:
+            scanned["nonverbal"] += 1
+            role, interview_type = interview_cohorts[report["interview_id"]]
+            for skill, score in extract_nonverbal_skill_scores(report).items():
+                accumulator.add(role, interview_type, skill, score)
+
+    computed_at = datetime.utcnow()
+    documents = accumulator.to_documents(computed_at)
+
+    # Replace the previous rollup atomically per cohort, then drop cohorts that disappeared
+    rollups_collection = get_rollups_collection()
+    for document in documents:
+        await rollups_collection.replace_one(
+            {"role": document["role"], "interview_type": document["interview_type"]},
+            document,
+            upsert=True
+        )
+    await rollups_collection.delete_many({"computed_at": {"$lt": computed_at}})
+
+    elapsed = time.time() - start_time
+    print(f"📊 Cohort rollup: {len(documents)} cohorts from {scanned['verbal']} verbal / {scanned['nonverbal']} non-verbal reports in {elapsed:.2f}s")
+
+    return {
+        "cohorts": len(documents),
+        "interviews": scanned["interviews"],
+        "verbal_reports_scanned": scanned["verbal"],
+        "nonverbal_reports_scanned": scanned["nonverbal"],
+        "elapsed_seconds": round(elapsed, 2),
+    }
+
+
+async def get_cohort_rollup(role: Optional[str], interview_type: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Point lookup of the most specific available rollup for a role / interview type"""
+    rollups_collection = get_rollups_collection()
+    role_key = normalize_role(role) if role else ALL
+    type_key = normalize_interview_type(interview_type) if interview_type else ALL
+
+    for key_role, key_type in dict.fromkeys(cohort_keys(role_key, type_key)):
+        rollup = await rollups_collection.find_one(
+            {"role": key_role, "interview_type": key_type},
+            {"_id": 0}
+        )
+        if rollup:
+            return rollup
+    return None
+
+
+async def _main():
+    await connect_to_mongo()
+    try:
+        await compute_cohort_rollups()
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
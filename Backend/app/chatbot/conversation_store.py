@@ -0,0 +1,149 @@
+# SkillEdge-AI Chatbot Conversation Store
+"""
+MongoDB-backed conversation storage for the chatbot.
+
+One document per conversation ({_id: conversation_id, user_id, messages, ...}),
+indexed by (user_id, updated_at) so listing a user's conversations is a single
+indexed query. New messages are appended with $push instead of rewriting the
+conversation, and the append returns the updated document, so each turn works
+from what is actually stored. History is not cached in the worker: any worker
+may have written the latest turn, and compaction keeps documents small enough
+that the _id lookup is cheap.
+
+Long conversations are compacted: once a conversation holds more than
+COMPACTION_THRESHOLD messages, everything but the last CONTEXT_WINDOW_MESSAGES
+is folded into a rolling extractive summary and removed from the front of the
+stored messages. The compaction update only applies if summarized_messages is
+unchanged since the append, so concurrent turns (in any worker) neither lose
+messages nor fold the same messages twice.
+"""
+
+import os
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from app.database import get_chatbot_conversations_collection
+from app.chatbot.models import ConversationHistory, ChatMessage
+from app.chatbot.summarizer import summarize_messages
+
+logger = logging.getLogger(__name__)
+
+# Messages kept verbatim, and the size at which older messages get folded into the summary
+CONTEXT_WINDOW_MESSAGES = int(os.getenv("CHATBOT_CONTEXT_WINDOW_MESSAGES", "10"))
+COMPACTION_THRESHOLD = int(os.getenv("CHATBOT_COMPACTION_THRESHOLD", "20"))
+
+
+def _to_document(conversation: ConversationHistory) -> dict:
+    """Conversation model -> Mongo document"""
+    document = conversation.model_dump()
+    document["_id"] = document.pop("conversation_id")
+    return document
+
+
+def _from_document(document: dict) -> ConversationHistory:
+    """Mongo document -> conversation model"""
+    document = dict(document)
+    document["conversation_id"] = document.pop("_id")
+    return ConversationHistory(**document)
+
+
+class ConversationStore:
+    """Persistent conversation store"""
+
+    async def get(self, conversation_id: str) -> Optional[ConversationHistory]:
+        """Fetch a conversation"""
+        document = await get_chatbot_conversations_collection().find_one({"_id": conversation_id})
+        return _from_document(document) if document else None
+
+    async def create(self, conversation_id: str, user_id: str) -> ConversationHistory:
+        """Create and persist an empty conversation"""
+        conversation = ConversationHistory(
+            conversation_id=conversation_id,
+            user_id=user_id,
+            messages=[]
+        )
+        await get_chatbot_conversations_collection().insert_one(_to_document(conversation))
+        return conversation
+
+    async def append_messages(self, conversation_id: str, messages: List[ChatMessage]) -> Optional[ConversationHistory]:
+        """
+        Append messages to a conversation ($push only, the stored history is never rewritten).
+        
+        Compacts the conversation into its rolling summary when it grows past
+        COMPACTION_THRESHOLD. Returns the conversation as stored afterwards
+        (None if it was deleted meanwhile).
+        """
+        document = await get_chatbot_conversations_collection().find_one_and_update(
+            {"_id": conversation_id},
+            {
+                "$push": {"messages": {"$each": [m.model_dump() for m in messages]}},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            return None
+        
+        conversation = _from_document(document)
+        if len(conversation.messages) > COMPACTION_THRESHOLD:
+            conversation = await self._compact(conversation)
+        return conversation
+
+    async def _compact(self, conversation: ConversationHistory) -> Optional[ConversationHistory]:
+        """Fold all but the last CONTEXT_WINDOW_MESSAGES into the summary, unless another writer compacted first"""
+        folded = conversation.messages[:-CONTEXT_WINDOW_MESSAGES]
+        summary = summarize_messages(
+            conversation.summary,
+            [{"role": m.role, "content": m.content} for m in folded]
+        )
+        
+        # Messages appended concurrently land after the folded ones, so dropping
+        # exactly len(folded) from the front never loses them
+        expected = conversation.summarized_messages
+        document = await get_chatbot_conversations_collection().find_one_and_update(
+            {
+                "_id": conversation.conversation_id,
+                # Older documents have no counter yet (None also matches a missing field)
+                "summarized_messages": {"$in": [0, None]} if expected == 0 else expected,
+            },
+            [{"$set": {
+                "summary": summary,
+                "summarized_messages": {"$add": [{"$ifNull": ["$summarized_messages", 0]}, len(folded)]},
+                "messages": {"$slice": ["$messages", len(folded), {"$max": [1, {"$size": "$messages"}]}]},
+            }}],
+            return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            # Compacted by a concurrent turn; its result is what's stored
+            return await self.get(conversation.conversation_id)
+        
+        logger.info(f"Compacted {len(folded)} messages of conversation {conversation.conversation_id}")
+        return _from_document(document)
+
+    async def list_for_user(self, user_id: str, limit: int = 50) -> List[ConversationHistory]:
+        """A user's conversations, most recently updated first (uses the user_id/updated_at index)"""
+        cursor = get_chatbot_conversations_collection().find(
+            {"user_id": user_id}
+        ).sort("updated_at", -1).limit(limit)
+
+        documents = await cursor.to_list(length=limit)
+        return [_from_document(document) for document in documents]
+
+    async def delete(self, conversation_id: str, user_id: str) -> bool:
+        """Delete a user's conversation; returns False if it didn't exist"""
+        result = await get_chatbot_conversations_collection().delete_one(
+            {"_id": conversation_id, "user_id": user_id}
+        )
+        return result.deleted_count > 0
+
+
+# Global conversation store instance
+conversation_store = ConversationStore()
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get the conversation store instance"""
+    return conversation_store
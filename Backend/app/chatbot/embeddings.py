@@ -0,0 +1,170 @@
+# SkillEdge-AI Embedding Service
+"""
+Shared sentence embedding service.
+
+A single SentenceTransformer instance is shared by every retrieval path
+(chat, knowledge base search, ingestion). Concurrent async encode calls are
+coalesced by a micro-batcher into one forward pass, query embeddings are kept
+in a bounded LRU cache keyed by normalized text, and the CPU thread count used
+by torch is configurable.
+
+EMBEDDING_BACKEND=onnx swaps the PyTorch model for an exported ONNX model run
+by onnxruntime (see onnx_embeddings.py); the vectors are interchangeable.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from cachetools import LRUCache
+
+from app.chatbot.telemetry import record_cache
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIMENSION = 384  # all-MiniLM-L6-v2 embedding dimension
+
+# Micro-batching: flush when the batch is full or the oldest request waited this long
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "32"))
+MAX_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_MAX_BATCH_WAIT_MS", "5"))
+QUERY_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+NUM_THREADS = int(os.getenv("EMBEDDING_NUM_THREADS", "0"))  # 0 = torch default
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()  # torch | onnx
+
+
+def normalize_text(text: str) -> str:
+    """Cache key / model input normalization (the MiniLM tokenizer is uncased anyway)"""
+    return " ".join(text.lower().split())
+
+
+class EmbeddingService:
+    """Shared embedding model with async micro-batching and a query embedding cache"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND):
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown embedding backend {backend!r}, expected 'torch' or 'onnx'")
+        self.model_name = model_name
+        self.backend = backend
+        self.dimension = EMBEDDING_DIMENSION
+        self.model = None
+        self._load_lock = threading.Lock()
+        self._cache: LRUCache = LRUCache(maxsize=QUERY_CACHE_SIZE)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.batches = 0
+
+    def load(self):
+        """Load the model once (thread-safe)"""
+        if self.model is not None:
+            return
+        with self._load_lock:
+            if self.model is not None:
+                return
+
+            if self.backend == "onnx":
+                from app.chatbot.onnx_embeddings import OnnxEncoder
+
+                self.model = OnnxEncoder(num_threads=NUM_THREADS)
+                return
+
+            import torch
+            from sentence_transformers import SentenceTransformer
+
+            if NUM_THREADS > 0:
+                torch.set_num_threads(NUM_THREADS)
+            logger.info(f"Loading sentence transformer model ({torch.get_num_threads()} CPU threads)...")
+            self.model = SentenceTransformer(self.model_name)
+
+    def encode_batch(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Synchronously encode texts into L2-normalized float32 vectors (bulk / index building)"""
+        self.load()
+        if self.backend == "onnx":
+            return self.model.encode(texts, batch_size=batch_size)
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings.astype("float32")
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Encode one query, coalescing concurrent calls into a single forward pass"""
+        key = normalize_text(text)
+        cached = self._cache.get(key)
+        record_cache("embedding", cached is not None)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, future))
+        return await future
+
+    def _ensure_worker(self):
+        """Start the batching worker on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._batch_worker())
+
+    async def _batch_worker(self):
+        """Collect queued requests into batches and encode each batch off the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[str, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + MAX_BATCH_WAIT_MS / 1000
+            while len(batch) < MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Identical queries in the same batch are encoded once
+            texts = list(dict.fromkeys(key for key, _ in batch))
+            try:
+                embeddings = await asyncio.to_thread(self.encode_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            vectors = dict(zip(texts, embeddings))
+            for key, vector in vectors.items():
+                vector.setflags(write=False)
+                self._cache[key] = vector
+            for key, future in batch:
+                if not future.done():
+                    future.set_result(vectors[key])
+
+    def stats(self) -> dict:
+        """Cache and batching counters"""
+        return {
+            "backend": self.backend,
+            "cache_size": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "batches": self.batches,
+        }
+
+
+# Global embedding service instance
+embedding_service = EmbeddingService()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the shared embedding service instance"""
+    return embedding_service
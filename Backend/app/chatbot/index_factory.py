@@ -0,0 +1,129 @@
+# SkillEdge-AI Chatbot Index Factory
+"""
+Configurable FAISS index construction for the knowledge base.
+
+CHATBOT_INDEX_TYPE selects the index:
+    flat  - IndexFlatIP, exact search, linear in corpus size (default)
+    hnsw  - IndexHNSWFlat graph index, sub-millisecond search, keeps full vectors
+    ivfpq - IndexIVFPQ, coarse clustering + product quantization, bounded memory
+            (48 bytes per vector instead of 1.5 KB); needs training
+
+Approximate indexes only pay off past a few thousand vectors, so below
+CHATBOT_INDEX_MIN_VECTORS the knowledge base stays on a flat index. Once an
+ingest pushes it past the threshold, upgrade_index rebuilds it as the
+configured type, training IVF-PQ on the vectors held by the flat index.
+
+Use benchmarks/bench_index.py for a recall/latency comparison against flat.
+Filtered searches pass an IDSelector through SearchParameters, so filters are
+applied inside the index rather than to its results.
+"""
+
+import os
+import math
+import logging
+from typing import Iterable, Optional, Tuple
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPE = os.getenv("CHATBOT_INDEX_TYPE", "flat").lower()
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+MIN_VECTORS = int(os.getenv("CHATBOT_INDEX_MIN_VECTORS", "5000"))
+
+# HNSW graph degree and search/construction beam widths
+HNSW_M = int(os.getenv("CHATBOT_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("CHATBOT_HNSW_EF_CONSTRUCTION", "80"))
+HNSW_EF_SEARCH = int(os.getenv("CHATBOT_HNSW_EF_SEARCH", "64"))
+
+# IVF-PQ: sub-quantizers (must divide the dimension), bits per code, inverted lists probed per query
+PQ_M = int(os.getenv("CHATBOT_PQ_M", "48"))
+PQ_NBITS = 8
+IVF_NPROBE = int(os.getenv("CHATBOT_IVF_NPROBE", "16"))
+
+
+def index_kind(index) -> str:
+    """Which of INDEX_TYPES an index is"""
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivfpq"
+    return "flat"
+
+
+def _ivf_nlist(n: int) -> int:
+    """Inverted list count: ~4*sqrt(n), keeping at least 39 training points per centroid"""
+    return max(1, min(int(4 * math.sqrt(n)), n // 39))
+
+
+def build_index(embeddings: np.ndarray, index_type: str = INDEX_TYPE):
+    """
+    Build and fill an inner-product index over L2-normalized embeddings.
+
+    Falls back to flat when the corpus is below MIN_VECTORS (or too small to train on).
+    """
+    n, dimension = embeddings.shape
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {index_type!r}, expected one of {INDEX_TYPES}")
+    if index_type != "flat" and n < MIN_VECTORS:
+        index_type = "flat"
+
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    elif index_type == "ivfpq":
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFPQ(quantizer, dimension, _ivf_nlist(n), PQ_M, PQ_NBITS, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+    else:
+        index = faiss.IndexFlatIP(dimension)
+
+    index.add(embeddings)
+    configure_search(index)
+    logger.info(f"Built {index_kind(index)} FAISS index with {index.ntotal} vectors")
+    return index
+
+
+def configure_search(index):
+    """Apply search-time parameters (not all of them survive serialization)"""
+    kind = index_kind(index)
+    if kind == "hnsw":
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+    elif kind == "ivfpq":
+        index.nprobe = IVF_NPROBE
+    return index
+
+
+def upgrade_index(index, index_type: str = INDEX_TYPE):
+    """
+    Rebuild a flat index as index_type once it holds enough vectors.
+
+    Returns the index to use (the same object when no rebuild is needed).
+    Only flat indexes hold the exact vectors needed for a rebuild, so an
+    index that has already been upgraded is returned unchanged.
+    """
+    if index_type == "flat" or index_kind(index) != "flat" or index.ntotal < MIN_VECTORS:
+        return index
+
+    embeddings = index.reconstruct_n(0, index.ntotal)
+    logger.info(f"Upgrading flat FAISS index ({index.ntotal} vectors) to {index_type}")
+    return build_index(embeddings, index_type)
+
+
+def search(index, query: np.ndarray, k: int, ids: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """index.search, restricted to ids (when given) with an IDSelector"""
+    if ids is None:
+        return index.search(query, k)
+
+    # The selector must stay referenced for the duration of the search
+    ids = np.ascontiguousarray(ids, dtype="int64") if isinstance(ids, np.ndarray) else np.fromiter(ids, dtype="int64")
+    selector = faiss.IDSelectorBatch(ids)
+    kind = index_kind(index)
+    if kind == "hnsw":
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=HNSW_EF_SEARCH)
+    elif kind == "ivfpq":
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=IVF_NPROBE)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+    return index.search(query, k, params=params)
@@ -0,0 +1,160 @@
+# SkillEdge-AI Knowledge Base Ingestion
+"""
+Bulk ingestion of documents into the chatbot knowledge base.
+
+Markdown, plain text and JSON documents (including QA_dataset.json) are split
+into overlapping word-window chunks, which are then embedded in large batches
+and added to the FAISS index in one call with a single snapshot at the end.
+
+CLI (stop the API server first, it keeps its own in-memory copy of the index):
+
+    python -m app.chatbot.ingestion QA_dataset.json docs/faq.md --category faq
+"""
+
+import os
+import re
+import json
+import asyncio
+import argparse
+import logging
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_WORDS = int(os.getenv("CHATBOT_CHUNK_WORDS", "180"))
+CHUNK_OVERLAP_WORDS = int(os.getenv("CHATBOT_CHUNK_OVERLAP_WORDS", "40"))
+
+_MARKDOWN_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+def chunk_text(text: str, chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> List[str]:
+    """Split text into windows of chunk_words words, consecutive windows sharing overlap_words"""
+    words = text.split()
+    if not words:
+        return []
+    if len(words) <= chunk_words:
+        return [" ".join(words)]
+
+    step = max(chunk_words - overlap_words, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+
+def _entries(chunks: List[str], category: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "content": chunk,
+            "category": category,
+            "metadata": {**metadata, "chunk": i, "chunks": len(chunks)}
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def parse_text(text: str, category: str, metadata: Dict[str, Any], chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> List[Dict[str, Any]]:
+    """Plain text document -> knowledge base entries"""
+    return _entries(chunk_text(text, chunk_words, overlap_words), category, metadata)
+
+
+def parse_markdown(text: str, category: str, metadata: Dict[str, Any], chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> List[Dict[str, Any]]:
+    """Markdown document -> entries, chunked per section so chunks don't straddle headings"""
+    headings = list(_MARKDOWN_HEADING.finditer(text))
+    sections = []
+    if not headings or headings[0].start() > 0:
+        sections.append((None, text[:headings[0].start()] if headings else text))
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        sections.append((heading.group(2), text[heading.end():end]))
+
+    entries = []
+    for title, body in sections:
+        chunks = chunk_text(body, chunk_words, overlap_words)
+        if title:
+            # Keep the heading with every chunk of its section for retrieval context
+            chunks = [f"{title}: {chunk}" for chunk in chunks]
+        section_metadata = {**metadata, "section": title} if title else metadata
+        entries.extend(_entries(chunks, category, section_metadata))
+    return entries
+
+
+def parse_json(data: Any, category: str, metadata: Dict[str, Any], chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> List[Dict[str, Any]]:
+    """
+    JSON document -> entries.
+
+    Accepts a list of interview Q&A items ({question, answer, tag}, the
+    QA_dataset.json format) or of knowledge base entries ({content, category,
+    metadata}), optionally wrapped as {"entries": [...]}.
+    """
+    if isinstance(data, dict):
+        data = data.get("entries") or data.get("documents") or [data]
+
+    entries = []
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        if "question" in item and "answer" in item:
+            chunks = chunk_text(item["answer"], chunk_words, overlap_words)
+            chunks = [f"Q: {item['question']}\nA: {chunk}" for chunk in chunks]
+            item_metadata = {**metadata, "type": "interview_qa", "question": item["question"]}
+            if item.get("tag"):
+                item_metadata["role"] = item["tag"]
+            entries.extend(_entries(chunks, item.get("category") or "interview_qa", item_metadata))
+        elif "content" in item:
+            chunks = chunk_text(item["content"], chunk_words, overlap_words)
+            item_metadata = {**metadata, **(item.get("metadata") or {})}
+            entries.extend(_entries(chunks, item.get("category") or category, item_metadata))
+    return entries
+
+
+def parse_document(content: str, format: str, category: str, metadata: Dict[str, Any], chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> List[Dict[str, Any]]:
+    """Dispatch on document format ("text", "markdown" or "json")"""
+    if format == "markdown":
+        return parse_markdown(content, category, metadata, chunk_words, overlap_words)
+    if format == "json":
+        return parse_json(json.loads(content), category, metadata, chunk_words, overlap_words)
+    return parse_text(content, category, metadata, chunk_words, overlap_words)
+
+
+def load_file(path: str, category: str = "general", chunk_words: int = CHUNK_WORDS, overlap_words: int = CHUNK_OVERLAP_WORDS) -> List[Dict[str, Any]]:
+    """Read a document from disk, picking the format from its extension"""
+    extension = os.path.splitext(path)[1].lower()
+    format = {".md": "markdown", ".markdown": "markdown", ".json": "json"}.get(extension, "text")
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    return parse_document(content, format, category, {"source": os.path.basename(path)}, chunk_words, overlap_words)
+
+
+async def _ingest_files(paths: List[str], category: str, chunk_words: int, overlap_words: int):
+    from app.chatbot.service import get_chatbot_service
+
+    entries = []
+    for path in paths:
+        file_entries = load_file(path, category, chunk_words, overlap_words)
+        print(f"📄 {path}: {len(file_entries)} chunks")
+        entries.extend(file_entries)
+
+    chatbot = get_chatbot_service()
+    added = await chatbot.add_many_to_knowledge_base(entries)
+    print(f"✅ Added {added} chunks ({len(entries) - added} duplicates skipped); knowledge base now has {len(chatbot.knowledge_base)} entries")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bulk-ingest documents into the chatbot knowledge base")
+    parser.add_argument("paths", nargs="+", help="Markdown, text or JSON files (e.g. QA_dataset.json)")
+    parser.add_argument("--category", default="general", help="Category for entries that don't define one")
+    parser.add_argument("--chunk-words", type=int, default=CHUNK_WORDS)
+    parser.add_argument("--overlap-words", type=int, default=CHUNK_OVERLAP_WORDS)
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    asyncio.run(_ingest_files(args.paths, args.category, args.chunk_words, args.overlap_words))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# SkillEdge-AI Chatbot Intent Router
+"""
+Local intent routing for chat messages that don't need the LLM.
+
+Each intent is described by a handful of example phrasings. Their embeddings
+(from the shared embedding service) are averaged into one centroid per
+intent, and a message is assigned to the nearest centroid when its cosine
+similarity clears CHATBOT_INTENT_THRESHOLD. The query embedding is computed
+anyway for retrieval, so classification is one small matrix product.
+
+Greetings, thanks, platform FAQs and stat lookups ("what was my WPM?") are
+answered from templates, with stats read straight from the report fields.
+"""
+
+import os
+import logging
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.skill_scores import IDEAL_WPM, get_words_per_minute, get_filler_percentage
+
+logger = logging.getLogger(__name__)
+
+INTENT_THRESHOLD = float(os.getenv("CHATBOT_INTENT_THRESHOLD", "0.72"))
+
+# Intents only routed for short messages; longer ones usually carry a real question
+SHORT_MESSAGE_WORDS = 6
+
+INTENT_EXAMPLES: Dict[str, List[str]] = {
+    "greeting": ["hi", "hello", "hey there", "good morning", "good evening", "how are you", "what's up"],
+    "thanks": ["thanks", "thank you so much", "ok great", "okay got it", "alright, sure", "that helps, thanks"],
+    "faq_interview_types": [
+        "what interview types are there",
+        "what kinds of interviews does skilledge offer",
+        "which interviews can I practice",
+    ],
+    "faq_reports": [
+        "what reports do I get after an interview",
+        "what is in the verbal and non-verbal report",
+        "which reports does the platform generate",
+    ],
+    "faq_getting_started": [
+        "how do I get started",
+        "how do I use skilledge",
+        "how do I start an interview",
+    ],
+    "stat_wpm": [
+        "what was my wpm",
+        "how fast did I speak",
+        "what was my speaking pace",
+        "how many words per minute did I say",
+    ],
+    "stat_filler_words": [
+        "how many filler words did I use",
+        "what was my filler word percentage",
+        "did I say um a lot",
+    ],
+    "stat_speaking_time": [
+        "how long did I speak",
+        "what was my total speaking time",
+        "how many words did I say in total",
+    ],
+    "stat_scores": [
+        "what was my overall score",
+        "what are my scores",
+        "how did I score in my last interview",
+    ],
+    "stat_confidence": [
+        "what was my confidence score",
+        "how confident did I sound",
+    ],
+}
+
+SHORT_INTENTS = {"greeting", "thanks"}
+REPORT_INTENTS = {"stat_wpm", "stat_filler_words", "stat_speaking_time", "stat_scores", "stat_confidence"}
+
+FAQ_ANSWERS = {
+    "faq_interview_types": "SkillEdge-AI offers three interview types:\n\n• **Technical** - programming and technical skills\n• **Behavioral** - soft skills and personality fit\n• **Resume-based** - your professional background and experience\n\nPick the one that matches what you're preparing for!",
+    "faq_reports": "After each interview you get three reports:\n\n• **Verbal Report** - answer correctness, depth and domain knowledge\n• **Non-Verbal Report** - speaking pace, filler words, confidence and clarity\n• **Overall Report** - both combined, with actionable recommendations",
+    "faq_getting_started": "Getting started is easy:\n\n1. Create your profile with your professional details\n2. Choose an interview type\n3. Complete the AI-powered interview\n4. Review your reports and recommendations\n5. Practice regularly and track your progress",
+}
+
+GENERAL_GREETING = "Hi! I'm the SkillEdge-AI Assistant. Ask me anything about the platform - interview types, reports, or how to get started. Switch to Report Analysis mode for insights on your own interviews."
+REPORT_GREETING = "Hi! I'm here to help you analyze your interview performance. You can ask me specific questions about your reports, like:\n\n• 'Why did I score low on verbal skills?'\n• 'How can I improve my speaking pace?'\n• 'What was my WPM?'\n• 'Give me tips based on my performance'\n\nWhat would you like to know about your interview results?"
+THANKS_REPLY = "Great! Feel free to ask me any specific questions about your interview performance. I can help explain your scores, identify areas for improvement, or provide personalized recommendations based on your reports."
+
+
+def _analytics(user_reports: Dict[str, Any]) -> Dict[str, Any]:
+    return (user_reports.get("nonverbal_report") or {}).get("analytics") or {}
+
+
+def _stat_answer(intent: str, user_reports: Dict[str, Any]) -> Optional[str]:
+    """Templated answer computed from report fields; None if the fields are missing"""
+    analytics = _analytics(user_reports)
+
+    if intent == "stat_wpm":
+        wpm = get_words_per_minute(analytics)
+        if wpm is None:
+            return None
+        if wpm > IDEAL_WPM + 20:
+            verdict = "a bit fast - try pausing between key points"
+        elif wpm < IDEAL_WPM - 20:
+            verdict = "a bit slow - aim for a slightly more energetic pace"
+        else:
+            verdict = "right around the ideal pace"
+        return f"In your latest interview you spoke at about **{wpm:.0f} words per minute**. The ideal is around {IDEAL_WPM} WPM, so that's {verdict}."
+
+    if intent == "stat_filler_words":
+        filler_pct = get_filler_percentage(analytics)
+        if filler_pct is None:
+            return None
+        detected = (analytics.get("fillerWordsBreakdown") or {}).get("detectedWords") or {}
+        top = [f"'{w}' ({c}x)" for w, c in Counter({w: c for w, c in detected.items() if isinstance(c, int) and c > 0}).most_common(3)]
+        most_used = f" Your most frequent were {', '.join(top)}." if top else ""
+        advice = " That's excellent!" if filler_pct < 2 else " Try replacing fillers with a short pause." if filler_pct >= 5 else ""
+        return f"Filler words made up **{filler_pct:g}%** of your words in your latest interview.{most_used}{advice}"
+
+    if intent == "stat_speaking_time":
+        speaking = analytics.get("speakingStats") or {}
+        seconds, words = speaking.get("totalSpeakingTime"), speaking.get("totalWordsSpoken")
+        if not isinstance(seconds, (int, float)) or not isinstance(words, (int, float)):
+            return None
+        return f"In your latest interview you spoke for **{seconds / 60:.1f} minutes** and said **{words:g} words** in total."
+
+    if intent == "stat_scores":
+        overall = user_reports.get("overall_report") or {}
+        parts = [
+            f"• {label}: **{overall[key]:g}/100**"
+            for key, label in (("overall_score", "Overall"), ("verbal_score", "Verbal"), ("nonverbal_score", "Non-verbal"))
+            if isinstance(overall.get(key), (int, float))
+        ]
+        if not parts:
+            return None
+        readiness = f"\n\nInterview readiness: **{overall['interview_readiness']}**" if overall.get("interview_readiness") else ""
+        return "Here are the scores from your latest interview:\n\n" + "\n".join(parts) + readiness
+
+    if intent == "stat_confidence":
+        confidence = (analytics.get("confidenceScores") or {}).get("overallConfidence")
+        if not isinstance(confidence, (int, float)):
+            return None
+        return f"Your overall confidence score in your latest interview was **{confidence:g}/100**."
+
+    return None
+
+
+class IntentRouter:
+    """Nearest-centroid intent classifier over the shared sentence embeddings"""
+
+    def __init__(self, embedding_service, threshold: float = INTENT_THRESHOLD):
+        self.embedding_service = embedding_service
+        self.threshold = threshold
+        self.intents: List[str] = []
+        self.centroids: Optional[np.ndarray] = None
+        self.routed: Counter = Counter()
+        self.fallthrough = 0
+
+    def load(self):
+        """Embed the intent examples and build one normalized centroid per intent (blocking)"""
+        self.intents = list(INTENT_EXAMPLES)
+        centroids = []
+        for intent in self.intents:
+            embeddings = self.embedding_service.encode_batch(INTENT_EXAMPLES[intent])
+            centroid = embeddings.mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+        self.centroids = np.vstack(centroids).astype("float32")
+
+    def classify(self, query: str, query_embedding: np.ndarray) -> Optional[Tuple[str, float]]:
+        """(intent, similarity) of the nearest centroid, or None below the threshold"""
+        if self.centroids is None:
+            return None
+        similarities = self.centroids @ query_embedding
+        best = int(np.argmax(similarities))
+        intent, similarity = self.intents[best], float(similarities[best])
+        if similarity < self.threshold:
+            return None
+        if intent in SHORT_INTENTS and len(query.split()) > SHORT_MESSAGE_WORDS:
+            return None
+        return intent, similarity
+
+    def route(self, query: str, query_embedding: np.ndarray, user_reports: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Templated answer for the message, or None when it should go to the LLM"""
+        match = self.classify(query, query_embedding)
+        answer = None
+        if match is not None:
+            intent, _ = match
+            if intent == "greeting":
+                answer = REPORT_GREETING if user_reports else GENERAL_GREETING
+            elif intent == "thanks":
+                answer = THANKS_REPLY
+            elif intent in FAQ_ANSWERS:
+                answer = FAQ_ANSWERS[intent]
+            elif intent in REPORT_INTENTS and user_reports:
+                answer = _stat_answer(intent, user_reports)
+
+        if answer is None:
+            self.fallthrough += 1
+        else:
+            self.routed[match[0]] += 1
+            logger.info(f"Routed message to intent {match[0]} ({match[1]:.2f})")
+        return answer
+
+    def stats(self) -> Dict[str, Any]:
+        """Routing counters (messages answered locally vs. sent on to the LLM)"""
+        routed = sum(self.routed.values())
+        total = routed + self.fallthrough
+        return {
+            "routed": dict(self.routed),
+            "fallthrough": self.fallthrough,
+            "routed_share": round(routed / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,396 @@
+# SkillEdge-AI Knowledge Base Store
+"""
+Crash-safe persistence for the chatbot knowledge base and its FAISS index.
+
+New entries are appended (with their embedding) to a JSONL journal and fsynced,
+which costs the same no matter how large the knowledge base is. Every
+COMPACT_EVERY journal records the in-memory index and entries are written out
+as a new snapshot generation and the journal is trimmed.
+
+Snapshots are never modified in place: each generation is written to temp
+files, fsynced and renamed into place, and only then does an atomic rename of
+manifest.json make it current. A crash at any point leaves the previous
+snapshot plus the journal, which is replayed on startup (a torn final journal
+line is ignored).
+
+Snapshot entries are stored column-style rather than pickled: a .npy table of
+int64 byte offsets and a blob of concatenated UTF-8 JSON entries, where entry
+i is FAISS id i. Both files (and the FAISS index, when the installed faiss
+supports it) are memory-mapped, so startup cost doesn't grow with the
+knowledge base, workers share the same page cache, and an entry is only
+decoded when a search returns it. The BM25 index (app.chatbot.retrieval) is
+written alongside as numpy posting arrays and memory-mapped the same way.
+
+Sequence numbers and generations are allocated from in-memory state, so there
+is a single writer process per knowledge base directory: the first process to
+write takes an exclusive lock on writer.lock and holds it until it exits. It
+re-reads the manifest and journal once it has the lock and refuses to write if
+another process changed them since it loaded. Other processes (extra API
+workers, the ingestion CLI while the API owns the lock) can read but get a
+RuntimeError on write.
+"""
+
+import io
+import os
+import json
+import mmap
+import base64
+import pickle
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+
+import faiss
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from app.chatbot.retrieval import LexicalIndex
+
+logger = logging.getLogger(__name__)
+
+COMPACT_EVERY = int(os.getenv("CHATBOT_KB_COMPACT_EVERY", "100"))
+INDEX_MMAP = os.getenv("CHATBOT_INDEX_MMAP", "true").lower() == "true"
+
+# Memory-mapped flat indexes need faiss >= 1.10; older versions only mmap IVF lists
+_MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+# Pre-journal layout (single files rewritten on every add)
+LEGACY_INDEX_FILE = "skilledge.index"
+LEGACY_KB_FILE = "knowledge_base.pkl"
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write a file via temp file + fsync + rename, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _lock_exclusive(f):
+    """Take a non-blocking exclusive lock on an open file; OSError if another process holds it"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+def _encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype="float32").tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype="float32")
+
+
+def _encode_entry(entry: Dict[str, Any]) -> bytes:
+    return json.dumps(entry, default=str, ensure_ascii=False).encode("utf-8")
+
+
+class KnowledgeBaseEntries:
+    """
+    Knowledge base entries, indexed like the FAISS index.
+
+    Entries from the snapshot live in a memory-mapped offsets table + blob;
+    entries added since are kept encoded in memory. Indexing decodes a fresh
+    dict, so callers may modify what they get back.
+    """
+
+    def __init__(self, offsets: Optional[np.ndarray] = None, blob=b""):
+        self._offsets = offsets if offsets is not None else np.zeros(1, dtype="int64")
+        self._blob = blob
+        self._base = len(self._offsets) - 1
+        self._tail: List[bytes] = []
+
+    @classmethod
+    def open(cls, offsets_file: str, blob_file: str) -> "KnowledgeBaseEntries":
+        """Memory-map a snapshot"""
+        offsets = np.load(offsets_file, mmap_mode="r")
+        blob = b""
+        if os.path.getsize(blob_file) > 0:
+            with open(blob_file, "rb") as f:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(offsets, blob)
+
+    @classmethod
+    def from_list(cls, entries: Iterable[Dict[str, Any]]) -> "KnowledgeBaseEntries":
+        kb = cls()
+        kb.extend(entries)
+        return kb
+
+    def __len__(self) -> int:
+        return self._base + len(self._tail)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self)
+        if i < self._base:
+            return json.loads(self._blob[int(self._offsets[i]):int(self._offsets[i + 1])])
+        return json.loads(self._tail[i - self._base])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def append(self, entry: Dict[str, Any]):
+        self._tail.append(_encode_entry(entry))
+
+    def extend(self, entries: Iterable[Dict[str, Any]]):
+        self._tail.extend(_encode_entry(entry) for entry in entries)
+
+    def serialize(self) -> Tuple[bytes, bytes]:
+        """(offsets .npy bytes, blob bytes) for a new snapshot; the mapped part is copied as-is"""
+        base_end = int(self._offsets[-1])
+        tail_offsets = base_end + np.cumsum([len(b) for b in self._tail], dtype="int64")
+        offsets = np.concatenate([np.asarray(self._offsets, dtype="int64"), tail_offsets])
+
+        buffer = io.BytesIO()
+        np.save(buffer, offsets)
+        blob = bytes(self._blob[:base_end]) + b"".join(self._tail)
+        return buffer.getvalue(), blob
+
+
+class KnowledgeBaseStore:
+    """Journal + snapshot persistence for (FAISS index, knowledge base entries)"""
+
+    def __init__(self, index_path: str, knowledge_base_path: str, compact_every: int = COMPACT_EVERY):
+        self.index_path = index_path
+        self.knowledge_base_path = knowledge_base_path
+        self.compact_every = compact_every
+        self.manifest_file = os.path.join(knowledge_base_path, "manifest.json")
+        self.journal_file = os.path.join(knowledge_base_path, "journal.jsonl")
+        self.writer_lock_file = os.path.join(knowledge_base_path, "writer.lock")
+        self._writer_file = None  # held open (and locked) for the life of the process once it writes
+        self._writer_lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self.snapshot_seq = 0  # last journal sequence number included in the current snapshot
+        self.seq = 0  # last journal sequence number written
+        self.generation = 0  # snapshot generation currently installed
+        self._captured_generation = 0
+        self.index_mmapped = False
+        self.lexical_file: Optional[str] = None  # BM25 arrays of the current snapshot, if it has them
+
+    @property
+    def pending(self) -> int:
+        """Journal records not yet folded into a snapshot"""
+        return self.seq - self.snapshot_seq
+
+    def needs_compaction(self) -> bool:
+        return self.pending >= self.compact_every
+
+    def load(self) -> Optional[Tuple[Any, KnowledgeBaseEntries]]:
+        """Load the latest snapshot and replay the journal; None if nothing is stored"""
+        manifest = self._read_manifest()
+        if manifest is None:
+            return None
+        self.snapshot_seq = self.seq = manifest["seq"]
+        self.generation = self._captured_generation = manifest["generation"]
+        if manifest.get("lexical_file"):
+            self.lexical_file = os.path.join(self.knowledge_base_path, manifest["lexical_file"])
+
+        pending = [r for r in self._read_journal() if r["seq"] > self.snapshot_seq]
+        # Journal replay adds to the index, which needs a private (non-mapped) copy
+        index = self._read_index(os.path.join(self.index_path, manifest["index_file"]), mmap_index=INDEX_MMAP and not pending)
+
+        if "kb_file" in manifest:
+            # Pickled snapshot from before the columnar format; rewritten on the next snapshot
+            with open(os.path.join(self.knowledge_base_path, manifest["kb_file"]), "rb") as f:
+                entries = KnowledgeBaseEntries.from_list(pickle.load(f))
+        else:
+            entries = KnowledgeBaseEntries.open(
+                os.path.join(self.knowledge_base_path, manifest["offsets_file"]),
+                os.path.join(self.knowledge_base_path, manifest["blob_file"])
+            )
+
+        for record in pending:
+            entries.append(record["entry"])
+            index.add(_decode_vector(record["embedding"]).reshape(1, -1))
+            self.seq = record["seq"]
+
+        if pending:
+            logger.info(f"Replayed {len(pending)} knowledge base journal records")
+        return index, entries
+
+    def load_lexical(self, entries: KnowledgeBaseEntries) -> Optional[LexicalIndex]:
+        """
+        Memory-map the snapshot's BM25 index and add the journal-replayed entries.
+
+        None for snapshots written before the BM25 index was persisted; it is
+        then built on first search and included in the next snapshot.
+        """
+        if self.lexical_file is None or not os.path.exists(self.lexical_file):
+            return None
+        lexical = LexicalIndex.open(self.lexical_file)
+        for i in range(len(lexical), len(entries)):
+            lexical.add(entries[i])
+        return lexical
+
+    def _ensure_writer(self):
+        """
+        Make this process the knowledge base's single writer (blocking).
+
+        Raises RuntimeError if another process holds the writer lock, or if the
+        files changed since this process loaded them (its seq / generation
+        would collide and its snapshot would drop the other writer's entries).
+        """
+        with self._writer_lock:
+            if self._writer_file is not None:
+                return
+            os.makedirs(self.knowledge_base_path, exist_ok=True)
+            f = open(self.writer_lock_file, "a+")
+            try:
+                _lock_exclusive(f)
+            except OSError:
+                f.close()
+                raise RuntimeError(
+                    f"Knowledge base in {self.knowledge_base_path} is being written by another process; "
+                    "send writes to that process or stop it first"
+                )
+
+            # Re-read under the lock: a previous writer may have moved the files on
+            manifest = self._read_manifest() or {"generation": 0, "seq": 0}
+            journal_seq = max((r["seq"] for r in self._read_journal()), default=0)
+            if manifest["generation"] != self.generation or max(manifest["seq"], journal_seq) != self.seq:
+                f.close()
+                raise RuntimeError(
+                    f"Knowledge base in {self.knowledge_base_path} changed on disk since this process loaded it; "
+                    "restart it before writing"
+                )
+            self._writer_file = f
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file) as f:
+                return json.load(f)
+        if os.path.exists(os.path.join(self.index_path, LEGACY_INDEX_FILE)) and os.path.exists(os.path.join(self.knowledge_base_path, LEGACY_KB_FILE)):
+            return {"generation": 0, "seq": 0, "index_file": LEGACY_INDEX_FILE, "kb_file": LEGACY_KB_FILE}
+        return None
+
+    def _read_index(self, index_file: str, mmap_index: bool):
+        if mmap_index:
+            try:
+                index = faiss.read_index(index_file, _MMAP_FLAGS)
+                self.index_mmapped = True
+                return index
+            except RuntimeError as e:
+                logger.warning(f"Could not memory-map FAISS index, reading it instead: {e}")
+        self.index_mmapped = False
+        return faiss.read_index(index_file)
+
+    def writable_index(self, index):
+        """Private in-memory copy of a memory-mapped index, made once before the first add"""
+        if self.index_mmapped:
+            index = faiss.deserialize_index(faiss.serialize_index(index))
+            self.index_mmapped = False
+        return index
+
+    def _read_journal(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.journal_file):
+            return []
+        records = []
+        with open(self.journal_file) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn write from a crash mid-append
+                    logger.warning("Skipping incomplete knowledge base journal record")
+        return records
+
+    def append(self, entry: Dict[str, Any], embedding: np.ndarray) -> int:
+        """Durably journal one entry (blocking; call off the event loop). Returns its sequence number"""
+        self._ensure_writer()
+        with self._journal_lock:
+            seq = self.seq + 1
+            record = {"seq": seq, "entry": entry, "embedding": _encode_vector(embedding)}
+            with open(self.journal_file, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.seq = seq
+            return seq
+
+    def capture(self, index, entries: KnowledgeBaseEntries,
+                lexical: Optional[LexicalIndex] = None) -> Tuple[bytes, bytes, bytes, bytes, int, int]:
+        """
+        Serialize the in-memory state as of the last journaled record.
+
+        The caller must make sure no entry is being added while this runs. A
+        missing BM25 index is built from the entries (once, for snapshots
+        from before it was persisted).
+        Returns (index bytes, offsets bytes, blob bytes, lexical bytes, journal seq, snapshot generation).
+        """
+        self._ensure_writer()
+        index_bytes = faiss.serialize_index(index).tobytes()
+        offsets_bytes, blob_bytes = entries.serialize()
+        lexical_bytes = (lexical if lexical is not None else LexicalIndex.build(entries)).serialize()
+        self._captured_generation += 1
+        return index_bytes, offsets_bytes, blob_bytes, lexical_bytes, self.seq, self._captured_generation
+
+    def write_snapshot(self, index_bytes: bytes, offsets_bytes: bytes, blob_bytes: bytes, lexical_bytes: bytes,
+                       seq: int, generation: int):
+        """Install a captured snapshot as the current generation and trim the journal (blocking)"""
+        self._ensure_writer()
+        with self._snapshot_lock:
+            if generation <= self.generation:
+                # A newer capture has already been written
+                return
+
+            index_name = f"skilledge.{generation}.index"
+            offsets_name = f"knowledge_base.{generation}.offsets.npy"
+            blob_name = f"knowledge_base.{generation}.blob"
+            lexical_name = f"knowledge_base.{generation}.lexical"
+            _write_atomic(os.path.join(self.index_path, index_name), index_bytes)
+            _write_atomic(os.path.join(self.knowledge_base_path, offsets_name), offsets_bytes)
+            _write_atomic(os.path.join(self.knowledge_base_path, blob_name), blob_bytes)
+            _write_atomic(os.path.join(self.knowledge_base_path, lexical_name), lexical_bytes)
+
+            # The manifest rename is the commit point of the new generation
+            manifest = {
+                "generation": generation,
+                "seq": seq,
+                "index_file": index_name,
+                "offsets_file": offsets_name,
+                "blob_file": blob_name,
+                "lexical_file": lexical_name
+            }
+            _write_atomic(self.manifest_file, json.dumps(manifest).encode("utf-8"))
+            self.generation = generation
+            self.snapshot_seq = seq
+            self.lexical_file = os.path.join(self.knowledge_base_path, lexical_name)
+
+            self._trim_journal(seq)
+            self._remove_old_generations({index_name, offsets_name, blob_name, lexical_name})
+            logger.info(f"Knowledge base snapshot {generation} written (journal seq {seq})")
+
+    def _trim_journal(self, seq: int):
+        """Drop journal records already contained in the snapshot"""
+        with self._journal_lock:
+            remaining = [r for r in self._read_journal() if r["seq"] > seq]
+            data = "".join(json.dumps(r, default=str) + "\n" for r in remaining)
+            _write_atomic(self.journal_file, data.encode("utf-8"))
+
+    def _remove_old_generations(self, current: set):
+        """
+        Delete superseded snapshot files.
+
+        Files still mapped by a worker stay readable until unmapped on POSIX;
+        where the OS refuses (Windows), they are retried after the next snapshot.
+        The legacy files are never removed (the shipped index is tracked in git).
+        """
+        keep = current | {LEGACY_INDEX_FILE, LEGACY_KB_FILE}
+        for directory, prefix in ((self.index_path, "skilledge."), (self.knowledge_base_path, "knowledge_base.")):
+            for name in os.listdir(directory):
+                if name.startswith(prefix) and name not in keep and not name.endswith(".tmp"):
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError as e:
+                        logger.warning(f"Could not remove old snapshot {name}: {e}")
@@ -4,7 +4,7 @@ Pydantic models for chatbot API endpoints
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal
 from datetime import datetime
 
 class ChatMessage(BaseModel):
@@ -31,6 +31,8 @@ class ConversationHistory(BaseModel):
     conversation_id: str = Field(..., description="Unique conversation identifier")
     user_id: str = Field(..., description="Clerk user ID")
     messages: List[ChatMessage] = Field(default_factory=list)
+    summary: str = Field(default="", description="Rolling summary of messages compacted out of the window")
+    summarized_messages: int = Field(default=0, description="Number of messages folded into the summary")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -41,10 +43,27 @@ class KnowledgeBaseEntry(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+class IngestDocument(BaseModel):
+    """Document submitted for bulk knowledge base ingestion"""
+    content: str = Field(..., description="Document text (markdown, plain text or a JSON string)", min_length=1)
+    format: Literal["text", "markdown", "json"] = Field(default="text", description="Document format")
+    category: str = Field(default="general", description="Category for entries that don't define one")
+    source: Optional[str] = Field(None, description="Document name, stored in entry metadata")
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class IngestRequest(BaseModel):
+    """Bulk knowledge base ingestion request"""
+    documents: List[IngestDocument] = Field(..., description="Documents to chunk, embed and add", min_length=1)
+    chunk_words: int = Field(default=180, ge=20, le=1000, description="Words per chunk")
+    overlap_words: int = Field(default=40, ge=0, le=500, description="Words shared by consecutive chunks")
+
 class ChatbotStatus(BaseModel):
     """Chatbot service status model"""
     status: str = Field(..., description="Service status")
     knowledge_base_size: int = Field(..., description="Number of entries in knowledge base")
     embedding_model: str = Field(..., description="Embedding model name")
     llm_model: str = Field(..., description="LLM model name")
+    semantic_cache: Optional[Dict[str, Any]] = Field(default=None, description="Semantic cache hit-rate metrics")
+    intent_router: Optional[Dict[str, Any]] = Field(default=None, description="Messages answered by the intent router vs. sent to the LLM")
+    readiness: Optional[Dict[str, Any]] = Field(default=None, description="Background initialization state and duration")
     last_updated: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,174 @@
+# SkillEdge-AI Chatbot ONNX Embeddings
+"""
+ONNX Runtime backend for the sentence embedding service.
+
+all-MiniLM-L6-v2 is exported once to ONNX (optionally with int8 dynamic
+quantization) together with its fast tokenizer.json. At runtime only
+onnxruntime and tokenizers are needed, so torch and sentence-transformers
+are never imported. Pooling matches the sentence-transformers pipeline
+(attention-masked mean over the last hidden state, then L2 normalization),
+so the vectors stay compatible with the existing FAISS index.
+
+Export (needs torch + transformers, from the Backend directory):
+    python -m app.chatbot.onnx_embeddings --output app/chatbot/onnx_model
+
+Then set EMBEDDING_BACKEND=onnx (and EMBEDDING_ONNX_QUANTIZED=1 for int8).
+"""
+
+import os
+import argparse
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_DIR = os.getenv("EMBEDDING_ONNX_PATH", "app/chatbot/onnx_model")
+ONNX_QUANTIZED = os.getenv("EMBEDDING_ONNX_QUANTIZED", "0") == "1"
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+# sentence-transformers truncates all-MiniLM-L6-v2 inputs at 256 word pieces
+MAX_SEQ_LENGTH = 256
+
+INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+
+class OnnxEncoder:
+    """Tokenizer + ONNX Runtime session producing L2-normalized mean-pooled embeddings"""
+
+    def __init__(self, model_dir: str = ONNX_MODEL_DIR, quantized: bool = ONNX_QUANTIZED, num_threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        tokenizer_path = os.path.join(model_dir, TOKENIZER_FILE)
+        for path in (model_path, tokenizer_path):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"{path} not found; export it with `python -m app.chatbot.onnx_embeddings`")
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=MAX_SEQ_LENGTH)
+        # Pad to the longest sequence in each batch, not to MAX_SEQ_LENGTH
+        self.tokenizer.enable_padding(pad_id=0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+        self.model_path = model_path
+        logger.info(f"Loaded ONNX embedding model {model_path}")
+
+    def _encode_chunk(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": mask,
+        }
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        hidden = self.session.run(None, feeds)[0]
+        weights = mask[..., None].astype(np.float32)
+        pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Encode texts into L2-normalized float32 vectors.
+
+        Texts are grouped by length before batching, so each batch pads to
+        similar lengths; results are returned in input order.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = np.empty((len(texts), self.dimension), dtype="float32")
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            embeddings[chunk] = self._encode_chunk([texts[i] for i in chunk])
+        return embeddings
+
+
+def export_onnx(output_dir: str = ONNX_MODEL_DIR, model_name: Optional[str] = None, quantize: bool = True):
+    """Export the embedding transformer to ONNX (plus an int8 copy) with its tokenizer.json"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    from app.chatbot.embeddings import EMBEDDING_MODEL_NAME
+
+    model_name = model_name or EMBEDDING_MODEL_NAME
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    class _HiddenStates(torch.nn.Module):
+        """Return the last hidden state as a plain tensor (pooling happens in numpy)"""
+
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)[0]
+
+    sample = tokenizer(["How do I prepare for a technical interview?"], return_tensors="pt")
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            _HiddenStates(model),
+            tuple(sample[name] for name in INPUT_NAMES),
+            model_path,
+            input_names=INPUT_NAMES,
+            output_names=["last_hidden_state"],
+            dynamic_axes={name: {0: "batch", 1: "sequence"} for name in INPUT_NAMES + ["last_hidden_state"]},
+            opset_version=14,
+        )
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    print(f"✅ Exported {model_name} to {model_path}")
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        quantized_path = os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+        print(f"✅ Wrote int8 model to {quantized_path}")
+
+
+def check_agreement(output_dir: str = ONNX_MODEL_DIR, texts: Optional[List[str]] = None):
+    """Cosine similarity between ONNX and sentence-transformers embeddings of the same texts"""
+    from app.chatbot.embeddings import EmbeddingService
+
+    texts = texts or [
+        "What is SkillEdge-AI?",
+        "How can I reduce filler words when I answer interview questions?",
+        "Explain the difference between supervised and unsupervised learning.",
+    ]
+    reference = EmbeddingService(backend="torch").encode_batch(texts)
+    for quantized in (False, True):
+        path = os.path.join(output_dir, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        if not os.path.exists(path):
+            continue
+        cosines = (OnnxEncoder(output_dir, quantized).encode(texts) * reference).sum(axis=1)
+        print(f"🔎 {os.path.basename(path)}: min cosine vs. PyTorch {cosines.min():.4f}, mean {cosines.mean():.4f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export the chatbot embedding model to ONNX")
+    parser.add_argument("--output", default=ONNX_MODEL_DIR, help="Directory for model.onnx, model_int8.onnx and tokenizer.json")
+    parser.add_argument("--no-quantize", action="store_true", help="Skip the int8 dynamic quantized copy")
+    parser.add_argument("--skip-check", action="store_true", help="Don't compare the exported model against PyTorch")
+    args = parser.parse_args(argv)
+
+    export_onnx(args.output, quantize=not args.no_quantize)
+    if not args.skip_check:
+        check_agreement(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# SkillEdge-AI Chatbot Report Context
+"""
+Latest-report lookups for the chatbot's report analysis mode.
+
+The three latest-report queries run concurrently (each one is a single index
+seek on (user_id, created_at)) and the result is cached per user, so a
+multi-turn report conversation reads Mongo once instead of three times per
+message. Saving an interview invalidates that user's entry through the
+interview_saved event; the TTL bounds staleness when the save was handled
+by another worker.
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any
+
+from cachetools import TTLCache
+
+from app.database import (
+    get_verbal_reports_collection,
+    get_nonverbal_reports_collection,
+    get_overall_reports_collection
+)
+from app.events import subscribe, INTERVIEW_SAVED
+from app.chatbot.telemetry import record_cache
+from app.chatbot.report_digest import (
+    VERBAL_DIGEST_PROJECTION,
+    NONVERBAL_DIGEST_PROJECTION,
+    OVERALL_DIGEST_PROJECTION
+)
+
+logger = logging.getLogger(__name__)
+
+REPORTS_CACHE_SIZE = int(os.getenv("CHATBOT_REPORTS_CACHE_SIZE", "1000"))
+REPORTS_CACHE_TTL = int(os.getenv("CHATBOT_REPORTS_CACHE_TTL", "600"))
+
+_reports_cache: TTLCache = TTLCache(maxsize=REPORTS_CACHE_SIZE, ttl=REPORTS_CACHE_TTL)
+
+
+async def get_user_reports(user_id: str) -> Dict[str, Any]:
+    """Fetch the fields of the user's latest interview reports that the report digest uses"""
+    cached = _reports_cache.get(user_id)
+    record_cache("reports", cached is not None)
+    if cached is not None:
+        return cached
+
+    try:
+        logger.info(f"Fetching reports for user: {user_id}")
+
+        # Latest verbal, non-verbal and overall report, fetched concurrently
+        verbal_report, nonverbal_report, overall_report = await asyncio.gather(
+            get_verbal_reports_collection().find_one(
+                {"user_id": user_id},
+                VERBAL_DIGEST_PROJECTION,
+                sort=[("created_at", -1)]
+            ),
+            get_nonverbal_reports_collection().find_one(
+                {"user_id": user_id},
+                NONVERBAL_DIGEST_PROJECTION,
+                sort=[("created_at", -1)]
+            ),
+            get_overall_reports_collection().find_one(
+                {"user_id": user_id},
+                OVERALL_DIGEST_PROJECTION,
+                sort=[("created_at", -1)]
+            )
+        )
+
+        logger.info(f"Found reports - Verbal: {bool(verbal_report)}, Non-verbal: {bool(nonverbal_report)}, Overall: {bool(overall_report)}")
+
+        reports = {}
+        if verbal_report:
+            reports["verbal_report"] = verbal_report
+
+        if nonverbal_report:
+            reports["nonverbal_report"] = nonverbal_report
+
+        if overall_report:
+            reports["overall_report"] = overall_report
+
+        _reports_cache[user_id] = reports
+        return reports
+
+    except Exception as e:
+        logger.error(f"Error fetching user reports: {e}")
+        logger.exception("Full traceback:")
+        return {}
+
+
+@subscribe(INTERVIEW_SAVED)
+async def invalidate_user_reports(user_id: str, **_):
+    """Drop the cached reports of a user who just saved an interview"""
+    _reports_cache.pop(user_id, None)
@@ -0,0 +1,215 @@
+# SkillEdge-AI Chatbot Report Digest
+"""
+Compact, fixed-size text digests of a user's latest interview reports.
+
+Report-mode prompts used to embed the full verbal, non-verbal and overall
+documents as indented JSON. The digest keeps only what the assistant needs to
+answer performance questions: scores, the strongest and weakest areas, speaking
+stats and the top recommendations, each capped in count and length.
+
+Saved reports are never modified, so a digest is cached per report id set and
+the *_DIGEST_PROJECTION dicts let callers fetch just the fields used here.
+"""
+
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from app.skill_scores import IDEAL_WPM, get_words_per_minute, get_filler_percentage
+
+MAX_ITEMS = 3
+MAX_ITEM_CHARS = 160
+MAX_SUMMARY_CHARS = 300
+DIGEST_CACHE_SIZE = int(os.getenv("CHATBOT_DIGEST_CACHE_SIZE", "2048"))
+
+VERBAL_METRICS = [
+    "answer_correctness",
+    "concepts_understanding",
+    "domain_knowledge",
+    "response_structure",
+    "depth_of_explanation",
+    "vocabulary_richness",
+]
+
+VERBAL_DIGEST_PROJECTION = {
+    "created_at": 1,
+    "overall_score": 1,
+    "summary": 1,
+    "interview_readiness": 1,
+    "recommendations": 1,
+    **{f"metrics.{name}.score": 1 for name in VERBAL_METRICS},
+    "metrics.domain_knowledge.strengths": 1,
+    "metrics.domain_knowledge.gaps": 1,
+    "metrics.concepts_understanding.missing_concepts": 1,
+}
+
+NONVERBAL_DIGEST_PROJECTION = {
+    "created_at": 1,
+    "analytics.confidenceScores": 1,
+    "analytics.speakingStats": 1,
+    "analytics.fillerWordsBreakdown.percentage": 1,
+    "analytics.fillerWordsBreakdown.detectedWords": 1,
+    "analytics.insights": 1,
+    "analytics.feedback": 1,
+}
+
+OVERALL_DIGEST_PROJECTION = {
+    "created_at": 1,
+    "overall_score": 1,
+    "verbal_score": 1,
+    "nonverbal_score": 1,
+    "interview_readiness": 1,
+    "action_items.title": 1,
+    "summary": 1,
+}
+
+_digest_cache: LRUCache = LRUCache(maxsize=DIGEST_CACHE_SIZE)
+
+
+def _clip(text: Any, limit: int = MAX_ITEM_CHARS) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + "..."
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, dict):
+        value = value.get("score")
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _items(values: Any, limit: int = MAX_ITEMS) -> List[str]:
+    if not isinstance(values, list):
+        return []
+    return [_clip(v.get("title") if isinstance(v, dict) else v) for v in values if v][:limit]
+
+
+def _label(name: str) -> str:
+    return name.replace("_", " ")
+
+
+def _verbal_lines(report: Dict[str, Any], strengths: List[str], weaknesses: List[str]) -> List[str]:
+    metrics = report.get("metrics") or {}
+    scores = {name: _number(metrics.get(name)) for name in VERBAL_METRICS}
+    scores = {name: score for name, score in scores.items() if score is not None}
+
+    lines = []
+    if scores:
+        lines.append("Verbal metrics: " + ", ".join(f"{_label(name)} {score:g}" for name, score in scores.items()))
+        ranked = sorted(scores.items(), key=lambda item: item[1])
+        weaknesses.extend(f"{_label(name)} ({score:g}/100)" for name, score in ranked[:2])
+        strengths.extend(f"{_label(name)} ({score:g}/100)" for name, score in reversed(ranked[-2:]))
+
+    domain = metrics.get("domain_knowledge") if isinstance(metrics.get("domain_knowledge"), dict) else {}
+    strengths.extend(_items(domain.get("strengths")))
+    weaknesses.extend(_items(domain.get("gaps")))
+    concepts = metrics.get("concepts_understanding") if isinstance(metrics.get("concepts_understanding"), dict) else {}
+    missing = _items(concepts.get("missing_concepts"))
+    if missing:
+        weaknesses.append("missing concepts: " + "; ".join(missing))
+    return lines
+
+
+def _nonverbal_lines(report: Dict[str, Any], strengths: List[str], weaknesses: List[str]) -> List[str]:
+    analytics = report.get("analytics") or {}
+    lines = []
+
+    confidence = analytics.get("confidenceScores") or {}
+    confidence_scores = [
+        f"{label} {value:g}"
+        for key, label in (("overallConfidence", "confidence"), ("fluency", "fluency"), ("voiceModulationScore", "voice modulation"))
+        if (value := _number(confidence.get(key))) is not None
+    ]
+    if confidence_scores:
+        lines.append("Non-verbal scores: " + ", ".join(confidence_scores))
+
+    stats = []
+    wpm = get_words_per_minute(analytics)
+    if wpm is not None:
+        stats.append(f"{wpm:.0f} words per minute (ideal ~{IDEAL_WPM})")
+    speaking = analytics.get("speakingStats") or {}
+    if _number(speaking.get("totalSpeakingTime")):
+        stats.append(f"{speaking['totalSpeakingTime'] / 60:.1f} min speaking time")
+    if _number(speaking.get("totalWordsSpoken")):
+        stats.append(f"{speaking['totalWordsSpoken']:g} words")
+    filler_pct = get_filler_percentage(analytics)
+    if filler_pct is not None:
+        detected = (analytics.get("fillerWordsBreakdown") or {}).get("detectedWords") or {}
+        top_fillers = sorted(((w, c) for w, c in detected.items() if _number(c)), key=lambda item: -item[1])[:3]
+        fillers = f" ({', '.join(f'{w} x{c}' for w, c in top_fillers)})" if top_fillers else ""
+        stats.append(f"filler words {filler_pct:g}%{fillers}")
+    if stats:
+        lines.append("Speaking stats: " + ", ".join(stats))
+
+    insights = analytics.get("insights") or {}
+    strengths.extend(_items(insights.get("strengths")))
+    weaknesses.extend(_items(insights.get("improvements")))
+    return lines
+
+
+def build_report_digest(user_reports: Dict[str, Any]) -> str:
+    """Fixed-size text digest of {"verbal_report", "nonverbal_report", "overall_report"}"""
+    lines: List[str] = []
+    strengths: List[str] = []
+    weaknesses: List[str] = []
+    recommendations: List[str] = []
+    summary = ""
+
+    overall = user_reports.get("overall_report")
+    if overall:
+        parts = [
+            f"{label} {value:g}/100"
+            for key, label in (("overall_score", "overall"), ("verbal_score", "verbal"), ("nonverbal_score", "non-verbal"))
+            if (value := _number(overall.get(key))) is not None
+        ]
+        if overall.get("interview_readiness"):
+            parts.append(f"readiness: {overall['interview_readiness']}")
+        if parts:
+            lines.append("Scores: " + ", ".join(parts))
+        recommendations.extend(_items(overall.get("action_items")))
+        summary = overall.get("summary") or ""
+
+    verbal = user_reports.get("verbal_report")
+    if verbal:
+        lines.extend(_verbal_lines(verbal, strengths, weaknesses))
+        recommendations.extend(_items(verbal.get("recommendations")))
+        summary = summary or verbal.get("summary") or ""
+        if not overall and _number(verbal.get("overall_score")) is not None:
+            lines.insert(0, f"Scores: verbal {verbal['overall_score']:g}/100")
+
+    nonverbal = user_reports.get("nonverbal_report")
+    if nonverbal:
+        lines.extend(_nonverbal_lines(nonverbal, strengths, weaknesses))
+        summary = summary or (nonverbal.get("analytics") or {}).get("feedback") or ""
+
+    if strengths:
+        lines.append("Strengths: " + "; ".join(strengths[:MAX_ITEMS]))
+    if weaknesses:
+        lines.append("Weaknesses: " + "; ".join(weaknesses[:MAX_ITEMS]))
+    if recommendations:
+        lines.append("Recommendations: " + "; ".join(recommendations[:MAX_ITEMS]))
+    if summary:
+        lines.append("Summary: " + _clip(summary, MAX_SUMMARY_CHARS))
+
+    return "\n".join(lines)
+
+
+def _report_version(user_reports: Dict[str, Any]) -> Tuple:
+    """Cache key: the ids of the reports the digest is built from"""
+    return tuple(
+        (name, str((user_reports.get(name) or {}).get("_id")))
+        for name in ("verbal_report", "nonverbal_report", "overall_report")
+    )
+
+
+def get_report_digest(user_reports: Dict[str, Any]) -> str:
+    """build_report_digest, cached per report version (reports without ids aren't cached)"""
+    key = _report_version(user_reports)
+    if all(report_id == "None" for _, report_id in key):
+        return build_report_digest(user_reports)
+
+    digest = _digest_cache.get(key)
+    if digest is None:
+        digest = build_report_digest(user_reports)
+        _digest_cache[key] = digest
+    return digest
@@ -0,0 +1,324 @@
+# SkillEdge-AI Chatbot Hybrid Retrieval
+"""
+Lexical side of the chatbot's hybrid retriever.
+
+LexicalIndex holds a BM25 inverted index over entry content plus posting
+lists for the filterable entry fields (category and a few metadata keys),
+both keyed by FAISS id. Filters resolve to an id array up front, which is
+handed to FAISS as an IDSelector and restricts the BM25 scoring, so
+filtered-out entries never compete for the top-k.
+
+Postings are stored CSR-style in numpy arrays: a sorted key column, an
+offsets column and the doc id (and term frequency) columns. They are written
+with each knowledge base snapshot and memory-mapped on startup, like the
+entries themselves, so workers share them through the page cache instead of
+each rebuilding a private copy. Entries added since the snapshot live in a
+small in-memory tail until the next snapshot folds them in. Scoring is
+vectorized per query term.
+
+Dense and BM25 rankings are combined with reciprocal rank fusion.
+"""
+
+import io
+import os
+import re
+import math
+import heapq
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+import numpy as np
+
+from app.chatbot.summarizer import STOPWORDS
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = int(os.getenv("CHATBOT_RRF_K", "60"))
+
+# Metadata keys that can be used as search filters
+FILTERABLE_METADATA = ("type", "importance", "role", "source")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Arrays of a persisted index, in file order
+_ARRAYS = ("terms", "term_offsets", "doc_ids", "tfs", "doc_lengths", "fields", "field_offsets", "field_doc_ids")
+
+
+def _stem(token: str) -> str:
+    """Light suffix stripping, so e.g. "interviews" and "interview" share a term"""
+    if len(token) > 5 and token.endswith("ing"):
+        token = token[:-3]
+    elif len(token) > 4 and token.endswith("ies"):
+        token = token[:-3] + "y"
+    elif len(token) > 4 and token.endswith("ed"):
+        token = token[:-2]
+    elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    if len(token) > 4 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [_stem(t) for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def _field_key(key: str, value: Any) -> str:
+    return f"{key}={value}"
+
+
+def _empty_arrays() -> Dict[str, np.ndarray]:
+    empty_ids = np.zeros(0, dtype="int32")
+    return {
+        "terms": np.zeros(0, dtype="S1"),
+        "term_offsets": np.zeros(1, dtype="int64"),
+        "doc_ids": empty_ids,
+        "tfs": empty_ids,
+        "doc_lengths": empty_ids,
+        "fields": np.zeros(0, dtype="S1"),
+        "field_offsets": np.zeros(1, dtype="int64"),
+        "field_doc_ids": empty_ids,
+    }
+
+
+def _find(keys: np.ndarray, key: str) -> int:
+    """Row of key in a sorted byte-string column, or -1"""
+    encoded = key.encode("utf-8")
+    if len(keys) == 0 or len(encoded) > keys.dtype.itemsize:
+        return -1
+    row = int(np.searchsorted(keys, encoded))
+    return row if row < len(keys) and keys[row] == encoded else -1
+
+
+def _merge(keys: np.ndarray, offsets: np.ndarray, columns: List[np.ndarray],
+           tail: Dict[str, List[Tuple[int, ...]]]) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """CSR arrays holding the base postings plus the tail (tail ids are all larger, so order is kept)"""
+    base_rows = {bytes(key): row for row, key in enumerate(keys)}
+    tail_rows = {key.encode("utf-8"): postings for key, postings in tail.items()}
+    merged_keys = sorted(base_rows.keys() | tail_rows.keys())
+
+    parts: List[List[np.ndarray]] = [[] for _ in columns]
+    lengths = np.zeros(len(merged_keys), dtype="int64")
+    for i, key in enumerate(merged_keys):
+        row = base_rows.get(key)
+        if row is not None:
+            start, end = int(offsets[row]), int(offsets[row + 1])
+            for part, column in zip(parts, columns):
+                part.append(np.asarray(column[start:end]))
+            lengths[i] += end - start
+        postings = tail_rows.get(key)
+        if postings:
+            tail_columns = np.asarray(postings, dtype="int32").reshape(len(postings), -1)
+            for c, part in enumerate(parts):
+                part.append(tail_columns[:, c])
+            lengths[i] += len(postings)
+
+    merged_offsets = np.concatenate([np.zeros(1, dtype="int64"), np.cumsum(lengths)])
+    merged_columns = [np.concatenate(part).astype("int32") if part else np.zeros(0, dtype="int32") for part in parts]
+    width = max((len(key) for key in merged_keys), default=1)
+    return np.array(merged_keys, dtype=f"S{width}"), merged_offsets, merged_columns
+
+
+class LexicalIndex:
+    """BM25 inverted index + field posting lists over the knowledge base"""
+
+    def __init__(self, arrays: Optional[Dict[str, np.ndarray]] = None):
+        # Snapshot part (read-only, usually memory-mapped)
+        self._base = arrays if arrays is not None else _empty_arrays()
+        self._base_docs = len(self._base["doc_lengths"])
+        # Entries added since the snapshot
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._fields: Dict[str, List[Tuple[int]]] = {}
+        self._lengths: List[int] = []
+        self.total_length = int(np.asarray(self._base["doc_lengths"]).sum(dtype="int64"))
+
+    @classmethod
+    def build(cls, entries: Iterable[Dict[str, Any]]) -> "LexicalIndex":
+        index = cls()
+        index.extend(entries)
+        return index
+
+    @classmethod
+    def open(cls, path: str) -> "LexicalIndex":
+        """Memory-map a persisted index (see serialize())"""
+        arrays = {}
+        with open(path, "rb") as f:
+            for name in _ARRAYS:
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                offset = f.tell()
+                size = int(np.prod(shape)) * dtype.itemsize
+                if size:
+                    arrays[name] = np.memmap(path, dtype=dtype, mode="r", shape=shape, offset=offset)
+                else:
+                    arrays[name] = np.zeros(shape, dtype=dtype)
+                f.seek(offset + size)
+        return cls(arrays)
+
+    def serialize(self) -> bytes:
+        """The whole index (snapshot part and tail) as one file of consecutive .npy arrays"""
+        base = self._base
+        terms, term_offsets, (doc_ids, tfs) = _merge(
+            base["terms"], base["term_offsets"], [base["doc_ids"], base["tfs"]], self._postings
+        )
+        fields, field_offsets, (field_doc_ids,) = _merge(
+            base["fields"], base["field_offsets"], [base["field_doc_ids"]], self._fields
+        )
+        doc_lengths = np.concatenate([np.asarray(base["doc_lengths"]), np.asarray(self._lengths, dtype="int32")])
+        arrays = {
+            "terms": terms, "term_offsets": term_offsets, "doc_ids": doc_ids, "tfs": tfs,
+            "doc_lengths": doc_lengths.astype("int32"),
+            "fields": fields, "field_offsets": field_offsets, "field_doc_ids": field_doc_ids,
+        }
+        buffer = io.BytesIO()
+        for name in _ARRAYS:
+            np.lib.format.write_array(buffer, np.ascontiguousarray(arrays[name]), allow_pickle=False)
+        return buffer.getvalue()
+
+    def __len__(self) -> int:
+        return self._base_docs + len(self._lengths)
+
+    def add(self, entry: Dict[str, Any]):
+        """
+        Index the next entry (ids are assigned in insertion order, like FAISS).
+
+        The doc length is published before any posting that refers to it, so a
+        search running concurrently in a worker thread never sees a posting
+        it can't score.
+        """
+        doc_id = len(self)
+        terms: Dict[str, int] = {}
+        for term in tokenize(entry.get("content", "")):
+            terms[term] = terms.get(term, 0) + 1
+        length = sum(terms.values())
+        self._lengths.append(length)
+        self.total_length += length
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, []).append((doc_id, tf))
+        self._fields.setdefault(_field_key("category", entry.get("category")), []).append((doc_id,))
+        metadata = entry.get("metadata") or {}
+        for key in FILTERABLE_METADATA:
+            if key in metadata:
+                self._fields.setdefault(_field_key(key, metadata[key]), []).append((doc_id,))
+
+    def extend(self, entries: Iterable[Dict[str, Any]]):
+        for entry in entries:
+            self.add(entry)
+
+    def extended(self, entries: Iterable[Dict[str, Any]]) -> "LexicalIndex":
+        """
+        Copy of the index with entries added; this index is left untouched.
+
+        Used for bulk adds, which run off the event loop while searches keep
+        reading the current index. The snapshot arrays are shared, so only the
+        tail is copied.
+        """
+        index = LexicalIndex(self._base)
+        index._postings = {term: list(postings) for term, postings in self._postings.items()}
+        index._fields = {field: list(ids) for field, ids in self._fields.items()}
+        index._lengths = list(self._lengths)
+        index.total_length = self.total_length
+        index.extend(entries)
+        return index
+
+    def _term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(doc ids, term frequencies) of a term"""
+        ids, tfs = [], []
+        row = _find(self._base["terms"], term)
+        if row >= 0:
+            start, end = int(self._base["term_offsets"][row]), int(self._base["term_offsets"][row + 1])
+            ids.append(np.asarray(self._base["doc_ids"][start:end], dtype="int64"))
+            tfs.append(np.asarray(self._base["tfs"][start:end], dtype="float64"))
+        tail = self._postings.get(term)
+        if tail:
+            tail = np.asarray(list(tail), dtype="int64").reshape(-1, 2)
+            ids.append(tail[:, 0])
+            tfs.append(tail[:, 1].astype("float64"))
+        if not ids:
+            return np.zeros(0, dtype="int64"), np.zeros(0, dtype="float64")
+        return np.concatenate(ids), np.concatenate(tfs)
+
+    def _field_ids(self, key: str, value: Any) -> np.ndarray:
+        field = _field_key(key, value)
+        ids = []
+        row = _find(self._base["fields"], field)
+        if row >= 0:
+            start, end = int(self._base["field_offsets"][row]), int(self._base["field_offsets"][row + 1])
+            ids.append(np.asarray(self._base["field_doc_ids"][start:end], dtype="int64"))
+        tail = self._fields.get(field)
+        if tail:
+            ids.append(np.asarray([doc_id for doc_id, in list(tail)], dtype="int64"))
+        return np.concatenate(ids) if ids else np.zeros(0, dtype="int64")
+
+    def _doc_lengths(self, ids: np.ndarray) -> np.ndarray:
+        lengths = np.empty(len(ids), dtype="float64")
+        in_base = ids < self._base_docs
+        lengths[in_base] = self._base["doc_lengths"][ids[in_base]]
+        if not in_base.all():
+            tail = np.asarray(self._lengths, dtype="float64")
+            lengths[~in_base] = tail[ids[~in_base] - self._base_docs]
+        return lengths
+
+    def filter_ids(self, categories: Optional[List[str]] = None, metadata: Optional[Dict[str, Any]] = None) -> Optional[np.ndarray]:
+        """
+        Sorted ids matching all filters: any of the categories, and for every
+        metadata key its value (or any of its values, when given a list).
+
+        None means unfiltered; unknown metadata keys raise ValueError.
+        """
+        allowed: Optional[np.ndarray] = None
+        if categories:
+            allowed = np.unique(np.concatenate([self._field_ids("category", c) for c in categories]))
+        for key, value in (metadata or {}).items():
+            if key not in FILTERABLE_METADATA:
+                raise ValueError(f"Metadata key {key!r} is not filterable (expected one of {FILTERABLE_METADATA})")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if not values:
+                continue
+            matches = np.unique(np.concatenate([self._field_ids(key, v) for v in values]))
+            allowed = matches if allowed is None else np.intersect1d(allowed, matches, assume_unique=True)
+        return allowed
+
+    def search(self, query: str, top_k: int, allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Top-k (id, BM25 score) for a query, restricted to allowed ids (sorted, unique) when given"""
+        n = len(self)
+        if n == 0:
+            return []
+        avg_length = self.total_length / n or 1.0
+
+        doc_ids, contributions = [], []
+        for term in set(tokenize(query)):
+            ids, tfs = self._term_postings(term)
+            if len(ids) == 0:
+                continue
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            if allowed is not None:
+                keep = np.isin(ids, allowed, assume_unique=True)
+                ids, tfs = ids[keep], tfs[keep]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths(ids) / avg_length)
+            doc_ids.append(ids)
+            contributions.append(idf * tfs * (BM25_K1 + 1) / (tfs + norm))
+
+        if not doc_ids:
+            return []
+        ids, positions = np.unique(np.concatenate(doc_ids), return_inverse=True)
+        if len(ids) == 0:
+            return []
+        scores = np.bincount(positions, weights=np.concatenate(contributions), minlength=len(ids))
+
+        k = min(top_k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], top_k: int, k: int = RRF_K) -> List[Tuple[int, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank)"""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return heapq.nlargest(top_k, fused.items(), key=lambda item: item[1])
@@ -0,0 +1,101 @@
+# SkillEdge-AI Chatbot Semantic Cache
+"""
+Semantic response cache for general (non-report) chatbot questions.
+
+Answers are stored with the normalized embedding of the question that produced
+them. A new question whose embedding is within the cosine similarity threshold
+of a cached one gets the stored answer without a knowledge base search or LLM
+call. Entries expire after a TTL and are dropped whenever the knowledge base
+version changes.
+"""
+
+import os
+import time
+import threading
+from typing import Optional, Dict, Any, List
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = float(os.getenv("CHATBOT_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+TTL_SECONDS = int(os.getenv("CHATBOT_SEMANTIC_CACHE_TTL", "3600"))
+MAX_ENTRIES = int(os.getenv("CHATBOT_SEMANTIC_CACHE_SIZE", "1000"))
+
+
+class SemanticCache:
+    """Fixed-size cache of (question embedding -> answer) with cosine lookup"""
+
+    def __init__(
+        self,
+        dimension: int,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: int = TTL_SECONDS,
+        max_entries: int = MAX_ENTRIES
+    ):
+        self.dimension = dimension
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._reset()
+        self.hits = 0
+        self.misses = 0
+
+    def _reset(self):
+        # Preallocated embedding matrix; rows are reused round-robin once full
+        self._embeddings = np.zeros((self.max_entries, self.dimension), dtype="float32")
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * self.max_entries
+        self._created_at = np.zeros(self.max_entries, dtype="float64")
+        self._size = 0
+        self._next = 0
+        self._kb_version = None
+
+    def lookup(self, embedding: np.ndarray, kb_version: int) -> Optional[str]:
+        """Return a cached answer for a semantically equivalent question, if any"""
+        with self._lock:
+            if self._kb_version != kb_version:
+                self._reset()
+                self._kb_version = kb_version
+
+            if self._size == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._embeddings[:self._size] @ embedding
+            # Expired slots can't win, so a fresh copy of the same question is still found
+            similarities[self._created_at[:self._size] < time.time() - self.ttl] = -np.inf
+            best = int(np.argmax(similarities))
+            entry = self._entries[best]
+
+            if similarities[best] >= self.threshold and entry:
+                self.hits += 1
+                return entry["answer"]
+
+            self.misses += 1
+            return None
+
+    def store(self, embedding: np.ndarray, query: str, answer: str, kb_version: int):
+        """Cache an answer for a question (overwrites the oldest slot when full)"""
+        with self._lock:
+            if self._kb_version != kb_version:
+                self._reset()
+                self._kb_version = kb_version
+
+            slot = self._next
+            self._embeddings[slot] = embedding
+            now = time.time()
+            self._entries[slot] = {"query": query, "answer": answer, "created_at": now}
+            self._created_at[slot] = now
+            self._next = (self._next + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics"""
+        total = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl,
+        }
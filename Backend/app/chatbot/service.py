@@ -5,31 +5,82 @@ Handles both general SkillEdge-AI queries and personalized report analysis
 """
 
 import os
+import time
+import hashlib
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-import faiss
+import concurrent.futures
+from typing import List, Dict, Any, Optional, Set, Tuple, AsyncIterator
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import google.generativeai as genai
 from datetime import datetime
-import json
-import pickle
 from pathlib import Path
 
+from app.chatbot.embeddings import get_embedding_service
+from app.llm_client import get_llm_client
+from app.prompts import CHATBOT_ANSWER, RenderedPrompt
+from app.chatbot.semantic_cache import SemanticCache
+from app.chatbot.kb_store import KnowledgeBaseStore, KnowledgeBaseEntries
+from app.chatbot.index_factory import build_index, configure_search, upgrade_index, search as index_search
+from app.chatbot.retrieval import LexicalIndex, reciprocal_rank_fusion
+from app.chatbot.report_digest import get_report_digest
+from app.chatbot.intents import IntentRouter
+from app.chatbot.telemetry import stage, record_cache, record_tokens, CHAT_ANSWERS, CHAT_STAGE_SECONDS
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Encoder batch size for bulk ingestion (larger batches amortize per-call overhead)
+INGEST_BATCH_SIZE = int(os.getenv("CHATBOT_INGEST_BATCH_SIZE", "256"))
+
+# Candidates taken from each retriever (dense and BM25) before rank fusion
+RETRIEVAL_CANDIDATES = int(os.getenv("CHATBOT_RETRIEVAL_CANDIDATES", "20"))
+
+LLM_MODEL_NAME = "gemini-2.0-flash-exp"
+
+# Queries run once at startup so the first user request doesn't pay for lazy initialization
+WARMUP_QUERIES = [
+    "What is SkillEdge-AI?",
+    "How can I improve my interview performance?",
+    "What reports do I get after an interview?",
+]
+
+def _content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _is_cacheable(user_reports: Optional[Dict[str, Any]],
+                  conversation_history: Optional[List[Dict[str, str]]],
+                  conversation_summary: Optional[str]) -> bool:
+    """
+    Whether an answer may go through the process-wide semantic cache.
+
+    Answers built from a user's reports or conversation are private to that
+    user (and only make sense in that conversation), so they are never looked
+    up or stored.
+    """
+    return not (user_reports or conversation_history or conversation_summary)
+
+
 class ChatbotService:
     """Advanced RAG-based chatbot service for SkillEdge-AI"""
     
     def __init__(self):
-        self.embedding_model = None
+        self.embedding_service = get_embedding_service()
         self.faiss_index = None
-        self.knowledge_base = []
-        self.gemini_model = None
-        self.vector_dimension = 384  # all-MiniLM-L6-v2 embedding dimension
+        self.knowledge_base = KnowledgeBaseEntries()
+        # BM25 + filter postings, built on first search (aligned with FAISS ids)
+        self.lexical_index: Optional[LexicalIndex] = None
+        # Hashes of every entry's content, for bulk-ingest dedup without decoding the knowledge base
+        self._content_hashes: Optional[Set[str]] = None
+        self.llm = None
+        self.vector_dimension = self.embedding_service.dimension
+        # Bumped on every knowledge base change; invalidates the semantic cache
+        self.kb_version = 0
+        self.semantic_cache = SemanticCache(self.vector_dimension)
+        # Greetings, FAQs and stat lookups answered without the LLM
+        self.intent_router = IntentRouter(self.embedding_service)
         self.knowledge_base_path = "app/chatbot/knowledge_base"
         self.index_path = "app/chatbot/faiss_index"
         
@@ -37,6 +88,13 @@ class ChatbotService:
         Path(self.knowledge_base_path).mkdir(parents=True, exist_ok=True)
         Path(self.index_path).mkdir(parents=True, exist_ok=True)
         
+        # Journal + snapshot persistence; adds are serialized so journal order matches index order
+        self.kb_store = KnowledgeBaseStore(self.index_path, self.knowledge_base_path)
+        self._kb_write_lock = asyncio.Lock()
+        # FAISS adds must not overlap searches, which run in worker threads
+        self._index_lock = threading.Lock()
+        self._compaction_task: Optional[asyncio.Task] = None
+        
         # Initialize models
         self._initialize_models()
         
@@ -46,79 +104,57 @@ class ChatbotService:
     def _initialize_models(self):
         """Initialize embedding and LLM models"""
         try:
-            # Initialize sentence transformer for embeddings
-            logger.info("Loading sentence transformer model...")
-            self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+            # Load the shared sentence transformer used for all embeddings
+            self.embedding_service.load()
+            self.intent_router.load()
             
-            # Initialize Gemini API
-            gemini_api_key = os.getenv("GEMINI_API_KEY")
-            if gemini_api_key:
-                genai.configure(api_key=gemini_api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
-                logger.info("Gemini API initialized successfully")
-            else:
-                raise ValueError("GEMINI_API_KEY not found in environment variables")
+            # Shared LLM client (global concurrency/rate limits, retries, hedging)
+            self.llm = get_llm_client(LLM_MODEL_NAME)
+            logger.info(f"LLM client initialized ({self.llm.provider_name} provider)")
                 
         except Exception as e:
             logger.error(f"Error initializing models: {e}")
             raise
     
+    def warm_up(self):
+        """
+        Run a few encodes and dense searches so first-use costs are paid before serving (blocking).
+
+        Only the encoder and FAISS are warmed: the BM25 index and content hashes
+        decode every entry, so they stay lazy and startup stays O(1) in the
+        knowledge base size.
+        """
+        embeddings = self.embedding_service.encode_batch(WARMUP_QUERIES)
+        for embedding in embeddings:
+            index_search(self.faiss_index, embedding.reshape(1, -1), RETRIEVAL_CANDIDATES)
+    
     def _setup_knowledge_base(self):
         """Setup or load existing knowledge base and FAISS index"""
         try:
-            # Try to load existing index and knowledge base
-            if self._load_existing_index():
-                logger.info("Loaded existing FAISS index and knowledge base")
+            # Try to load the latest snapshot plus journal
+            stored = self.kb_store.load()
+            if stored is not None:
+                self.faiss_index, self.knowledge_base = stored
+                configure_search(self.faiss_index)
+                self.lexical_index = self.kb_store.load_lexical(self.knowledge_base)
+                logger.info(f"Loaded existing FAISS index and knowledge base ({len(self.knowledge_base)} entries)")
                 return
             
             # Create new knowledge base if none exists
             logger.info("Creating new knowledge base...")
             self._create_initial_knowledge_base()
             self._build_faiss_index()
-            self._save_index()
+            self.lexical_index = LexicalIndex.build(self.knowledge_base)
+            try:
+                self.kb_store.write_snapshot(*self.kb_store.capture(self.faiss_index, self.knowledge_base, self.lexical_index))
+            except RuntimeError as e:
+                # Another worker is the writer and persists the same initial entries
+                logger.warning(f"Serving initial knowledge base without persisting it: {e}")
             
         except Exception as e:
             logger.error(f"Error setting up knowledge base: {e}")
             raise
     
-    def _load_existing_index(self) -> bool:
-        """Load existing FAISS index and knowledge base"""
-        try:
-            index_file = f"{self.index_path}/skilledge.index"
-            kb_file = f"{self.knowledge_base_path}/knowledge_base.pkl"
-            
-            if os.path.exists(index_file) and os.path.exists(kb_file):
-                # Load FAISS index
-                self.faiss_index = faiss.read_index(index_file)
-                
-                # Load knowledge base
-                with open(kb_file, 'rb') as f:
-                    self.knowledge_base = pickle.load(f)
-                
-                return True
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error loading existing index: {e}")
-            return False
-    
-    def _save_index(self):
-        """Save FAISS index and knowledge base"""
-        try:
-            # Save FAISS index
-            index_file = f"{self.index_path}/skilledge.index"
-            faiss.write_index(self.faiss_index, index_file)
-            
-            # Save knowledge base
-            kb_file = f"{self.knowledge_base_path}/knowledge_base.pkl"
-            with open(kb_file, 'wb') as f:
-                pickle.dump(self.knowledge_base, f)
-                
-            logger.info("FAISS index and knowledge base saved successfully")
-            
-        except Exception as e:
-            logger.error(f"Error saving index: {e}")
-    
     def _create_initial_knowledge_base(self):
         """Create initial knowledge base with SkillEdge-AI information"""
         
@@ -186,160 +222,374 @@ class ChatbotService:
             }
         ]
         
-        self.knowledge_base = skilledge_knowledge
+        self.knowledge_base = KnowledgeBaseEntries.from_list(skilledge_knowledge)
         logger.info(f"Created knowledge base with {len(self.knowledge_base)} entries")
     
     def _build_faiss_index(self):
         """Build FAISS index from knowledge base"""
         try:
-            # Generate embeddings for all knowledge base entries
+            # Generate normalized embeddings for all knowledge base entries
             contents = [item["content"] for item in self.knowledge_base]
-            embeddings = self.embedding_model.encode(contents, convert_to_numpy=True)
-            
-            # Create FAISS index
-            self.faiss_index = faiss.IndexFlatIP(self.vector_dimension)  # Inner product for cosine similarity
-            
-            # Normalize embeddings for cosine similarity
-            faiss.normalize_L2(embeddings)
-            
-            # Add embeddings to index
-            self.faiss_index.add(embeddings.astype('float32'))
+            embeddings = self.embedding_service.encode_batch(contents)
             
-            logger.info(f"Built FAISS index with {self.faiss_index.ntotal} vectors")
+            # Create FAISS index (inner product for cosine similarity; type from CHATBOT_INDEX_TYPE)
+            self.faiss_index = build_index(embeddings)
             
         except Exception as e:
             logger.error(f"Error building FAISS index: {e}")
             raise
     
-    def add_to_knowledge_base(self, content: str, category: str, metadata: Dict[str, Any] = None):
+    async def add_to_knowledge_base(self, content: str, category: str, metadata: Dict[str, Any] = None):
         """Add new content to knowledge base and update FAISS index"""
         try:
-            # Add to knowledge base
             new_entry = {
                 "content": content,
                 "category": category,
                 "metadata": metadata or {}
             }
-            self.knowledge_base.append(new_entry)
             
-            # Generate embedding for new content
-            embedding = self.embedding_model.encode([content], convert_to_numpy=True)
-            faiss.normalize_L2(embedding)
+            # Generate normalized embedding for new content
+            embedding = await self.embedding_service.encode(content)
             
-            # Add to FAISS index
-            self.faiss_index.add(embedding.astype('float32'))
+            async with self._kb_write_lock:
+                # Journal first (fsync off the event loop), then apply in memory
+                await asyncio.to_thread(self.kb_store.append, new_entry, embedding)
+                self.faiss_index = await asyncio.to_thread(self.kb_store.writable_index, self.faiss_index)
+                self.knowledge_base.append(new_entry)
+                await asyncio.to_thread(self._add_vectors, embedding.reshape(1, -1))
+                if self.lexical_index is not None:
+                    self.lexical_index.add(new_entry)
+                if self._content_hashes is not None:
+                    self._content_hashes.add(_content_hash(content))
+                self.kb_version += 1
             
-            # Save updated index
-            self._save_index()
+            if self.kb_store.needs_compaction() and (self._compaction_task is None or self._compaction_task.done()):
+                self._compaction_task = asyncio.create_task(self._compact_knowledge_base())
             
             logger.info(f"Added new entry to knowledge base: {category}")
             
         except Exception as e:
             logger.error(f"Error adding to knowledge base: {e}")
+            raise
     
-    def search_knowledge_base(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
-        """Search knowledge base using semantic similarity"""
+    async def add_many_to_knowledge_base(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Bulk-add entries ({content, category, metadata}): one batched encode,
+        one FAISS add and a single snapshot. Entries whose content is already
+        in the knowledge base are skipped. Returns the number of entries added.
+        """
+        existing = await self._get_content_hashes()
+        seen = set()
+        hashes = []
+        new_entries = []
+        for entry in entries:
+            content_hash = _content_hash(entry["content"])
+            if content_hash in existing or content_hash in seen:
+                continue
+            seen.add(content_hash)
+            hashes.append(content_hash)
+            new_entries.append({
+                "content": entry["content"],
+                "category": entry.get("category") or "general",
+                "metadata": entry.get("metadata") or {}
+            })
+        
+        if not new_entries:
+            return 0
+        
+        embeddings = await asyncio.to_thread(
+            self.embedding_service.encode_batch,
+            [entry["content"] for entry in new_entries],
+            INGEST_BATCH_SIZE
+        )
+        
+        # The snapshot below includes the BM25 index, so make sure it exists
+        await self._get_lexical_index()
+        
+        async with self._kb_write_lock:
+            # Re-check under the lock: a concurrent ingest may have added the same content while we encoded
+            keep = [i for i, content_hash in enumerate(hashes) if content_hash not in existing]
+            if not keep:
+                return 0
+            new_entries = [new_entries[i] for i in keep]
+            embeddings = embeddings[keep]
+            existing.update(hashes[i] for i in keep)
+            
+            self.faiss_index = await asyncio.to_thread(self.kb_store.writable_index, self.faiss_index)
+            self.knowledge_base.extend(new_entries)
+            await asyncio.to_thread(self._add_vectors, embeddings)
+            # Extended on a copy; concurrent searches keep using the current index until the swap
+            self.lexical_index = await asyncio.to_thread(self.lexical_index.extended, new_entries)
+            # Switch to (and train) the configured index type once the corpus is large enough
+            self.faiss_index = await asyncio.to_thread(upgrade_index, self.faiss_index)
+            self.kb_version += 1
+            captured = await asyncio.to_thread(self.kb_store.capture, self.faiss_index, self.knowledge_base, self.lexical_index)
+        
+        # Bulk entries aren't journaled; the snapshot is what makes them durable
+        await asyncio.to_thread(self.kb_store.write_snapshot, *captured)
+        
+        logger.info(f"Bulk-added {len(new_entries)} entries to knowledge base")
+        return len(new_entries)
+    
+    async def _compact_knowledge_base(self):
+        """Fold the journal into a new snapshot generation (runs in the background)"""
         try:
-            # Generate query embedding
-            query_embedding = self.embedding_model.encode([query], convert_to_numpy=True)
-            faiss.normalize_L2(query_embedding)
-            
-            # Search FAISS index
-            scores, indices = self.faiss_index.search(query_embedding.astype('float32'), top_k)
+            await self._get_lexical_index()
+            async with self._kb_write_lock:
+                # Consistent copy of index + entries; adds wait only for this in-memory copy
+                captured = await asyncio.to_thread(self.kb_store.capture, self.faiss_index, self.knowledge_base, self.lexical_index)
+            await asyncio.to_thread(self.kb_store.write_snapshot, *captured)
             
-            # Retrieve relevant knowledge base entries
-            results = []
-            for i, (score, idx) in enumerate(zip(scores[0], indices[0])):
-                if idx < len(self.knowledge_base):
-                    result = self.knowledge_base[idx].copy()
-                    result["similarity_score"] = float(score)
-                    result["rank"] = i + 1
-                    results.append(result)
-            
-            return results
+        except Exception as e:
+            logger.error(f"Error compacting knowledge base: {e}")
+    
+    async def search_knowledge_base(self,
+                                    query: str,
+                                    top_k: int = 5,
+                                    categories: Optional[List[str]] = None,
+                                    metadata_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Hybrid (dense + BM25) knowledge base search, optionally filtered by category / metadata"""
+        try:
+            # Generate query embedding (micro-batched with concurrent requests, cached per query)
+            query_embedding = await self.embedding_service.encode(query)
+            return await self._hybrid_search(query, query_embedding, top_k, categories, metadata_filters)
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error searching knowledge base: {e}")
             return []
     
+    async def _get_content_hashes(self) -> Set[str]:
+        """Content hashes of all entries, computed on first use (off the event loop)"""
+        if self._content_hashes is None:
+            async with self._kb_write_lock:
+                if self._content_hashes is None:
+                    self._content_hashes = await asyncio.to_thread(
+                        lambda: {_content_hash(item["content"]) for item in self.knowledge_base}
+                    )
+        return self._content_hashes
+    
+    def _add_vectors(self, embeddings: np.ndarray):
+        """Add vectors to FAISS (blocking; call off the event loop)"""
+        with self._index_lock:
+            self.faiss_index.add(embeddings)
+    
+    async def _get_lexical_index(self) -> LexicalIndex:
+        """
+        The BM25 index, memory-mapped from the snapshot at startup; snapshots
+        from before it was persisted build it here on first use (decodes every
+        entry once, off the event loop).
+        """
+        if self.lexical_index is None:
+            async with self._kb_write_lock:
+                if self.lexical_index is None:
+                    self.lexical_index = await asyncio.to_thread(LexicalIndex.build, self.knowledge_base)
+                    logger.info(f"Built BM25 index over {len(self.lexical_index)} entries")
+        return self.lexical_index
+    
+    async def _hybrid_search(self,
+                             query: str,
+                             query_embedding: np.ndarray,
+                             top_k: int,
+                             categories: Optional[List[str]] = None,
+                             metadata_filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Dense and BM25 candidates fused with reciprocal rank fusion.
+        
+        Filters are resolved to an id set first and applied inside both
+        retrievers, so every returned entry matches them.
+        """
+        lexical_index = await self._get_lexical_index()
+        return await asyncio.to_thread(
+            self._retrieve, lexical_index, query, query_embedding, top_k, categories, metadata_filters
+        )
+    
+    def _retrieve(self,
+                  lexical_index: LexicalIndex,
+                  query: str,
+                  query_embedding: np.ndarray,
+                  top_k: int,
+                  categories: Optional[List[str]],
+                  metadata_filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter resolution, both retrievers, fusion and entry decoding (blocking; runs in a worker thread)"""
+        allowed = lexical_index.filter_ids(categories, metadata_filters)
+        if allowed is not None and not len(allowed):
+            return []
+        
+        candidates = max(top_k, RETRIEVAL_CANDIDATES)
+        with self._index_lock:
+            scores, indices = index_search(self.faiss_index, query_embedding.reshape(1, -1), candidates, allowed)
+        dense = [(int(idx), float(score)) for score, idx in zip(scores[0], indices[0]) if 0 <= idx < len(self.knowledge_base)]
+        lexical = lexical_index.search(query, candidates, allowed)
+        
+        dense_scores = dict(dense)
+        fused = reciprocal_rank_fusion([[idx for idx, _ in dense], [idx for idx, _ in lexical]], top_k)
+        
+        # Retrieve relevant knowledge base entries
+        results = []
+        for rank, (idx, fused_score) in enumerate(fused, start=1):
+            result = self.knowledge_base[idx]
+            result["similarity_score"] = dense_scores.get(idx)
+            result["rrf_score"] = fused_score
+            result["rank"] = rank
+            results.append(result)
+        
+        return results
+    
+    def _build_prompt(self,
+                      query: str,
+                      relevant_context: List[Dict[str, Any]],
+                      user_reports: Dict[str, Any] = None,
+                      conversation_history: List[Dict[str, str]] = None,
+                      conversation_summary: Optional[str] = None) -> RenderedPrompt:
+        """Assemble the RAG prompt (knowledge base context, reports, conversation history)"""
+        # Build context for LLM
+        context_text = ""
+        
+        # Add relevant knowledge base context
+        if relevant_context:
+            context_text += "Relevant SkillEdge-AI Information:\n"
+            for item in relevant_context:
+                context_text += f"- {item['content']}\n"
+            context_text += "\n"
+        
+        # Add user report context if analyzing reports
+        if user_reports:
+            context_text += "User's Latest Interview Reports (digest):\n"
+            context_text += get_report_digest(user_reports)
+            context_text += "\n\n"
+        
+        # Build conversation history (older turns arrive pre-compacted as a summary)
+        history_text = ""
+        if conversation_summary:
+            history_text += f"Summary of earlier conversation:\n{conversation_summary}\n\n"
+        if conversation_history:
+            history_text += "Previous conversation:\n"
+            for msg in conversation_history[-5:]:  # Last 5 messages for context
+                history_text += f"{msg['role']}: {msg['content']}\n"
+            history_text += "\n"
+        
+        # Static assistant instructions first, so the prefix can be cached
+        return CHATBOT_ANSWER.render(history=history_text, context=context_text, query=query)
+    
     async def generate_response(self, 
                               query: str, 
                               context: List[Dict[str, Any]] = None,
                               user_reports: Dict[str, Any] = None,
-                              conversation_history: List[Dict[str, str]] = None) -> str:
+                              conversation_history: List[Dict[str, str]] = None,
+                              conversation_summary: Optional[str] = None) -> str:
         """Generate response using Gemini API with RAG context"""
         try:
-            # Search knowledge base for relevant information
-            relevant_context = self.search_knowledge_base(query, top_k=3)
-            
-            # Build context for LLM
-            context_text = ""
-            
-            # Add relevant knowledge base context
-            if relevant_context:
-                context_text += "Relevant SkillEdge-AI Information:\n"
-                for item in relevant_context:
-                    context_text += f"- {item['content']}\n"
-                context_text += "\n"
-            
-            # Add user report context if analyzing reports
-            if user_reports:
-                context_text += "User's Interview Reports:\n"
-                if "verbal_report" in user_reports:
-                    context_text += f"Verbal Report: {json.dumps(user_reports['verbal_report'], indent=2, default=str)}\n"
-                if "nonverbal_report" in user_reports:
-                    context_text += f"Non-Verbal Report: {json.dumps(user_reports['nonverbal_report'], indent=2, default=str)}\n"
-                if "overall_report" in user_reports:
-                    context_text += f"Overall Report: {json.dumps(user_reports['overall_report'], indent=2, default=str)}\n"
-                context_text += "\n"
+            with stage("embedding"):
+                query_embedding = await self.embedding_service.encode(query)
+            
+            # Greetings, FAQs and stat lookups get a templated answer
+            with stage("intent_routing"):
+                routed_answer = self.intent_router.route(query, query_embedding, user_reports)
+            if routed_answer is not None:
+                CHAT_ANSWERS.inc(source="intent")
+                return routed_answer
+            
+            # General questions (no report or conversation context) are answered from the semantic cache when possible
+            use_semantic_cache = _is_cacheable(user_reports, conversation_history, conversation_summary)
+            if use_semantic_cache:
+                cached_answer = self.semantic_cache.lookup(query_embedding, self.kb_version)
+                record_cache("semantic", cached_answer is not None)
+                if cached_answer is not None:
+                    logger.info("Semantic cache hit")
+                    CHAT_ANSWERS.inc(source="semantic_cache")
+                    return cached_answer
             
-            # Build conversation history
-            history_text = ""
-            if conversation_history:
-                history_text = "Previous conversation:\n"
-                for msg in conversation_history[-5:]:  # Last 5 messages for context
-                    history_text += f"{msg['role']}: {msg['content']}\n"
-                history_text += "\n"
-            
-            # Create comprehensive prompt
-            prompt = f"""You are SkillEdge-AI Assistant, an intelligent chatbot for the SkillEdge-AI interview preparation platform. 
-You have two main functions:
-
-1. Answer general questions about SkillEdge-AI platform (features, benefits, how to use, etc.)
-2. Provide personalized analysis and advice based on user's interview reports
-
-Guidelines:
-- Be helpful, professional, and encouraging
-- Use the provided context to give accurate information
-- When analyzing reports, be specific and actionable in your advice
-- If you don't have enough information, ask clarifying questions
-- Keep responses concise but comprehensive
-- Focus on helping users improve their interview performance
-
-{history_text}
-
-{context_text}
-
-User Question: {query}
-
-Please provide a helpful and relevant response:
-
-Note: as you are a chatbot assistane, please give short concise and to the point answers
-"""
+            # Search knowledge base for relevant information
+            with stage("retrieval"):
+                relevant_context = await self._hybrid_search(query, query_embedding, top_k=3)
+            with stage("prompt_build"):
+                prompt = self._build_prompt(query, relevant_context, user_reports, conversation_history, conversation_summary)
 
             # Generate response using Gemini
-            response = await asyncio.to_thread(
-                self.gemini_model.generate_content,
-                prompt
-            )
+            with stage("llm"):
+                response = await self.llm.generate(prompt)
+            
+            answer = response.text.strip()
+            record_tokens(prompt.text, getattr(response, "usage_metadata", None), answer)
+            CHAT_ANSWERS.inc(source="llm")
+            if use_semantic_cache:
+                self.semantic_cache.store(query_embedding, query, answer, self.kb_version)
             
-            return response.text.strip()
+            return answer
             
         except Exception as e:
+            CHAT_ANSWERS.inc(source="error")
             logger.error(f"Error generating response: {e}")
             logger.exception("Full traceback:")
             return f"I apologize, but I'm experiencing technical difficulties: {str(e)}. Please try again later."
     
+    async def stream_response(self,
+                              query: str,
+                              user_reports: Dict[str, Any] = None,
+                              conversation_history: List[Dict[str, str]] = None,
+                              conversation_summary: Optional[str] = None) -> AsyncIterator[str]:
+        """Same as generate_response, but yields the answer in chunks as Gemini produces them"""
+        try:
+            with stage("embedding"):
+                query_embedding = await self.embedding_service.encode(query)
+            
+            with stage("intent_routing"):
+                routed_answer = self.intent_router.route(query, query_embedding, user_reports)
+            if routed_answer is not None:
+                CHAT_ANSWERS.inc(source="intent")
+                yield routed_answer
+                return
+            
+            use_semantic_cache = _is_cacheable(user_reports, conversation_history, conversation_summary)
+            if use_semantic_cache:
+                cached_answer = self.semantic_cache.lookup(query_embedding, self.kb_version)
+                record_cache("semantic", cached_answer is not None)
+                if cached_answer is not None:
+                    logger.info("Semantic cache hit")
+                    CHAT_ANSWERS.inc(source="semantic_cache")
+                    yield cached_answer
+                    return
+            
+            with stage("retrieval"):
+                relevant_context = await self._hybrid_search(query, query_embedding, top_k=3)
+            with stage("prompt_build"):
+                prompt = self._build_prompt(query, relevant_context, user_reports, conversation_history, conversation_summary)
+            
+            chunks = []
+            async for chunk in self._stream_llm(prompt):
+                chunks.append(chunk)
+                yield chunk
+            
+            answer = "".join(chunks).strip()
+            CHAT_ANSWERS.inc(source="llm")
+            if use_semantic_cache and answer:
+                self.semantic_cache.store(query_embedding, query, answer, self.kb_version)
+            
+        except Exception as e:
+            CHAT_ANSWERS.inc(source="error")
+            logger.error(f"Error streaming response: {e}")
+            logger.exception("Full traceback:")
+            yield f"I apologize, but I'm experiencing technical difficulties: {str(e)}. Please try again later."
+    
+    async def _stream_llm(self, prompt: RenderedPrompt) -> AsyncIterator[str]:
+        """Stream answer text from the LLM client, recording first-token latency and token counts"""
+        started = time.perf_counter()
+        usage = None
+        completion = []
+        async for chunk in self.llm.stream(prompt):
+            # Usage metadata arrives with the final chunk
+            usage = chunk.usage_metadata or usage
+            if not chunk.text:
+                continue
+            if not completion:
+                CHAT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="llm_first_token")
+            completion.append(chunk.text)
+            yield chunk.text
+        CHAT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="llm")
+        record_tokens(prompt.text, usage, "".join(completion))
+    
     async def analyze_user_reports(self, query: str, user_reports: Dict[str, Any]) -> str:
         """Analyze user's interview reports and provide personalized insights"""
         try:
@@ -350,50 +600,6 @@ Note: as you are a chatbot assistane, please give short concise and to the point
             if not user_reports:
                 return "I don't see any interview reports for your account yet. Please complete an interview first to get personalized insights about your performance."
             
-            # Check if this is just a greeting or simple message
-            query_lower = query.lower().strip()
-            greetings = ["hi", "hello", "hey", "good morning", "good afternoon", "good evening", "how are you", "what's up", "sup"]
-            simple_responses = ["thanks", "thank you", "ok", "okay", "yes", "no", "sure", "alright"]
-            
-            if query_lower in greetings or any(greeting in query_lower for greeting in greetings):
-                return "Hi! I'm here to help you analyze your interview performance. You can ask me specific questions about your reports, like:\n\n• 'Why did I score low on verbal skills?'\n• 'How can I improve my speaking pace?'\n• '\n• 'Give me tips based on my performance'\n\nWhat would you like to know about your interview results?"
-            
-            if query_lower in simple_responses:
-                return "Great! Feel free to ask me any specific questions about your interview performance. I can help explain your scores, identify areas for improvement, or provide personalized recommendations based on your reports."
-            
-            # Check if the query is actually asking about performance/reports
-            report_keywords = [
-                "score", "report", "performance", "analysis", "feedback", "improve", "better", "why", "how",
-                "verbal", "nonverbal", "non-verbal", "speaking", "voice", "body language", "confidence",
-                "recommendations", "tips", "advice", "weak", "strong", "strength", "weakness", "problem",
-                "good", "bad", "rate", "speech rate", "words per minute", "wpm", "pace", "speed", "slow", "fast",
-                "time", "total", "minutes", "seconds", "speaking time", "stats", "statistics", "data",
-                "tell me", "what was", "how much", "how many", "analyze", "explain", "understand"
-            ]
-            
-            # Also check for question patterns that likely relate to reports
-            question_patterns = [
-                "what", "how", "why", "when", "where", "which", "tell me", "show me", "explain",
-                "was my", "is my", "did i", "do i", "can you", "could you"
-            ]
-            
-            # Check if it's a report-related query
-            has_report_keywords = any(keyword in query_lower for keyword in report_keywords)
-            has_question_pattern = any(pattern in query_lower for pattern in question_patterns)
-            
-            # If it doesn't seem report-related, give the generic response
-            if not has_report_keywords and not has_question_pattern:
-                return "I see you're in Report Analysis mode! I can help you understand your interview performance and provide personalized insights. Try asking something like:\n\n• 'Analyze my interview performance'\n• 'What are my weak areas?'\n• 'How can I improve my scores?'\n• 'Why did I get this feedback?'\n\nWhat specific aspect of your interview would you like me to analyze?"
-            
-            # Extract key issues from query for actual report analysis
-            focus_area = "general"
-            if any(word in query_lower for word in ["speak", "voice", "talk", "verbal", "communication", "speak slow", "speak fast", "filler"]):
-                focus_area = "verbal"
-            elif any(word in query_lower for word in ["posture", "nonverbal", "non-verbal", "nervous"]):
-                focus_area = "nonverbal"
-            
-            logger.info(f"Focus area determined: {focus_area}")
-            
             # Generate personalized response
             response = await self.generate_response(
                 query=query,
@@ -407,12 +613,78 @@ Note: as you are a chatbot assistane, please give short concise and to the point
             logger.exception("Full traceback:")
             return f"I encountered an issue while analyzing your reports: {str(e)}. Please try rephrasing your question or contact support if the issue persists."
 
-# Global chatbot instance
-chatbot_service = None
+    async def stream_user_report_analysis(self, query: str, user_reports: Dict[str, Any]) -> AsyncIterator[str]:
+        """Streaming variant of analyze_user_reports"""
+        if not user_reports:
+            yield "I don't see any interview reports for your account yet. Please complete an interview first to get personalized insights about your performance."
+            return
+        
+        async for chunk in self.stream_response(query=query, user_reports=user_reports):
+            yield chunk
+
+# Global chatbot instance, built once by a background thread
+chatbot_service: Optional[ChatbotService] = None
+_init_future: Optional[concurrent.futures.Future] = None
+_init_lock = threading.Lock()
+_init_error: Optional[str] = None
+_init_seconds: Optional[float] = None
+
+def _initialize_chatbot_service(future: concurrent.futures.Future):
+    """Construct and warm up the service, resolving the shared init future"""
+    global chatbot_service, _init_future, _init_error, _init_seconds
+    started = time.perf_counter()
+    try:
+        service = ChatbotService()
+        service.warm_up()
+    except Exception as e:
+        logger.error(f"Chatbot service initialization failed: {e}")
+        with _init_lock:
+            _init_error = str(e)
+            # The next caller starts a fresh attempt
+            _init_future = None
+        future.set_exception(e)
+        return
+    
+    _init_seconds = time.perf_counter() - started
+    chatbot_service = service
+    _init_error = None
+    logger.info(f"Chatbot service ready in {_init_seconds:.1f}s")
+    future.set_result(service)
+
+def start_chatbot_service() -> concurrent.futures.Future:
+    """Start initializing the chatbot service in a background thread (idempotent)"""
+    global _init_future
+    with _init_lock:
+        if _init_future is None:
+            _init_future = concurrent.futures.Future()
+            threading.Thread(
+                target=_initialize_chatbot_service,
+                args=(_init_future,),
+                name="chatbot-init",
+                daemon=True,
+            ).start()
+        return _init_future
+
+async def wait_for_chatbot_service() -> ChatbotService:
+    """Await the shared init future (concurrent first requests all wait on the same one)"""
+    if chatbot_service is not None:
+        return chatbot_service
+    return await asyncio.wrap_future(start_chatbot_service())
 
 def get_chatbot_service() -> ChatbotService:
-    """Get or create chatbot service instance"""
-    global chatbot_service
-    if chatbot_service is None:
-        chatbot_service = ChatbotService()
-    return chatbot_service
\ No newline at end of file
+    """Get the chatbot service, blocking until it is initialized (for scripts and CLIs)"""
+    if chatbot_service is not None:
+        return chatbot_service
+    return start_chatbot_service().result()
+
+def chatbot_readiness() -> Dict[str, Any]:
+    """Initialization state: not_started, initializing, ready or failed"""
+    if chatbot_service is not None:
+        state = "ready"
+    elif _init_future is not None:
+        state = "initializing"
+    elif _init_error is not None:
+        state = "failed"
+    else:
+        state = "not_started"
+    return {"state": state, "init_seconds": _init_seconds, "error": _init_error}
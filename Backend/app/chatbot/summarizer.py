@@ -0,0 +1,86 @@
+# SkillEdge-AI Chatbot Conversation Summarizer
+"""
+Local extractive summarizer used to compact long conversations.
+
+Older turns are folded into a short rolling summary: each folded message is
+represented by its most salient sentence (by content-word frequency across
+the folded turns), and the most salient of those, at most MAX_LINES_PER_FOLD,
+are appended in conversation order. The previous summary keeps the remaining
+lines, so earlier folds survive the next compaction instead of being pushed
+out by it. No model call is involved, so compaction is cheap enough to run
+inline on the write path.
+"""
+
+import re
+from collections import Counter
+from typing import List, Dict, Tuple
+
+# Upper bounds that keep the summary (and therefore the prompt) a constant size
+MAX_SUMMARY_LINES = 12
+MAX_LINE_CHARS = 220
+# New lines per compaction; the rest of MAX_SUMMARY_LINES is kept for the previous summary
+MAX_LINES_PER_FOLD = 6
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9']+")
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "if", "then", "so", "to", "of", "in", "on", "for", "with",
+    "at", "by", "from", "as", "is", "are", "was", "were", "be", "been", "being", "it", "its", "this",
+    "that", "these", "those", "i", "you", "your", "my", "me", "we", "our", "they", "them", "he", "she",
+    "do", "does", "did", "can", "could", "would", "should", "will", "just", "also", "very", "what",
+    "how", "why", "when", "which", "about", "there", "here", "have", "has", "had", "not", "no", "yes",
+}
+
+
+def _content_words(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS and len(w) > 2]
+
+
+def _best_sentence(text: str, frequencies: Counter) -> Tuple[str, float]:
+    """Most salient sentence of a message (highest average content-word frequency) and its score"""
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    if not sentences:
+        return "", 0.0
+
+    def score(sentence: str) -> float:
+        words = _content_words(sentence)
+        if not words:
+            return 0.0
+        return sum(frequencies[w] for w in words) / len(words)
+
+    best = max(sentences, key=score)
+    best_score = score(best)
+    if len(best) > MAX_LINE_CHARS:
+        best = best[:MAX_LINE_CHARS - 3].rstrip() + "..."
+    return best, best_score
+
+
+def summarize_messages(previous_summary: str, messages: List[Dict[str, str]]) -> str:
+    """
+    Fold messages ({"role", "content"}) into the rolling summary.
+
+    Returns the new summary: up to MAX_LINES_PER_FOLD lines for the folded
+    messages, after the most recent lines of the previous summary that still
+    fit in MAX_SUMMARY_LINES.
+    """
+    frequencies = Counter()
+    for message in messages:
+        frequencies.update(_content_words(message["content"]))
+
+    candidates = []  # (score, position, line)
+    for position, message in enumerate(messages):
+        sentence, score = _best_sentence(message["content"], frequencies)
+        if not sentence:
+            continue
+        speaker = "User" if message["role"] == "user" else "Assistant"
+        candidates.append((score, position, f"- {speaker}: {sentence}"))
+
+    # Most salient lines of this fold, back in conversation order
+    selected = sorted(candidates, key=lambda c: (-c[0], c[1]))[:MAX_LINES_PER_FOLD]
+    new_lines = [line for _, _, line in sorted(selected, key=lambda c: c[1])]
+
+    previous_lines = [line for line in (previous_summary or "").split("\n") if line.strip()]
+    keep = MAX_SUMMARY_LINES - len(new_lines)
+    previous_lines = previous_lines[-keep:] if keep > 0 else []
+    return "\n".join(previous_lines + new_lines)
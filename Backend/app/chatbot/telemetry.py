@@ -0,0 +1,59 @@
+# SkillEdge-AI Chatbot Telemetry
+"""
+Chatbot request metrics, exported on /metrics.
+
+A chat request is broken into stages (embedding, intent routing, retrieval,
+report fetch, prompt assembly, LLM call) that are timed into one histogram
+labelled by stage, so p95 per stage can be compared directly. Prompt and
+completion token counts, cache hits/misses and how each answer was produced
+(intent router, semantic cache or LLM) are recorded alongside.
+"""
+
+from typing import Any, Optional
+
+from app.metrics import Counter, Histogram
+
+CHAT_STAGE_SECONDS = Histogram(
+    "skilledge_chat_stage_seconds",
+    "Time spent in each stage of a chat request",
+    labelnames=("stage",),
+)
+
+CHAT_ANSWERS = Counter(
+    "skilledge_chat_answers_total",
+    "Chat answers by source (intent, semantic_cache, llm, error)",
+    labelnames=("source",),
+)
+
+CACHE_LOOKUPS = Counter(
+    "skilledge_chat_cache_lookups_total",
+    "Chatbot cache lookups by cache and result",
+    labelnames=("cache", "result"),
+)
+
+LLM_TOKENS = Histogram(
+    "skilledge_chat_llm_tokens",
+    "Tokens per LLM call (prompt and completion)",
+    labelnames=("kind",),
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768),
+)
+
+# Rough fallback when the API response carries no usage metadata
+CHARS_PER_TOKEN = 4
+
+
+def stage(name: str):
+    """Context manager timing one request stage"""
+    return CHAT_STAGE_SECONDS.time(stage=name)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_tokens(prompt: str, usage: Optional[Any] = None, completion: str = ""):
+    """Record prompt/completion token counts, from Gemini usage metadata when available"""
+    prompt_tokens = getattr(usage, "prompt_token_count", None) if usage is not None else None
+    completion_tokens = getattr(usage, "candidates_token_count", None) if usage is not None else None
+    LLM_TOKENS.observe(prompt_tokens if prompt_tokens else len(prompt) // CHARS_PER_TOKEN, kind="prompt")
+    LLM_TOKENS.observe(completion_tokens if completion_tokens else len(completion) // CHARS_PER_TOKEN, kind="completion")
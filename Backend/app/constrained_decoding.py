@@ -0,0 +1,131 @@
+# SkillEdge-API/app/constrained_decoding.py
+"""
+Constrained decoding for the "QuestionN: <question>" output format.
+
+QuestionFormatLogitsProcessor drives generation through a small state
+machine per sequence:
+
+    header  the tokens of "Question{k}:" are forced one by one
+    text    free generation of the question, on a single line; the newline
+            token ends it (after MIN_QUESTION_TOKENS, and is forced after
+            MAX_QUESTION_TOKENS)
+    end     after `count` questions, EOS is forced
+
+So there is no preamble, no numbering drift and no questions beyond count,
+and max_new_tokens can be sized exactly (see max_new_tokens()). The processor
+is stateless: every call replays the tokens generated after prompt_length
+through the state machine. Assisted (speculative) generation scores draft
+candidates against prefixes of different lengths, and beam search reorders
+rows between steps, so both work unchanged.
+"""
+
+import os
+from functools import lru_cache
+from typing import List
+
+import torch
+from transformers import LogitsProcessor
+
+MIN_QUESTION_TOKENS = 3
+MAX_QUESTION_TOKENS = int(os.getenv("LOCAL_MAX_QUESTION_TOKENS", "60"))
+
+HEADER, TEXT, END = "header", "text", "end"
+
+
+@lru_cache(maxsize=4)
+def multiline_token_ids(tokenizer) -> torch.Tensor:
+    """
+    Ids of vocabulary tokens that contain a newline.
+
+    Decodes the whole vocabulary once per tokenizer (seconds for large
+    vocabularies), so call it at startup or off the event loop.
+    """
+    texts = tokenizer.batch_decode([[i] for i in range(len(tokenizer))])
+    return torch.tensor([i for i, text in enumerate(texts) if "\n" in text], dtype=torch.long)
+
+
+class _SequenceState:
+    def __init__(self):
+        self.phase = HEADER
+        self.question = 0  # 0-based index of the question being written
+        self.position = 0  # tokens of the current header emitted so far
+        self.text_tokens = 0
+
+
+class QuestionFormatLogitsProcessor(LogitsProcessor):
+    """Forces "Question1: ...\\nQuestion2: ..." output and ends after `count` questions"""
+
+    def __init__(self, tokenizer, count: int, eos_token_id: int, prompt_length: int,
+                 min_question_tokens: int = MIN_QUESTION_TOKENS,
+                 max_question_tokens: int = MAX_QUESTION_TOKENS):
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        newline_ids = tokenizer("\n", add_special_tokens=False).input_ids
+        if len(newline_ids) != 1:
+            raise ValueError("Tokenizer has no single newline token")
+
+        self.count = count
+        self.eos_token_id = eos_token_id
+        self.prompt_length = prompt_length
+        self.newline_id = newline_ids[0]
+        self.headers: List[List[int]] = [
+            tokenizer(f"Question{k}:", add_special_tokens=False).input_ids for k in range(1, count + 1)
+        ]
+        # Inside a question only the plain newline token may end the line
+        multiline = multiline_token_ids(tokenizer)
+        self.blocked_in_text = multiline[multiline != self.newline_id]
+        self.min_question_tokens = min_question_tokens
+        self.max_question_tokens = max_question_tokens
+
+    def max_new_tokens(self) -> int:
+        """Upper bound on generated tokens: every header, full-length questions, newlines and EOS"""
+        return sum(len(header) for header in self.headers) + self.count * (self.max_question_tokens + 1) + 1
+
+    def _advance(self, state: _SequenceState, token_id: int):
+        if state.phase == HEADER:
+            state.position += 1
+            if state.position == len(self.headers[state.question]):
+                state.phase, state.text_tokens = TEXT, 0
+        elif state.phase == TEXT:
+            if token_id == self.newline_id:
+                state.question += 1
+                state.phase, state.position = (HEADER, 0) if state.question < self.count else (END, 0)
+            elif token_id == self.eos_token_id:
+                state.phase = END
+            else:
+                state.text_tokens += 1
+
+    @staticmethod
+    def _force(row_scores: torch.FloatTensor, token_id: int):
+        row_scores.fill_(-float("inf"))
+        row_scores[token_id] = 0.0
+
+    def _state(self, generated: List[int]) -> _SequenceState:
+        """State after the generated tokens (replayed from the start of the output)"""
+        state = _SequenceState()
+        for token_id in generated:
+            self._advance(state, token_id)
+        return state
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        for row, generated in enumerate(input_ids[:, self.prompt_length:].tolist()):
+            state = self._state(generated)
+            row_scores = scores[row]
+            if state.phase == HEADER:
+                self._force(row_scores, self.headers[state.question][state.position])
+            elif state.phase == END:
+                self._force(row_scores, self.eos_token_id)
+            else:
+                last_question = state.question == self.count - 1
+                end_token = self.eos_token_id if last_question else self.newline_id
+                if state.text_tokens >= self.max_question_tokens:
+                    self._force(row_scores, end_token)
+                    continue
+                row_scores[self.blocked_in_text.to(row_scores.device)] = -float("inf")
+                if state.text_tokens < self.min_question_tokens:
+                    row_scores[self.newline_id] = -float("inf")
+                    row_scores[self.eos_token_id] = -float("inf")
+                elif not last_question:
+                    # More questions to come; the line must end with a newline, not EOS
+                    row_scores[self.eos_token_id] = -float("inf")
+        return scores
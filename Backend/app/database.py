@@ -5,6 +5,7 @@ MongoDB database configuration and connection management
 
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -41,10 +42,58 @@ async def connect_to_mongo():
         print(f"✅ Connected to MongoDB at {MONGO_URL}")
         print(f"📊 Using database: {DB_NAME}")
         
+        await ensure_indexes()
+        
     except Exception as e:
         print(f"❌ Could not connect to MongoDB: {e}")
         raise e
 
+async def ensure_indexes():
+    """Create the indexes the read paths rely on (no-op if they already exist)"""
+    db = mongodb.database
+    
+    # Keyset pagination for /api/reports/user-interviews walks (created_at, _id) newest first
+    await db["interview_reports"].create_index(
+        [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+        name="user_created_at_id"
+    )
+    
+    # Time-bucketed progress history aggregates overall reports per user over a date range
+    await db["overall_reports"].create_index(
+        [("user_id", ASCENDING), ("created_at", ASCENDING)],
+        name="user_created_at"
+    )
+    
+    # Cohort rollups are fetched by a single (role, interview_type) point lookup
+    await db["analytics_rollups"].create_index(
+        [("role", ASCENDING), ("interview_type", ASCENDING)],
+        unique=True,
+        name="role_interview_type"
+    )
+    
+    # Goal engine loads a user's active goals on every saved interview
+    await db["user_goals"].create_index(
+        [("user_id", ASCENDING), ("status", ASCENDING)],
+        name="user_status"
+    )
+    
+    # Chatbot report mode fetches each user's latest verbal and non-verbal report
+    for collection in ("verbal_reports", "nonverbal_reports"):
+        await db[collection].create_index(
+            [("user_id", ASCENDING), ("created_at", DESCENDING)],
+            name="user_created_at"
+        )
+        # Goal recalculation and the cohort rollup fetch reports for a batch of interview ids
+        await db[collection].create_index("interview_id", name="interview_id")
+    
+    # Chatbot conversation listing is per user, most recently updated first
+    await db["chatbot_conversations"].create_index(
+        [("user_id", ASCENDING), ("updated_at", DESCENDING)],
+        name="user_updated_at"
+    )
+    
+    print("🗂️ MongoDB indexes ensured")
+
 async def close_mongo_connection():
     """Close database connection"""
     if mongodb.client:
@@ -87,3 +136,11 @@ def get_nonverbal_reports_collection():
 def get_overall_reports_collection():
     """Get overall reports collection"""
     return get_collection("overall_reports")
+
+def get_user_goals_collection():
+    """Get user goals collection"""
+    return get_collection("user_goals")
+
+def get_chatbot_conversations_collection():
+    """Get chatbot conversations collection"""
+    return get_collection("chatbot_conversations")
@@ -0,0 +1,35 @@
+# SkillEdge-API/app/events.py
+"""
+Minimal in-process event bus.
+
+Routers publish domain events (e.g. an interview being saved) and feature
+modules subscribe handlers to them, so the write path doesn't need to know
+about every consumer. Handlers run after the response is sent (via FastAPI
+BackgroundTasks) and a failing handler never affects the others.
+"""
+
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+INTERVIEW_SAVED = "interview_saved"
+
+EventHandler = Callable[..., Awaitable[None]]
+
+_handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+
+
+def subscribe(event: str):
+    """Decorator registering an async handler for an event"""
+    def decorator(handler: EventHandler) -> EventHandler:
+        _handlers[event].append(handler)
+        return handler
+    return decorator
+
+
+async def publish(event: str, **payload):
+    """Run every handler subscribed to the event, isolating failures"""
+    for handler in _handlers.get(event, []):
+        try:
+            await handler(**payload)
+        except Exception as e:
+            print(f"❌ Event handler {handler.__name__} failed for '{event}': {str(e)}")
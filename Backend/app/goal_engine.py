@@ -0,0 +1,340 @@
+# SkillEdge-API/app/goal_engine.py
+"""
+Goal progress engine.
+
+Incremental path: subscribed to the interview_saved event, it updates only the
+user's active goals from the freshly saved reports with a single bulk write.
+
+Full path: recalculate_goals() rebuilds baseline, current value, trend and score
+history from all of a user's interviews. It reads only the report fields goals
+need and also finishes with one bulk write. It is a maintenance operation, run
+from the command line rather than exposed over HTTP:
+
+    python -m app.goal_engine --user-id <id> [--user-id <id> ...]
+    python -m app.goal_engine --all
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from pymongo import UpdateOne
+
+from app.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_user_goals_collection,
+    get_interview_reports_collection,
+    get_verbal_reports_collection,
+    get_nonverbal_reports_collection,
+)
+from app.events import subscribe, INTERVIEW_SAVED
+from app.skill_scores import (
+    extract_verbal_skill_scores,
+    extract_nonverbal_skill_scores,
+    get_filler_percentage,
+    get_words_per_minute,
+)
+
+ACTIVE_GOAL_STATUSES = ["in_progress", "not_started"]
+
+# Goal types where a lower value is better
+LOWER_IS_BETTER = {"filler_words"}
+
+# Most recent score history entries kept per goal
+MAX_SCORE_HISTORY = 50
+
+GOAL_FIELDS = {
+    "_id": 1,
+    "goal_type": 1,
+    "metric_name": 1,
+    "target_value": 1,
+    "start_value": 1,
+    "status": 1,
+    "created_at": 1,
+    "score_history": {"$slice": -MAX_SCORE_HISTORY},
+}
+
+# Narrow report projections: only what extract_goal_value reads
+VERBAL_GOAL_PROJECTION = {
+    "_id": 0,
+    "interview_id": 1,
+    "overall_score": 1,
+    "metrics.response_structure": 1,
+    "metrics.vocabulary_richness": 1,
+    "metrics.domain_knowledge": 1,
+    "metrics.concepts_understanding": 1,
+}
+
+NONVERBAL_GOAL_PROJECTION = {
+    "_id": 0,
+    "interview_id": 1,
+    "analytics.confidenceScores": 1,
+    "analytics.fillerWordsBreakdown": 1,
+    "analytics.speakingStats": 1,
+}
+
+
+def extract_goal_value(
+    goal_type: str,
+    verbal_report: Optional[Dict[str, Any]],
+    nonverbal_report: Optional[Dict[str, Any]]
+) -> Optional[float]:
+    """Current value of a goal's metric from one interview's reports, or None if unavailable"""
+    if goal_type == "score_improvement":
+        score = (verbal_report or {}).get("overall_score")
+        return score if isinstance(score, (int, float)) else None
+
+    if goal_type == "communication":
+        return extract_verbal_skill_scores(verbal_report).get("communication")
+
+    if goal_type == "technical":
+        return extract_verbal_skill_scores(verbal_report).get("technical_knowledge")
+
+    analytics = (nonverbal_report or {}).get("analytics")
+    if not isinstance(analytics, dict):
+        return None
+
+    if goal_type == "filler_words":
+        return get_filler_percentage(analytics)
+
+    if goal_type == "speaking_speed":
+        return get_words_per_minute(analytics)
+
+    if goal_type == "confidence":
+        return extract_nonverbal_skill_scores(nonverbal_report).get("confidence")
+
+    return None
+
+
+def calculate_progress(goal_type: str, start_value: float, current_value: float, target_value: float) -> float:
+    """Progress towards the target in percent, clamped to 0-100"""
+    if goal_type in LOWER_IS_BETTER:
+        if start_value > target_value:
+            progress = ((start_value - current_value) / (start_value - target_value)) * 100
+        else:
+            progress = 100 if current_value <= target_value else 0
+    else:
+        if target_value > start_value:
+            progress = ((current_value - start_value) / (target_value - start_value)) * 100
+        else:
+            progress = 100 if current_value >= target_value else 0
+
+    return max(0, min(100, progress))
+
+
+def calculate_trend(goal_type: str, score_history: List[Dict[str, Any]]) -> str:
+    """Trend over a goal's score history: overall change, overridden by a large last-step change"""
+    if len(score_history) < 2:
+        return "stable"
+
+    # For lower-is-better metrics a falling score is an improvement
+    direction = -1 if goal_type in LOWER_IS_BETTER else 1
+    baseline = score_history[0]["score"]
+    change_amount = (score_history[-1]["score"] - baseline) * direction
+    recent_change = (score_history[-1]["score"] - score_history[-2]["score"]) * direction
+    threshold = abs(baseline) * 0.05
+
+    trend = "stable"
+    if change_amount > threshold:
+        trend = "improving"
+    elif change_amount < -threshold:
+        trend = "declining"
+
+    if abs(recent_change) > threshold:
+        trend = "improving" if recent_change > 0 else "declining"
+
+    return trend
+
+
+def _goal_update(
+    goal: Dict[str, Any],
+    start_value: float,
+    current_value: float,
+    score_history: List[Dict[str, Any]],
+    now: datetime
+) -> Dict[str, Any]:
+    """$set document for a goal given its baseline, latest value and score history"""
+    progress = calculate_progress(goal.get("goal_type", ""), start_value, current_value, goal["target_value"])
+    change_amount = current_value - start_value
+
+    update = {
+        "start_value": start_value,
+        "current_value": current_value,
+        "progress_percentage": progress,
+        "trend": calculate_trend(goal.get("goal_type", ""), score_history),
+        "change_amount": change_amount,
+        "change_percentage": (change_amount / start_value) * 100 if start_value > 0 else 0,
+        "status": "in_progress",
+        "updated_at": now,
+    }
+    if progress >= 100:
+        update["status"] = "completed"
+        update["completed_at"] = now
+    return update
+
+
+@subscribe(INTERVIEW_SAVED)
+async def update_goals_for_interview(
+    user_id: str,
+    interview_id: str,
+    verbal_report: Optional[Dict[str, Any]] = None,
+    nonverbal_report: Optional[Dict[str, Any]] = None,
+    **_
+):
+    """Update the user's active goals from a newly saved interview with a single bulk write"""
+    goals_collection = get_user_goals_collection()
+
+    active_goals = await goals_collection.find(
+        {"user_id": user_id, "status": {"$in": ACTIVE_GOAL_STATUSES}},
+        GOAL_FIELDS
+    ).to_list(length=None)
+
+    if not active_goals:
+        return
+
+    now = datetime.utcnow()
+    operations = []
+    for goal in active_goals:
+        current_value = extract_goal_value(goal.get("goal_type", ""), verbal_report, nonverbal_report)
+        if current_value is None:
+            continue
+
+        # The first interview after the goal was set becomes its baseline
+        start_value = goal.get("start_value")
+        if start_value is None:
+            start_value = current_value
+
+        entry = {
+            "date": now.isoformat(),
+            "score": round(current_value, 1),
+            "interview_id": interview_id,
+        }
+        score_history = (goal.get("score_history") or []) + [entry]
+
+        update = _goal_update(goal, start_value, current_value, score_history[-MAX_SCORE_HISTORY:], now)
+        operations.append(UpdateOne(
+            {"_id": goal["_id"]},
+            {
+                "$set": update,
+                "$push": {"score_history": {"$each": [entry], "$slice": -MAX_SCORE_HISTORY}},
+            }
+        ))
+
+    if operations:
+        result = await goals_collection.bulk_write(operations, ordered=False)
+        print(f"🎯 Updated {result.modified_count} goal(s) for user {user_id[:8]}... after interview {interview_id[:8]}...")
+
+
+async def recalculate_goals(user_id: str) -> Dict[str, Any]:
+    """
+    Rebuild every active goal of a user from their full interview history.
+
+    Loads interviews created since the oldest active goal and only the report
+    fields goals need, then writes all goal updates in one bulk write.
+    """
+    goals_collection = get_user_goals_collection()
+    interview_reports_collection = get_interview_reports_collection()
+    verbal_reports_collection = get_verbal_reports_collection()
+    nonverbal_reports_collection = get_nonverbal_reports_collection()
+
+    active_goals = await goals_collection.find(
+        {"user_id": user_id, "status": {"$in": ACTIVE_GOAL_STATUSES}},
+        GOAL_FIELDS
+    ).to_list(length=None)
+
+    if not active_goals:
+        return {"goals_updated": 0, "interviews_found": 0, "active_goals": 0}
+
+    oldest_goal = min(goal.get("created_at", datetime.utcnow()) for goal in active_goals)
+
+    # Oldest first so score histories come out in chronological order
+    interviews = await interview_reports_collection.find(
+        {"user_id": user_id, "created_at": {"$gte": oldest_goal}},
+        {"_id": 1, "created_at": 1}
+    ).sort("created_at", 1).to_list(length=None)
+
+    if not interviews:
+        return {"goals_updated": 0, "interviews_found": 0, "active_goals": len(active_goals)}
+
+    interview_ids = [str(i["_id"]) for i in interviews]
+
+    verbal_reports = await verbal_reports_collection.find(
+        {"interview_id": {"$in": interview_ids}},
+        VERBAL_GOAL_PROJECTION
+    ).to_list(length=None)
+
+    nonverbal_reports = await nonverbal_reports_collection.find(
+        {"interview_id": {"$in": interview_ids}},
+        NONVERBAL_GOAL_PROJECTION
+    ).to_list(length=None)
+
+    verbal_lookup = {r["interview_id"]: r for r in verbal_reports}
+    nonverbal_lookup = {r["interview_id"]: r for r in nonverbal_reports}
+
+    now = datetime.utcnow()
+    operations = []
+    for goal in active_goals:
+        goal_created = goal.get("created_at", now)
+        goal_type = goal.get("goal_type", "")
+
+        score_history = []
+        for interview in interviews:
+            if interview["created_at"] < goal_created:
+                continue
+            interview_id = str(interview["_id"])
+            value = extract_goal_value(goal_type, verbal_lookup.get(interview_id), nonverbal_lookup.get(interview_id))
+            if value is None:
+                continue
+            score_history.append({
+                "date": interview["created_at"].isoformat(),
+                "score": round(value, 1),
+                "interview_id": interview_id,
+            })
+
+        if not score_history:
+            continue
+
+        baseline_value = score_history[0]["score"]
+        current_value = score_history[-1]["score"]
+
+        update = _goal_update(goal, baseline_value, current_value, score_history, now)
+        update["score_history"] = score_history[-MAX_SCORE_HISTORY:]
+        operations.append(UpdateOne({"_id": goal["_id"]}, {"$set": update}))
+
+    if operations:
+        await goals_collection.bulk_write(operations, ordered=False)
+
+    return {
+        "goals_updated": len(operations),
+        "interviews_found": len(interviews),
+        "active_goals": len(active_goals),
+    }
+
+
+async def _recalculate(user_ids: List[str], all_users: bool):
+    await connect_to_mongo()
+    try:
+        if all_users:
+            user_ids = await get_user_goals_collection().distinct(
+                "user_id", {"status": {"$in": ACTIVE_GOAL_STATUSES}}
+            )
+        for user_id in user_ids:
+            result = await recalculate_goals(user_id)
+            print(f"✅ {user_id}: recalculated {result['goals_updated']} goal(s) from {result['interviews_found']} interview(s)")
+    finally:
+        await close_mongo_connection()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Rebuild active goals from full interview history")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user-id", action="append", default=[], help="User whose goals to rebuild (repeatable)")
+    target.add_argument("--all", action="store_true", help="Rebuild goals of every user with an active goal")
+    args = parser.parse_args(argv)
+    asyncio.run(_recalculate(args.user_id, args.all))
+
+
+if __name__ == "__main__":
+    main()
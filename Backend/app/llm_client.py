@@ -0,0 +1,458 @@
+# SkillEdge-API/app/llm_client.py
+"""
+Shared LLM client layer.
+
+Every Gemini call (verbal report analysis in main.py, chatbot answers) goes
+through LLMClient, which applies one policy process-wide:
+
+- a global concurrency limit (LLM_MAX_CONCURRENCY in-flight calls)
+- a token bucket (LLM_RATE_PER_MINUTE requests, bursts up to LLM_BURST)
+- a per-call timeout (LLM_TIMEOUT_SECONDS; for streams, between chunks)
+- retries with exponential backoff and jitter on rate-limit and overload
+  errors (streams are only retried before their first chunk)
+- hedged requests: when LLM_HEDGE_AFTER_SECONDS > 0, a second identical call
+  is started if the first hasn't returned by then, and the first to succeed wins
+
+Provider calls are blocking and can't be interrupted, so they run on a
+dedicated pool of LLM_MAX_CONCURRENCY threads and each one holds its
+concurrency slot until the thread actually returns, not until the caller
+stops waiting. A call that timed out or lost a hedge therefore still counts
+against the limit, and timeouts are not retried (the retry would run
+alongside the call it replaces).
+
+Prompts are plain strings or app.prompts.RenderedPrompt. For the latter,
+the Gemini provider stores the static prefix as provider-side cached content
+(LLM_CONTEXT_CACHE) and sends only the dynamic part. Prefixes below the
+model's minimum cacheable size (counted once per prefix with count_tokens),
+or models without caching support, fall back to sending the full prompt,
+which still leaves the prefix first, where implicit prefix caching can pick
+it up. The current templates' prefixes are all below the 1024-token minimum
+of gemini-2.5-flash, so for now every call takes that fallback.
+
+LLM_PROVIDER=stub swaps Gemini for a deterministic local provider (same
+prompt, same answer, simulated latency), so load tests and benchmarks run
+offline without quota.
+"""
+
+import os
+import json
+import random
+import asyncio
+import hashlib
+import threading
+import time
+import concurrent.futures
+from datetime import timedelta
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Set, Tuple, Union
+
+from app.metrics import Counter, Histogram
+from app.prompts import PREFIX_CACHE, RenderedPrompt
+
+Prompt = Union[str, RenderedPrompt]
+
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini").lower()  # gemini | stub
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_RATE_PER_MINUTE = float(os.getenv("LLM_RATE_PER_MINUTE", "60"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "8"))
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))  # 0 = no hedging
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "300"))
+
+# Provider-side caching of static prompt prefixes
+LLM_CONTEXT_CACHE = os.getenv("LLM_CONTEXT_CACHE", "1") == "1"
+LLM_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("LLM_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+# Gemini rejects cached contents below a model-dependent minimum (1024 tokens for 2.5 Flash)
+LLM_CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("LLM_CONTEXT_CACHE_MIN_TOKENS", "1024"))
+
+# google.api_core exception names worth retrying (429 / 5xx / deadline)
+RETRYABLE_ERRORS = {
+    "ResourceExhausted",
+    "TooManyRequests",
+    "ServiceUnavailable",
+    "InternalServerError",
+    "DeadlineExceeded",
+    "GatewayTimeout",
+}
+
+LLM_CALLS = Counter(
+    "skilledge_llm_calls_total",
+    "LLM call attempts by model and outcome (ok, retry, error, hedge)",
+    labelnames=("model", "outcome"),
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "skilledge_llm_call_seconds",
+    "Duration of LLM generate calls including retries and hedging",
+    labelnames=("model",),
+)
+
+
+@dataclass
+class LLMResponse:
+    """Provider-neutral response (chunks of a stream have the same shape)"""
+    text: str
+    usage_metadata: Optional[Any] = None
+
+
+@dataclass
+class StubUsage:
+    prompt_token_count: int
+    candidates_token_count: int
+
+
+def _prompt_text(prompt: Prompt) -> str:
+    return prompt.text if isinstance(prompt, RenderedPrompt) else prompt
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, asyncio.TimeoutError):
+        # The timed-out call is still running
+        return False
+    return type(error).__name__ in RETRYABLE_ERRORS or getattr(error, "code", None) in (429, 500, 503, 504)
+
+
+class GeminiProvider:
+    """Blocking calls to a google.generativeai model, with cached prompt prefixes"""
+
+    def __init__(self, model_name: str):
+        import google.generativeai as genai
+
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+        genai.configure(api_key=api_key)
+        self.genai = genai
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+        # prefix key -> (model bound to the cached content, local expiry time)
+        self._prefix_models: Dict[str, Tuple[Any, float]] = {}
+        self._uncacheable: Set[str] = set()
+        # Guards the dicts above; the network calls run under a per-prefix lock instead
+        self._cache_lock = threading.Lock()
+        self._prefix_locks: Dict[str, threading.Lock] = {}
+
+    def _cached_model(self, key: str):
+        cached = self._prefix_models.get(key)
+        # Recreate shortly before the provider-side TTL runs out
+        if cached is not None and cached[1] - time.time() > 60:
+            return cached[0]
+        return None
+
+    def _prefix_model(self, prompt: RenderedPrompt):
+        """Model bound to cached content holding the prompt prefix, or None to send the full prompt"""
+        key = prompt.prefix_key
+        if not LLM_CONTEXT_CACHE:
+            return None
+        with self._cache_lock:
+            if key in self._uncacheable:
+                return None
+            model = self._cached_model(key)
+            if model is not None:
+                PREFIX_CACHE.inc(backend="gemini", result="hit")
+                return model
+            prefix_lock = self._prefix_locks.setdefault(key, threading.Lock())
+
+        # Only callers needing this same prefix wait while it is counted and uploaded
+        with prefix_lock:
+            with self._cache_lock:
+                if key in self._uncacheable:
+                    return None
+                model = self._cached_model(key)
+            if model is not None:
+                PREFIX_CACHE.inc(backend="gemini", result="hit")
+                return model
+
+            try:
+                from google.generativeai import caching
+
+                prefix_tokens = self.model.count_tokens(prompt.prefix).total_tokens
+                if prefix_tokens < LLM_CONTEXT_CACHE_MIN_TOKENS:
+                    print(f"ℹ️ Prefix {key} has {prefix_tokens} tokens, below the {LLM_CONTEXT_CACHE_MIN_TOKENS}-token caching minimum; sending full prompts")
+                    with self._cache_lock:
+                        self._uncacheable.add(key)
+                    PREFIX_CACHE.inc(backend="gemini", result="skip")
+                    return None
+
+                PREFIX_CACHE.inc(backend="gemini", result="miss")
+                content = caching.CachedContent.create(
+                    model=self.model_name,
+                    display_name=f"skilledge-{key}",
+                    system_instruction=prompt.prefix,
+                    ttl=timedelta(seconds=LLM_CONTEXT_CACHE_TTL_SECONDS),
+                )
+                model = self.genai.GenerativeModel.from_cached_content(cached_content=content)
+            except Exception as e:
+                # Model without caching support or token counting failed; don't retry this prefix
+                print(f"⚠️ Context caching unavailable for prefix {key} on {self.model_name}: {str(e)}")
+                with self._cache_lock:
+                    self._uncacheable.add(key)
+                PREFIX_CACHE.inc(backend="gemini", result="error")
+                return None
+
+            with self._cache_lock:
+                self._prefix_models[key] = (model, time.time() + LLM_CONTEXT_CACHE_TTL_SECONDS)
+            return model
+
+    def _model_and_contents(self, prompt: Prompt):
+        if isinstance(prompt, RenderedPrompt):
+            model = self._prefix_model(prompt)
+            if model is not None:
+                return model, prompt.dynamic
+        return self.model, _prompt_text(prompt)
+
+    def generate(self, prompt: Prompt) -> LLMResponse:
+        model, contents = self._model_and_contents(prompt)
+        response = model.generate_content(contents)
+        return LLMResponse(response.text, getattr(response, "usage_metadata", None))
+
+    def stream(self, prompt: Prompt) -> Iterator[LLMResponse]:
+        model, contents = self._model_and_contents(prompt)
+        for chunk in model.generate_content(contents, stream=True):
+            yield LLMResponse(getattr(chunk, "text", ""), getattr(chunk, "usage_metadata", None))
+
+
+class StubProvider:
+    """Deterministic offline provider: the answer depends only on the prompt"""
+
+    def __init__(self, model_name: str, latency_ms: float = LLM_STUB_LATENCY_MS):
+        self.model_name = model_name
+        self.latency = latency_ms / 1000
+
+    def _answer(self, prompt: str) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        score = 50 + int(digest[:4], 16) % 50
+        if "JSON" in prompt:
+            return json.dumps({
+                "stub": True,
+                "overall_score": score,
+                "summary": f"Deterministic stub evaluation {digest[:8]}.",
+                "metrics": {},
+                "individual_answers": [],
+                "recommendations": ["Stub recommendation."],
+                "interview_readiness": "needs improvement",
+            })
+        return (
+            f"Stub answer {digest[:8]} ({self.model_name}). "
+            "This deterministic response stands in for the LLM during offline load tests "
+            f"and benchmarks; it reports a score of {score} so callers have a number to parse."
+        )
+
+    def _usage(self, prompt: str, answer: str) -> StubUsage:
+        return StubUsage(len(prompt) // 4, len(answer) // 4)
+
+    def generate(self, prompt: Prompt) -> LLMResponse:
+        prompt = _prompt_text(prompt)
+        time.sleep(self.latency)
+        answer = self._answer(prompt)
+        return LLMResponse(answer, self._usage(prompt, answer))
+
+    def stream(self, prompt: Prompt) -> Iterator[LLMResponse]:
+        prompt = _prompt_text(prompt)
+        answer = self._answer(prompt)
+        words = answer.split(" ")
+        chunks = [" ".join(words[i:i + 8]) + " " for i in range(0, len(words), 8)]
+        for i, chunk in enumerate(chunks):
+            time.sleep(self.latency / len(chunks))
+            last = i == len(chunks) - 1
+            yield LLMResponse(chunk.rstrip() if last else chunk, self._usage(prompt, answer) if last else None)
+
+
+class TokenBucket:
+    """Async token bucket: rate tokens per second, up to capacity banked"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        # Waiters are served in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# Shared by every client, so the limits are global to the process
+_concurrency = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_rate_limiter = TokenBucket(LLM_RATE_PER_MINUTE / 60, LLM_BURST)
+# Provider calls never compete with embeddings or KB writes in the default executor
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+
+
+class LLMClient:
+    """Async LLM calls with concurrency/rate limits, timeouts, retries and hedging"""
+
+    def __init__(self, model_name: str, provider: Optional[str] = None):
+        self.model_name = model_name
+        self.provider_name = provider or LLM_PROVIDER
+        if self.provider_name == "stub":
+            self.provider = StubProvider(model_name)
+        elif self.provider_name == "gemini":
+            self.provider = GeminiProvider(model_name)
+        else:
+            raise ValueError(f"Unknown LLM provider {self.provider_name!r}, expected 'gemini' or 'stub'")
+        self.timeout = LLM_TIMEOUT_SECONDS
+        self.max_retries = LLM_MAX_RETRIES
+        self.hedge_after = LLM_HEDGE_AFTER_SECONDS
+
+    async def _start(self, fn, *args) -> asyncio.Future:
+        """
+        Run fn on the LLM thread pool in one of the global concurrency slots,
+        after taking a rate-limit token.
+
+        The slot is released when fn returns, however long the caller waits;
+        await the result through asyncio.shield so a timeout or cancellation
+        doesn't end the accounting early.
+        """
+        await _concurrency.acquire()
+        try:
+            await _rate_limiter.acquire()
+            future = asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+        except BaseException:
+            _concurrency.release()
+            raise
+
+        def finished(done: asyncio.Future):
+            _concurrency.release()
+            if not done.cancelled():
+                done.exception()  # retrieved here when the caller gave up waiting
+
+        future.add_done_callback(finished)
+        return future
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter"""
+        return min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    async def _attempt(self, prompt: Prompt) -> LLMResponse:
+        future = await self._start(self.provider.generate, prompt)
+        # The worker thread can't be interrupted; on timeout its result is discarded
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+
+    async def _hedged(self, prompt: Prompt) -> LLMResponse:
+        """One attempt, plus a backup request if the first is slower than hedge_after"""
+        if self.hedge_after <= 0:
+            return await self._attempt(prompt)
+
+        primary = asyncio.create_task(self._attempt(prompt))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        LLM_CALLS.inc(model=self.model_name, outcome="hedge")
+        pending = {primary, asyncio.create_task(self._attempt(prompt))}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def generate(self, prompt: Prompt) -> LLMResponse:
+        """Generate a full response, retrying retryable failures with backoff"""
+        started = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                try:
+                    response = await self._hedged(prompt)
+                    LLM_CALLS.inc(model=self.model_name, outcome="ok")
+                    return response
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        LLM_CALLS.inc(model=self.model_name, outcome="error")
+                        raise
+                    LLM_CALLS.inc(model=self.model_name, outcome="retry")
+                    await asyncio.sleep(self._backoff(attempt))
+                    attempt += 1
+        finally:
+            LLM_CALL_SECONDS.observe(time.perf_counter() - started, model=self.model_name)
+
+    async def _stream_once(self, prompt: Prompt) -> AsyncIterator[LLMResponse]:
+        """
+        Async adapter over the provider's blocking stream.
+
+        The stream is consumed in a worker thread that hands each chunk to the
+        event loop through an asyncio.Queue, so the first tokens reach the
+        caller while the rest of the answer is still being generated.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                for chunk in self.provider.stream(prompt):
+                    if cancelled.is_set():
+                        # Consumer went away; stop pulling from the stream
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        # The slot is held until produce returns (it stops at the next chunk once cancelled)
+        await self._start(produce)
+        try:
+            while True:
+                item = await asyncio.wait_for(queue.get(), self.timeout)
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancelled.set()
+
+    async def stream(self, prompt: Prompt) -> AsyncIterator[LLMResponse]:
+        """Stream response chunks; failures before the first chunk are retried"""
+        attempt = 0
+        while True:
+            yielded = False
+            try:
+                async for chunk in self._stream_once(prompt):
+                    yielded = True
+                    yield chunk
+                LLM_CALLS.inc(model=self.model_name, outcome="ok")
+                return
+            except Exception as e:
+                if yielded or attempt >= self.max_retries or not _is_retryable(e):
+                    LLM_CALLS.inc(model=self.model_name, outcome="error")
+                    raise
+                LLM_CALLS.inc(model=self.model_name, outcome="retry")
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+
+_clients: Dict[str, LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(model_name: str) -> LLMClient:
+    """Shared client per model (all clients share the global limits)"""
+    with _clients_lock:
+        client = _clients.get(model_name)
+        if client is None:
+            client = _clients[model_name] = LLMClient(model_name)
+        return client
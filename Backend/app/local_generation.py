@@ -0,0 +1,128 @@
+# SkillEdge-API/app/local_generation.py
+"""
+Local causal-LM generation with reusable prompt-prefix KV caches.
+
+Prompts rendered from app.prompts templates start with a static prefix. The
+engine runs that prefix through the model once, keeps the resulting
+past-key-values (a small LRU of prefixes), and for each request only feeds
+the dynamic tokens: generate() receives a copy of the prefix cache together
+with the full input ids, so prefill covers just the uncached suffix.
+
+The prefix and dynamic part are tokenized separately and concatenated, so the
+cached prefix tokens are exactly the ones the request continues from.
+
+Optionally, a small draft model sharing the tokenizer (LOCAL_DRAFT_MODEL_PATH,
+e.g. gemma-3-270m for the Gemma 3 1B base) enables speculative decoding
+through transformers' assisted generation: the draft proposes
+LOCAL_DRAFT_TOKENS tokens at a time and the main model verifies them in one
+forward pass. Verification keeps the main model's output distribution, so
+quality is unchanged while CPU latency drops when most drafts are accepted.
+"""
+
+import copy
+import os
+import threading
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from cachetools import LRUCache
+
+from app.prompts import PREFIX_CACHE, RenderedPrompt
+
+if TYPE_CHECKING:
+    import torch
+    from transformers import DynamicCache
+
+LOCAL_PREFIX_CACHE_SIZE = int(os.getenv("LOCAL_PREFIX_CACHE_SIZE", "8"))
+LOCAL_DRAFT_MODEL_PATH = os.getenv("LOCAL_DRAFT_MODEL_PATH")
+LOCAL_DRAFT_TOKENS = int(os.getenv("LOCAL_DRAFT_TOKENS", "5"))
+
+
+class LocalGenerationEngine:
+    """model.generate with a KV cache per static prompt prefix"""
+
+    def __init__(self, model, tokenizer, max_prefixes: int = LOCAL_PREFIX_CACHE_SIZE):
+        self.model = model
+        self.tokenizer = tokenizer
+        # prefix key -> (prefix input ids, prefilled cache)
+        self._prefix_cache: LRUCache = LRUCache(maxsize=max_prefixes)
+        self._lock = threading.Lock()
+        self.draft_model = None
+
+    def load_draft_model(self, path: str, num_assistant_tokens: int = LOCAL_DRAFT_TOKENS):
+        """Load the draft model used for speculative decoding"""
+        from transformers import AutoModelForCausalLM
+
+        draft_model = AutoModelForCausalLM.from_pretrained(path, dtype=self.model.dtype).to(self.device).eval()
+        draft_model.generation_config.num_assistant_tokens = num_assistant_tokens
+        self.draft_model = draft_model
+        print(f"✅ Loaded draft model for speculative decoding: {path}")
+
+    @property
+    def device(self):
+        return next(self.model.parameters()).device
+
+    def _prefill(self, prefix: str) -> Tuple["torch.Tensor", "DynamicCache"]:
+        import torch
+        from transformers import DynamicCache
+
+        prefix_ids = self.tokenizer(prefix, return_tensors="pt").input_ids.to(self.device)
+        cache = DynamicCache(config=self.model.config)
+        with torch.no_grad():
+            self.model(input_ids=prefix_ids, past_key_values=cache, use_cache=True)
+        return prefix_ids, cache
+
+    def prefix_state(self, prefix: str, key: str) -> Tuple["torch.Tensor", "DynamicCache"]:
+        """Prefix ids and prefilled cache (computed once per prefix; never mutated)"""
+        with self._lock:
+            state = self._prefix_cache.get(key)
+            if state is not None:
+                PREFIX_CACHE.inc(backend="local", result="hit")
+                return state
+            PREFIX_CACHE.inc(backend="local", result="miss")
+            state = self._prefill(prefix)
+            self._prefix_cache[key] = state
+            return state
+
+    def warm(self, prompt: RenderedPrompt):
+        """Prefill a template's prefix ahead of the first request"""
+        self.prefix_state(prompt.prefix, prompt.prefix_key)
+
+    def _encode(self, prompt: Union[str, RenderedPrompt]) -> Tuple["torch.Tensor", Optional["DynamicCache"]]:
+        """Input ids for a prompt, plus the prefix cache they continue from (RenderedPrompt only)"""
+        import torch
+
+        if isinstance(prompt, RenderedPrompt):
+            prefix_ids, prefix_cache = self.prefix_state(prompt.prefix, prompt.prefix_key)
+            dynamic_ids = self.tokenizer(prompt.dynamic, return_tensors="pt", add_special_tokens=False).input_ids.to(self.device)
+            return torch.cat([prefix_ids, dynamic_ids], dim=-1), prefix_cache
+        return self.tokenizer(prompt, return_tensors="pt").input_ids.to(self.device), None
+
+    def prompt_length(self, prompt: Union[str, RenderedPrompt]) -> int:
+        """Number of input tokens generate() will use for this prompt"""
+        return self._encode(prompt)[0].shape[-1]
+
+    def generate(self, prompt: Union[str, RenderedPrompt], speculative: bool = True, **generate_kwargs) -> str:
+        """
+        Generate a continuation of the prompt and return only the new text (blocking).
+
+        Uses speculative decoding when a draft model is loaded, unless speculative=False.
+        """
+        import torch
+
+        if speculative and self.draft_model is not None:
+            # The draft prefills its own cache; the main model still starts from the prefix cache
+            generate_kwargs["assistant_model"] = self.draft_model
+
+        input_ids, prefix_cache = self._encode(prompt)
+        if prefix_cache is not None:
+            # generate() appends to the cache in place, so each request gets its own copy
+            generate_kwargs["past_key_values"] = copy.deepcopy(prefix_cache)
+
+        generate_kwargs.setdefault("pad_token_id", self.tokenizer.eos_token_id)
+        with torch.no_grad():
+            output = self.model.generate(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                **generate_kwargs
+            )
+        return self.tokenizer.decode(output[0, input_ids.shape[-1]:], skip_special_tokens=True)
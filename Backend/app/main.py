@@ -3,14 +3,15 @@
 from fastapi import FastAPI, HTTPException, Depends, Header
 import re
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import os
+import asyncio
 import torch
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+from transformers import AutoTokenizer, AutoModelForCausalLM, LogitsProcessorList, pipeline
 from peft import PeftModel
 from dotenv import load_dotenv
-import google.generativeai as genai
 import json
 from app.file_handler import FileHandler
 from app.resume_parser import ResumeParser
@@ -25,14 +26,19 @@ from app.database import connect_to_mongo, close_mongo_connection
 # Import routers
 from app.routers import profile, reports, chatbot, auth, analytics
 from app.routers.auth import get_current_user
+from app.chatbot.service import start_chatbot_service
+from app.metrics import render_metrics
+from app.llm_client import get_llm_client
+from app.prompts import VERBAL_EVALUATION, TECHNICAL_QUESTIONS
+from app.local_generation import LocalGenerationEngine, LOCAL_DRAFT_MODEL_PATH
+from app.constrained_decoding import QuestionFormatLogitsProcessor, multiline_token_ids
 
-# Configure Gemini
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel('gemini-2.5-flash')
-else:
-    print("Warning: GEMINI_API_KEY not found in environment")
+# Configure the LLM (Gemini, or the offline stub with LLM_PROVIDER=stub)
+try:
+    gemini_llm = get_llm_client('gemini-2.5-flash')
+except ValueError as e:
+    gemini_llm = None
+    print(f"Warning: {e}")
 
 # CORS Configuration
 enabled_origins = [
@@ -67,11 +73,30 @@ async def ping():
     """Ultra-lightweight ping endpoint"""
     return {"ping": "pong"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the in-process metrics"""
+    return render_metrics()
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_db_client():
     await connect_to_mongo()
 
+@app.on_event("startup")
+async def start_chatbot():
+    # Load the embedding model and knowledge base in the background; chat requests wait for it
+    start_chatbot_service()
+
+@app.on_event("startup")
+async def warm_question_generation():
+    # Prefill the shared technical preamble so the first request only processes its role-specific tokens
+    if LOCAL_QUESTION_GENERATION:
+        await asyncio.to_thread(generation_engine.warm, TECHNICAL_QUESTIONS.render(role="", count=0))
+        if LOCAL_CONSTRAINED_QUESTIONS:
+            # Decodes the whole vocabulary once; keeps it off the first request
+            await asyncio.to_thread(multiline_token_ids, tokenizer)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     await close_mongo_connection()
@@ -117,6 +142,16 @@ text_generator = pipeline(
     tokenizer=tokenizer,
 )
 
+# Generation with per-template prefix KV caches (static instructions are prefilled once)
+generation_engine = LocalGenerationEngine(model, tokenizer)
+if LOCAL_DRAFT_MODEL_PATH:
+    generation_engine.load_draft_model(LOCAL_DRAFT_MODEL_PATH)
+
+# Technical questions come from the local model when enabled (otherwise a fixed placeholder question)
+LOCAL_QUESTION_GENERATION = os.getenv("LOCAL_QUESTION_GENERATION", "0") == "1"
+# Force the "QuestionN:" format while decoding instead of parsing free-form output
+LOCAL_CONSTRAINED_QUESTIONS = os.getenv("LOCAL_CONSTRAINED_QUESTIONS", "1") == "1"
+
 # Request schemas
 class QuestionRequest(BaseModel):
     type: str
@@ -294,8 +329,49 @@ async def parse_resume(
 #             raise HTTPException(status_code=500, detail=f"Model inference failed: {str(e)}")
 
 
+def generate_technical_questions(role: str, count: int) -> str:
+    """Raw local model output for a technical interview (blocking; run in a worker thread)"""
+    prompt = TECHNICAL_QUESTIONS.render(role=role, count=count)
+    generation_kwargs = {"max_new_tokens": 100}
+    if LOCAL_CONSTRAINED_QUESTIONS:
+        # Exactly `count` questions, no preamble
+        question_format = QuestionFormatLogitsProcessor(
+            tokenizer, count, tokenizer.eos_token_id, generation_engine.prompt_length(prompt)
+        )
+        generation_kwargs = {
+            "max_new_tokens": question_format.max_new_tokens(),
+            "logits_processor": LogitsProcessorList([question_format]),
+        }
+
+    # Only the role-specific part of the prompt is prefilled per request
+    return generation_engine.generate(
+        prompt,
+        do_sample=True,
+        temperature=0.7,
+        eos_token_id=tokenizer.eos_token_id,
+        **generation_kwargs
+    )
+
+
 @app.post("/api/interview/generate-question")
 async def generate_question(request: QuestionRequest):
+        if LOCAL_QUESTION_GENERATION and request.type == "technical":
+            print(f"Using local model for {request.type} interview")
+            print(f"Questions demanded by user are {request.count}")
+            if request.count < 1:
+                raise HTTPException(status_code=400, detail="count must be at least 1")
+            
+            try:
+                generated = await asyncio.to_thread(generate_technical_questions, request.role, request.count)
+                
+                # Use a regex to pull out each "QuestionN: ..." line
+                question_text = re.findall(r"(?m)(?:Question\d+:|\d+\.)\s*(.+)", generated)
+                question_text = question_text[:request.count]  # Limit to requested count
+                return {"question": question_text}
+            
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Model inference failed: {str(e)}")
+        
         question_text = ["What technical challenges did you encounter in your previous projects, and how did you overcome them?"]     
         print(question_text)
         return {"question": question_text}
@@ -305,86 +381,22 @@ async def generate_question(request: QuestionRequest):
 async def analyze_verbal_report(request: VerbalReportRequest):
     """Analyze interview answers using Gemini for verbal report generation"""
     
-    if not GEMINI_API_KEY:
+    if gemini_llm is None:
         raise HTTPException(status_code=500, detail="Gemini API key not configured")
     
     if len(request.questions) != len(request.answers):
         raise HTTPException(status_code=400, detail="Questions and answers count mismatch")
     
     try:
-        # Prepare the prompt for Gemini
-        prompt = f"""
-        You are an expert interview evaluator. Analyze the following {request.interview_type} interview for the role of {request.role}.
-        
-        Please evaluate each question-answer pair and provide a comprehensive analysis in JSON format.
-        
-        Interview Data:
-        {json.dumps([{"question": q, "answer": a} for q, a in zip(request.questions, request.answers)], indent=2)}
-        
-        Provide analysis in the following JSON structure:
-        {{
-            "overall_score": <number between 0-100>,
-            "summary": "<brief overall assessment>",
-            "metrics": {{
-                "answer_correctness": {{
-                    "score": <0-100>,
-                    "description": "<assessment of technical accuracy>",
-                    "details": ["<specific feedback per answer>"]
-                }},
-                "concepts_understanding": {{
-                    "score": <0-100>,
-                    "description": "<assessment of concept grasp>",
-                    "key_concepts": ["<list of demonstrated concepts>"],
-                    "missing_concepts": ["<concepts that could be improved>"]
-                }},
-                "domain_knowledge": {{
-                    "score": <0-100>,
-                    "description": "<assessment of domain expertise>",
-                    "strengths": ["<strong areas>"],
-                    "gaps": ["<knowledge gaps>"]
-                }},
-                "response_structure": {{
-                    "score": <0-100>,
-                    "description": "<assessment of answer organization>",
-                    "logical_flow": "<evaluation of flow>",
-                    "completeness": "<evaluation of completeness>"
-                }},
-                "depth_of_explanation": {{
-                    "score": <0-100>,
-                    "description": "<assessment of explanation depth>",
-                    "examples_used": <boolean>,
-                    "technical_depth": "<shallow/moderate/deep>"
-                }},
-                "vocabulary_richness": {{
-                    "score": <0-100>,
-                    "description": "<assessment of vocabulary>",
-                    "technical_terms_used": ["<list of technical terms>"],
-                    "repetitive_words": ["<overused words>"],
-                    "vocabulary_level": "<basic/intermediate/advanced>"
-                }}
-            }},
-            "individual_answers": [
-                {{
-                    "question_number": <number>,
-                    "correctness": <0-100>,
-                    "strengths": ["<what was good>"],
-                    "improvements": ["<what could be better>"],
-                    "key_points_covered": ["<main points addressed>"],
-                    "missing_points": ["<important points missed>"]
-                }}
-            ],
-            "recommendations": [
-                "<specific improvement suggestions>"
-            ],
-            "interview_readiness": "<not ready/needs improvement/ready/excellent>"
-        }}
-        
-        Be thorough, fair, and constructive in your evaluation. Focus on both strengths and areas for improvement.
-        Return ONLY valid JSON, no additional text.
-        """
+        # Static instructions + schema first, so the prefix can be cached
+        prompt = VERBAL_EVALUATION.render(
+            interview_type=request.interview_type,
+            role=request.role,
+            interview_data=json.dumps([{"question": q, "answer": a} for q, a in zip(request.questions, request.answers)], indent=2)
+        )
         
         # Generate response from Gemini
-        response = gemini_model.generate_content(prompt)
+        response = await gemini_llm.generate(prompt)
         
         # Parse the JSON response
         try:
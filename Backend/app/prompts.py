@@ -0,0 +1,190 @@
+# SkillEdge-API/app/prompts.py
+"""
+Prompt templates with a static prefix.
+
+Each template splits its prompt into a static prefix (role, instructions,
+output schema), identical on every call, and a dynamic body filled in per
+request. The prefix always comes first, so it can be reused:
+
+- Gemini: the LLM client stores the prefix as provider-side cached content
+  and only the dynamic part is sent per call, once the prefix reaches the
+  model's caching minimum (see app/llm_client.py; none of the prefixes below
+  does yet)
+- local models: app/local_generation.py keeps the prefix's KV cache and
+  only runs the dynamic tokens through the model
+
+Only the body is formatted, so the prefix may contain literal braces (e.g. a
+JSON schema).
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+from app.metrics import Counter
+
+# Shared by both prefix caches (Gemini context cache and local KV cache)
+PREFIX_CACHE = Counter(
+    "skilledge_llm_prefix_cache_total",
+    "Static prompt prefix cache lookups by backend and result (hit, miss, skip, error)",
+    labelnames=("backend", "result"),
+)
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A prompt split into its reusable prefix and per-request part"""
+    prefix: str
+    dynamic: str
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.dynamic
+
+    @property
+    def prefix_key(self) -> str:
+        """Stable identifier of the prefix, used as a cache key"""
+        return hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    prefix: str
+    body: str
+
+    def render(self, **fields) -> RenderedPrompt:
+        return RenderedPrompt(self.prefix, self.body.format(**fields))
+
+
+VERBAL_EVALUATION = PromptTemplate(
+    name="verbal_evaluation",
+    prefix="""You are an expert interview evaluator. Analyze the interview given at the end of this prompt (interview type, role and question-answer pairs).
+
+Please evaluate each question-answer pair and provide a comprehensive analysis in JSON format.
+
+Provide analysis in the following JSON structure:
+{
+    "overall_score": <number between 0-100>,
+    "summary": "<brief overall assessment>",
+    "metrics": {
+        "answer_correctness": {
+            "score": <0-100>,
+            "description": "<assessment of technical accuracy>",
+            "details": ["<specific feedback per answer>"]
+        },
+        "concepts_understanding": {
+            "score": <0-100>,
+            "description": "<assessment of concept grasp>",
+            "key_concepts": ["<list of demonstrated concepts>"],
+            "missing_concepts": ["<concepts that could be improved>"]
+        },
+        "domain_knowledge": {
+            "score": <0-100>,
+            "description": "<assessment of domain expertise>",
+            "strengths": ["<strong areas>"],
+            "gaps": ["<knowledge gaps>"]
+        },
+        "response_structure": {
+            "score": <0-100>,
+            "description": "<assessment of answer organization>",
+            "logical_flow": "<evaluation of flow>",
+            "completeness": "<evaluation of completeness>"
+        },
+        "depth_of_explanation": {
+            "score": <0-100>,
+            "description": "<assessment of explanation depth>",
+            "examples_used": <boolean>,
+            "technical_depth": "<shallow/moderate/deep>"
+        },
+        "vocabulary_richness": {
+            "score": <0-100>,
+            "description": "<assessment of vocabulary>",
+            "technical_terms_used": ["<list of technical terms>"],
+            "repetitive_words": ["<overused words>"],
+            "vocabulary_level": "<basic/intermediate/advanced>"
+        }
+    },
+    "individual_answers": [
+        {
+            "question_number": <number>,
+            "correctness": <0-100>,
+            "strengths": ["<what was good>"],
+            "improvements": ["<what could be better>"],
+            "key_points_covered": ["<main points addressed>"],
+            "missing_points": ["<important points missed>"]
+        }
+    ],
+    "recommendations": [
+        "<specific improvement suggestions>"
+    ],
+    "interview_readiness": "<not ready/needs improvement/ready/excellent>"
+}
+
+Be thorough, fair, and constructive in your evaluation. Focus on both strengths and areas for improvement.
+Return ONLY valid JSON, no additional text.
+
+""",
+    body="""Interview Type: {interview_type}
+Role: {role}
+
+Interview Data:
+{interview_data}
+""",
+)
+
+CHATBOT_ANSWER = PromptTemplate(
+    name="chatbot_answer",
+    prefix="""You are SkillEdge-AI Assistant, an intelligent chatbot for the SkillEdge-AI interview preparation platform.
+You have two main functions:
+
+1. Answer general questions about SkillEdge-AI platform (features, benefits, how to use, etc.)
+2. Provide personalized analysis and advice based on user's interview reports
+
+Guidelines:
+- Be helpful, professional, and encouraging
+- Use the provided context to give accurate information
+- When analyzing reports, be specific and actionable in your advice
+- If you don't have enough information, ask clarifying questions
+- Keep responses concise but comprehensive
+- Focus on helping users improve their interview performance
+
+""",
+    body="""{history}
+
+{context}
+
+User Question: {query}
+
+Please provide a helpful and relevant response:
+
+Note: as you are a chatbot assistane, please give short concise and to the point answers
+""",
+)
+
+# Prompt format the local question generation adapter was fine-tuned on. Every
+# technical prompt is identical up to the role, so the prefix ends at "Role:"
+# (the role's leading space belongs to its first token, so it stays in the body).
+TECHNICAL_QUESTIONS = PromptTemplate(
+    name="technical_questions",
+    prefix="""You are a helpful assistant specialized in generating interview questions.
+
+Given the following inputs:
+Interview Type: technical
+Role:""",
+    body=""" {role}
+
+Please generate exactly {count} unique interview questions tailored to the above.
+– Output only the questions (no answers, no extra commentary).
+– Number them sequentially, in this exact template:
+
+Question1: <your first question here>
+Question2: <your second question here>
+Question3: <…>
+Question4: <…>
+Question5: <…>
+Question6: <…>
+Question7: <your seventh question here>
+note: These are just a syntax for you to follow, suppose if user ask for 5 questions, then generate 5 questions according to the template, always starting from Question1
+note: follow the format above of printing Question1 and then the question. it is necessary to follow the format
+""",
+)
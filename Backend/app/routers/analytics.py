@@ -3,14 +3,16 @@
 API endpoints for progress tracking and analytics
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from bson.objectid import ObjectId
+from pymongo import ReturnDocument
 import statistics
 
 from app.database import (
     get_database,
+    get_user_goals_collection,
     get_interview_reports_collection,
     get_verbal_reports_collection,
     get_nonverbal_reports_collection,
@@ -19,8 +21,12 @@ from app.database import (
 from app.models import (
     SkillProgress,
     ProgressSnapshot,
+    CreateGoalRequest,
+    UpdateGoalRequest,
 )
 from app.routers.auth import get_current_user
+from app.analytics_rollup import get_cohort_rollup, percentile_from_histogram
+from app.skill_scores import extract_verbal_skill_scores, extract_nonverbal_skill_scores
 
 router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
 
@@ -160,130 +166,13 @@ async def get_analytics_dashboard(user_id: str = Depends(get_current_user)):
             verbal = verbal_lookup.get(interview_id, {})
             nonverbal = nonverbal_lookup.get(interview_id, {})
             
-            # Extract skill metrics from verbal reports
-            if verbal and "metrics" in verbal:
-                metrics = verbal.get("metrics", {})
-                
-                # Communication: Average of response_structure and vocabulary_richness
-                if "response_structure" in metrics and "vocabulary_richness" in metrics:
-                    response_struct = metrics["response_structure"]
-                    vocab_rich = metrics["vocabulary_richness"]
-                    
-                    # Extract score from dict
-                    response_score = response_struct.get("score", 0) if isinstance(response_struct, dict) else response_struct
-                    vocab_score = vocab_rich.get("score", 0) if isinstance(vocab_rich, dict) else vocab_rich
-                    
-                    if response_score > 0 or vocab_score > 0:
-                        communication_score = (response_score + vocab_score) / 2
-                        skill_scores["communication"].append(communication_score)
-                        print(f"✅ Communication: {communication_score} (response={response_score}, vocab={vocab_score})")
-                
-                # Technical Knowledge: Average of domain_knowledge and concepts_understanding
-                if "domain_knowledge" in metrics and "concepts_understanding" in metrics:
-                    domain = metrics["domain_knowledge"]
-                    concepts = metrics["concepts_understanding"]
-                    
-                    # Extract score from dict
-                    domain_score = domain.get("score", 0) if isinstance(domain, dict) else domain
-                    concepts_score = concepts.get("score", 0) if isinstance(concepts, dict) else concepts
-                    
-                    if domain_score > 0 or concepts_score > 0:
-                        tech_score = (domain_score + concepts_score) / 2
-                        skill_scores["technical_knowledge"].append(tech_score)
-                        print(f"✅ Technical Knowledge: {tech_score} (domain={domain_score}, concepts={concepts_score})")
-                
-                # Clarity: Average of answer_correctness and depth_of_explanation
-                if "answer_correctness" in metrics and "depth_of_explanation" in metrics:
-                    correctness = metrics["answer_correctness"]
-                    depth = metrics["depth_of_explanation"]
-                    
-                    # Extract score from dict
-                    correctness_score = correctness.get("score", 0) if isinstance(correctness, dict) else correctness
-                    depth_score = depth.get("score", 0) if isinstance(depth, dict) else depth
-                    
-                    if correctness_score > 0 or depth_score > 0:
-                        clarity_score = (correctness_score + depth_score) / 2
-                        skill_scores["clarity"].append(clarity_score)
-                        print(f"✅ Clarity: {clarity_score} (correctness={correctness_score}, depth={depth_score})")
-            
-            # Extract skill metrics from non-verbal reports
-            if nonverbal and "analytics" in nonverbal:
-                analytics = nonverbal.get("analytics", {})
-                
-                # Confidence: Extract from confidenceScores
-                if "confidenceScores" in analytics:
-                    confidence_data = analytics["confidenceScores"]
-                    if isinstance(confidence_data, dict):
-                        # Try overallConfidence first (from your actual data)
-                        if "overallConfidence" in confidence_data:
-                            conf_score = confidence_data["overallConfidence"]
-                            if isinstance(conf_score, (int, float)):
-                                skill_scores["confidence"].append(conf_score)
-                                print(f"✅ Confidence: {conf_score}")
-                        # Fallback to other confidence metrics
-                        elif "voiceModulationScore" in confidence_data:
-                            voice_score = confidence_data.get("voiceModulationScore", 0)
-                            if isinstance(voice_score, (int, float)):
-                                skill_scores["confidence"].append(voice_score)
-                                print(f"✅ Confidence: {voice_score} (from voiceModulation)")
-                
-                # Filler words: Extract from fillerWordsBreakdown
-                if "fillerWordsBreakdown" in analytics:
-                    filler_data = analytics["fillerWordsBreakdown"]
-                    if isinstance(filler_data, dict):
-                        # Get percentage directly (it's a string in your data: '0.0')
-                        if "percentage" in filler_data:
-                            filler_pct_str = filler_data.get("percentage", "0")
-                            try:
-                                filler_pct = float(filler_pct_str)
-                                # Convert to score (lower filler = higher score)
-                                # If 0% fillers = 100 score, if 10% fillers = 0 score
-                                filler_score = max(0, 100 - (filler_pct * 10))
-                                skill_scores["filler_words"].append(filler_score)
-                                print(f"✅ Filler Words: {filler_score} (from {filler_pct}% fillers)")
-                            except (ValueError, TypeError):
-                                pass
-                        # Fallback: calculate from totalCount
-                        elif "totalCount" in filler_data:
-                            total_fillers = filler_data.get("totalCount", 0)
-                            # Assume good score if no fillers detected
-                            if total_fillers == 0:
-                                skill_scores["filler_words"].append(100)
-                                print(f"✅ Filler Words: 100 (no fillers detected)")
-                        # Or use percentage directly if available
-                        elif "fillerPercentage" in filler_data:
-                            filler_pct = filler_data.get("fillerPercentage", 0)
-                            filler_score = max(0, 100 - (filler_pct * 2))
-                            skill_scores["filler_words"].append(filler_score)
-                
-                # Speaking speed: Extract from speakingStats
-                if "speakingStats" in analytics:
-                    speaking_data = analytics["speakingStats"]
-                    if isinstance(speaking_data, dict):
-                        # Calculate WPM from totalWordsSpoken and totalSpeakingTime
-                        if "totalWordsSpoken" in speaking_data and "totalSpeakingTime" in speaking_data:
-                            total_words = speaking_data.get("totalWordsSpoken", 0)
-                            total_time_seconds = speaking_data.get("totalSpeakingTime", 1)
-                            
-                            if total_time_seconds > 0:
-                                # Calculate words per minute
-                                wpm = (total_words / total_time_seconds) * 60
-                                
-                                # Ideal WPM is 130-150, score based on proximity
-                                ideal_wpm = 140
-                                deviation = abs(wpm - ideal_wpm)
-                                speed_score = max(0, 100 - (deviation / 2))
-                                skill_scores["speaking_speed"].append(speed_score)
-                                print(f"✅ Speaking Speed: {speed_score} ({wpm:.1f} WPM)")
-                        # Fallback: if wordsPerMinute is directly available
-                        elif "wordsPerMinute" in speaking_data:
-                            wpm = speaking_data.get("wordsPerMinute", 0)
-                            if isinstance(wpm, (int, float)):
-                                ideal_wpm = 140
-                                deviation = abs(wpm - ideal_wpm)
-                                speed_score = max(0, 100 - (deviation / 2))
-                                skill_scores["speaking_speed"].append(speed_score)
-                                print(f"✅ Speaking Speed: {speed_score} ({wpm:.1f} WPM)")
+            # Same per-interview formulas as cohort rollups and goals (app/skill_scores.py)
+            interview_scores = {
+                **extract_verbal_skill_scores(verbal),
+                **extract_nonverbal_skill_scores(nonverbal),
+            }
+            for skill, score in interview_scores.items():
+                skill_scores[skill].append(score)
         
         # Calculate averages and trends for each skill
         skill_breakdown = {}
@@ -580,13 +469,207 @@ async def get_skill_trends(
 
 
 
+@router.get("/percentiles", response_model=Dict[str, Any])
+async def get_skill_percentiles(
+    interview_id: Optional[str] = None,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Compare an interview's skill scores against its role / interview type cohort.
+    
+    Uses the latest interview unless interview_id is given. Cohort distributions come from the
+    offline rollup job (python -m app.analytics_rollup), so this is one point lookup per request.
+    """
+    try:
+        interview_reports_collection = get_interview_reports_collection()
+        verbal_reports_collection = get_verbal_reports_collection()
+        nonverbal_reports_collection = get_nonverbal_reports_collection()
+        
+        query: Dict[str, Any] = {"user_id": user_id}
+        if interview_id:
+            if not ObjectId.is_valid(interview_id):
+                raise HTTPException(status_code=400, detail="Invalid interview ID format")
+            query["_id"] = ObjectId(interview_id)
+        
+        interview = await interview_reports_collection.find_one(
+            query,
+            {"_id": 1, "role": 1, "interview_type": 1},
+            sort=[("created_at", -1)]
+        )
+        if not interview:
+            return {
+                "success": True,
+                "message": "No interviews found. Complete an interview to compare with others!",
+                "data": {}
+            }
+        
+        interview_id = str(interview["_id"])
+        verbal = await verbal_reports_collection.find_one({"interview_id": interview_id, "user_id": user_id})
+        nonverbal = await nonverbal_reports_collection.find_one({"interview_id": interview_id, "user_id": user_id})
+        
+        scores = {**extract_verbal_skill_scores(verbal), **extract_nonverbal_skill_scores(nonverbal)}
+        if verbal and isinstance(verbal.get("overall_score"), (int, float)):
+            scores["overall_score"] = verbal["overall_score"]
+        
+        rollup = await get_cohort_rollup(interview.get("role"), interview.get("interview_type"))
+        if not rollup:
+            return {
+                "success": True,
+                "message": "Cohort statistics are not available yet",
+                "data": {}
+            }
+        
+        percentiles = {}
+        for skill, score in scores.items():
+            skill_rollup = rollup["skills"].get(skill)
+            if not skill_rollup:
+                continue
+            percentile = percentile_from_histogram(skill_rollup["histogram"], score)
+            if percentile is None:
+                continue
+            percentiles[skill] = {
+                "score": round(score, 2),
+                "percentile": percentile,
+                "top_percent": round(100 - percentile, 1),
+                "cohort_mean": skill_rollup["mean"],
+                "cohort_size": skill_rollup["count"],
+            }
+        
+        return {
+            "success": True,
+            "data": {
+                "interview_id": interview_id,
+                "cohort": {
+                    "role": rollup["role"],
+                    "interview_type": rollup["interview_type"],
+                    "computed_at": rollup["computed_at"].isoformat(),
+                },
+                "percentiles": percentiles,
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error fetching skill percentiles: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+PROGRESS_BUCKETS = {"day", "week", "month"}
+
+
+def _lttb_downsample(points: List[Dict[str, Any]], threshold: int, value_key: str = "overall_score") -> List[Dict[str, Any]]:
+    """
+    Largest-Triangle-Three-Buckets downsampling for chart series.
+    
+    Keeps the first and last points and, for every bucket in between, the point that forms the
+    largest triangle with the previously kept point and the average of the next bucket.
+    Points must be sorted by time and carry a "timestamp" (epoch seconds) and value_key.
+    """
+    if threshold >= len(points) or threshold < 3:
+        return points
+    
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    a = 0  # index of the last kept point
+    
+    for i in range(threshold - 2):
+        bucket_start = int(i * bucket_size) + 1
+        bucket_end = int((i + 1) * bucket_size) + 1
+        
+        # Average of the next bucket (or the last point for the final bucket)
+        next_start = bucket_end
+        next_end = min(int((i + 2) * bucket_size) + 1, len(points))
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p["timestamp"] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p.get(value_key) or 0 for p in next_bucket) / len(next_bucket)
+        
+        ax = points[a]["timestamp"]
+        ay = points[a].get(value_key) or 0
+        
+        max_area = -1.0
+        max_index = bucket_start
+        for j in range(bucket_start, bucket_end):
+            px = points[j]["timestamp"]
+            py = points[j].get(value_key) or 0
+            area = abs((ax - avg_x) * (py - ay) - (ax - px) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                max_index = j
+        
+        sampled.append(points[max_index])
+        a = max_index
+    
+    sampled.append(points[-1])
+    return sampled
+
+
+async def _get_bucketed_progress_history(
+    user_id: str,
+    start_date: datetime,
+    end_date: datetime,
+    bucket: str
+) -> List[Dict[str, Any]]:
+    """Aggregate overall report scores into day/week/month buckets with $dateTrunc"""
+    overall_reports_collection = get_overall_reports_collection()
+    
+    pipeline = [
+        {"$match": {
+            "user_id": user_id,
+            "created_at": {"$gte": start_date, "$lte": end_date}
+        }},
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$created_at", "unit": bucket}},
+            "count": {"$sum": 1},
+            "overall_min": {"$min": "$overall_score"},
+            "overall_mean": {"$avg": "$overall_score"},
+            "overall_max": {"$max": "$overall_score"},
+            "verbal_min": {"$min": "$verbal_score"},
+            "verbal_mean": {"$avg": "$verbal_score"},
+            "verbal_max": {"$max": "$verbal_score"},
+            "nonverbal_min": {"$min": "$nonverbal_score"},
+            "nonverbal_mean": {"$avg": "$nonverbal_score"},
+            "nonverbal_max": {"$max": "$nonverbal_score"},
+        }},
+        {"$sort": {"_id": 1}},
+    ]
+    
+    buckets = await overall_reports_collection.aggregate(pipeline).to_list(length=None)
+    
+    history = []
+    for b in buckets:
+        entry = {
+            "date": b["_id"].isoformat(),
+            "count": b["count"],
+        }
+        for score in ("overall", "verbal", "nonverbal"):
+            entry[f"{score}_score"] = {
+                "min": b.get(f"{score}_min"),
+                "mean": round(b[f"{score}_mean"], 2) if b.get(f"{score}_mean") is not None else None,
+                "max": b.get(f"{score}_max"),
+            }
+        history.append(entry)
+    
+    return history
+
+
 @router.get("/progress-history", response_model=Dict[str, Any])
 async def get_progress_history(
     days: int = 30,
+    bucket: Optional[str] = None,
+    max_points: Optional[int] = Query(default=None, ge=3),
     user_id: str = Depends(get_current_user)
 ):
-    """Get progress history over time"""
+    """
+    Get progress history over time.
+    
+    - bucket: optional "day", "week" or "month" to return min/mean/max scores per time bucket
+    - max_points: optional chart point budget; raw points are downsampled with LTTB to fit it
+    """
     try:
+        if bucket is not None and bucket not in PROGRESS_BUCKETS:
+            raise HTTPException(status_code=400, detail=f"Invalid bucket. Use one of: {', '.join(sorted(PROGRESS_BUCKETS))}")
+        
         interview_reports_collection = get_interview_reports_collection()
         overall_reports_collection = get_overall_reports_collection()
         
@@ -594,6 +677,17 @@ async def get_progress_history(
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
+        # Bucketed mode: aggregate in Mongo, payload size bounded by the number of buckets
+        if bucket:
+            bucketed_history = await _get_bucketed_progress_history(user_id, start_date, end_date, bucket)
+            return {
+                "success": True,
+                "data": bucketed_history,
+                "period": f"{days} days",
+                "bucket": bucket,
+                "count": len(bucketed_history)
+            }
+        
         # Get interviews in date range
         interviews_cursor = interview_reports_collection.find({
             "user_id": user_id,
@@ -625,8 +719,10 @@ async def get_progress_history(
             overall = overall_lookup.get(interview_id, {})
             
             if overall:
+                created_at = interview.get("created_at", datetime.utcnow())
                 progress_history.append({
-                    "date": interview.get("created_at", datetime.utcnow()).isoformat(),
+                    "date": created_at.isoformat(),
+                    "timestamp": created_at.timestamp(),
                     "interview_id": interview_id,
                     "interview_type": interview.get("interview_type", "Unknown"),
                     "role": interview.get("role", ""),
@@ -636,196 +732,182 @@ async def get_progress_history(
                     "interview_readiness": overall.get("interview_readiness", ""),
                 })
         
+        total_points = len(progress_history)
+        if max_points:
+            progress_history = _lttb_downsample(progress_history, max_points)
+        
+        for point in progress_history:
+            point.pop("timestamp", None)
+        
         return {
             "success": True,
             "data": progress_history,
             "period": f"{days} days",
-            "count": len(progress_history)
+            "count": len(progress_history),
+            "total_points": total_points
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error fetching progress history: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# # AUTOMATIC GOAL UPDATE FUNCTION
-# async def update_user_goals_after_interview(
-#     user_id: str, 
-#     verbal_report: Dict[str, Any], 
-#     nonverbal_report: Dict[str, Any]
-# ):
-#     """
-#     Automatically update user goals based on new interview performance.
-#     This function is called after each interview is saved.
-#     """
-#     try:
-#         db = get_database()
-#         goals_collection = db.user_goals
-        
-#         # Get all active goals for this user
-#         active_goals = await goals_collection.find({
-#             "user_id": user_id,
-#             "status": "in_progress"
-#         }).to_list(None)
-        
-#         if not active_goals:
-#             print(f"📊 No active goals found for user {user_id[:8]}...")
-#             return
-        
-#         print(f"📊 Found {len(active_goals)} active goal(s) to update for user {user_id[:8]}...")
-        
-#         for goal in active_goals:
-#             current_value = None
-            
-#             # Extract current value based on goal type
-#             goal_type = goal.get("goal_type", "")
-#             metric_name = goal.get("metric_name", "")
-            
-#             print(f"🎯 Processing goal: {metric_name} (type: {goal_type})")
-            
-#             if goal_type == "score_improvement":
-#                 # Use overall score from verbal report
-#                 current_value = verbal_report.get("overall_score", 0)
-#                 print(f"   📈 Score improvement: current_value = {current_value}")
-            
-#             elif goal_type == "communication":
-#                 # Extract communication score from verbal report metrics
-#                 if verbal_report and "metrics" in verbal_report:
-#                     metrics = verbal_report["metrics"]
-#                     # Communication: Average of response_structure and vocabulary_richness
-#                     response_struct = metrics.get("response_structure", {})
-#                     vocab_rich = metrics.get("vocabulary_richness", {})
-                    
-#                     response_score = response_struct.get("score", 0) if isinstance(response_struct, dict) else response_struct
-#                     vocab_score = vocab_rich.get("score", 0) if isinstance(vocab_rich, dict) else vocab_rich
-                    
-#                     if response_score > 0 or vocab_score > 0:
-#                         current_value = (response_score + vocab_score) / 2
-#                         print(f"   💬 Communication: current_value = {current_value:.1f} (response={response_score}, vocab={vocab_score})")
-#                     else:
-#                         print(f"   ⚠️ No communication scores found in metrics")
-#                 else:
-#                     print(f"   ⚠️ No metrics found in verbal report")
-            
-#             elif goal_type == "technical":
-#                 # Extract technical knowledge score from verbal report metrics
-#                 if verbal_report and "metrics" in verbal_report:
-#                     metrics = verbal_report["metrics"]
-#                     # Technical: Average of domain_knowledge and concepts_understanding
-#                     domain = metrics.get("domain_knowledge", {})
-#                     concepts = metrics.get("concepts_understanding", {})
-                    
-#                     domain_score = domain.get("score", 0) if isinstance(domain, dict) else domain
-#                     concepts_score = concepts.get("score", 0) if isinstance(concepts, dict) else concepts
-                    
-#                     if domain_score > 0 or concepts_score > 0:
-#                         current_value = (domain_score + concepts_score) / 2
-#                         print(f"   🧠 Technical Knowledge: current_value = {current_value:.1f} (domain={domain_score}, concepts={concepts_score})")
-#                     else:
-#                         print(f"   ⚠️ No technical scores found in metrics")
-#                 else:
-#                     print(f"   ⚠️ No metrics found in verbal report")
-                
-#             elif goal_type == "filler_words":
-#                 # Extract filler word percentage from non-verbal report
-#                 if nonverbal_report and "analytics" in nonverbal_report:
-#                     filler_data = nonverbal_report["analytics"].get("fillerWordsBreakdown", {})
-#                     filler_pct_str = filler_data.get("percentage", "0")
-#                     try:
-#                         current_value = float(filler_pct_str)
-#                         print(f"   🗣️ Filler words: current_value = {current_value}%")
-#                     except (ValueError, TypeError):
-#                         print(f"   ⚠️ Could not parse filler percentage: {filler_pct_str}")
-                    
-#             elif goal_type == "speaking_speed":
-#                 # Calculate words per minute from non-verbal report
-#                 if nonverbal_report and "analytics" in nonverbal_report:
-#                     stats = nonverbal_report["analytics"].get("speakingStats", {})
-#                     total_time = stats.get("totalSpeakingTime", 0)
-#                     total_words = stats.get("totalWordsSpoken", 0)
-#                     if total_time > 0:
-#                         wpm = (total_words / total_time) * 60
-#                         current_value = wpm
-#                         print(f"   ⚡ Speaking speed: current_value = {current_value:.1f} WPM")
-#                     else:
-#                         print(f"   ⚠️ Speaking time is 0, cannot calculate WPM")
-            
-#             elif goal_type == "confidence":
-#                 # Extract confidence score from non-verbal report
-#                 if nonverbal_report and "analytics" in nonverbal_report:
-#                     confidence_data = nonverbal_report["analytics"].get("confidenceScores", {})
-#                     current_value = confidence_data.get("overallConfidence", 0)
-#                     print(f"   💪 Confidence: current_value = {current_value}")
-            
-#             if current_value is not None:
-#                 # Get current goal state from database (to check existing start_value)
-#                 start_value = goal.get("start_value")
-                
-#                 # Only set start_value if it's not already set
-#                 if start_value is None or start_value == 0:
-#                     start_value = current_value
-#                     print(f"   🆕 Setting start_value = {start_value} (first time)")
-#                 else:
-#                     print(f"   ℹ️  Keeping existing start_value = {start_value}")
-                
-#                 print(f"   📊 Values: start={start_value}, current={current_value}, target={goal['target_value']}")
-                
-#                 # Get target value
-#                 target_value = goal["target_value"]
-                
-#                 # Calculate progress percentage
-#                 # For filler words, lower is better (reverse calculation)
-#                 if goal_type == "filler_words":
-#                     if start_value > target_value:
-#                         progress = ((start_value - current_value) / (start_value - target_value)) * 100
-#                     else:
-#                         progress = 0
-#                 else:
-#                     # For other metrics, higher is better
-#                     if target_value > start_value:
-#                         progress = ((current_value - start_value) / (target_value - start_value)) * 100
-#                     else:
-#                         progress = 100 if current_value >= target_value else 0
-                
-#                 # Clamp progress between 0 and 100
-#                 progress = max(0, min(100, progress))
-                
-#                 # Check if goal is completed
-#                 status = goal["status"]
-#                 completed_at = goal.get("completed_at")
-                
-#                 if progress >= 100 and status != "completed":
-#                     status = "completed"
-#                     completed_at = datetime.utcnow()
-#                     print(f"   🎉 Goal COMPLETED!")
-                
-#                 # Update the goal in database
-#                 update_data = {
-#                     "current_value": current_value,
-#                     "start_value": start_value,
-#                     "progress_percentage": progress,
-#                     "status": status,
-#                     "updated_at": datetime.utcnow()
-#                 }
-                
-#                 if completed_at:
-#                     update_data["completed_at"] = completed_at
-                
-#                 update_result = await goals_collection.update_one(
-#                     {"_id": goal["_id"]},
-#                     {"$set": update_data}
-#                 )
-                
-#                 print(f"   ✅ Updated goal '{metric_name}': Progress = {progress:.1f}% (Start: {start_value}, Current: {current_value}, Target: {target_value})")
-                
-#                 if update_result.modified_count > 0:
-#                     print(f"   ✅ Database update successful")
-#                 else:
-#                     print(f"   ⚠️ No changes made to database")
-#             else:
-#                 print(f"   ⚠️ Could not extract value for goal type: {goal_type}")
-                
-#     except Exception as e:
-#         print(f"❌ Error updating goals: {str(e)}")
-#         import traceback
-#         traceback.print_exc()
+@router.post("/goals", response_model=Dict[str, Any])
+async def create_goal(
+    request: CreateGoalRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """Create a new goal for the user"""
+    try:
+        goals_collection = get_user_goals_collection()
+        
+        # Parse deadline if provided
+        deadline = None
+        if request.deadline:
+            try:
+                deadline = datetime.fromisoformat(request.deadline.replace('Z', '+00:00'))
+            except ValueError:
+                deadline = None
+        
+        # Create goal document; values are filled in by the goal engine as interviews are saved
+        goal_doc = {
+            "user_id": user_id,
+            "goal_type": request.goal_type,
+            "target_value": request.target_value,
+            "metric_name": request.metric_name,
+            "deadline": deadline,
+            "status": "in_progress",
+            "progress_percentage": 0.0,
+            "current_value": None,
+            "start_value": None,
+            "score_history": [],
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+            "completed_at": None,
+        }
+        
+        result = await goals_collection.insert_one(goal_doc)
+        goal_doc["_id"] = str(result.inserted_id)
+        
+        return {
+            "success": True,
+            "message": "Goal created successfully",
+            "data": goal_doc
+        }
+        
+    except Exception as e:
+        print(f"❌ Error creating goal: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/goals", response_model=Dict[str, Any])
+async def get_user_goals(user_id: str = Depends(get_current_user)):
+    """Get all goals for the user"""
+    try:
+        goals_collection = get_user_goals_collection()
+        
+        goals = await goals_collection.find(
+            {"user_id": user_id}
+        ).sort("created_at", -1).to_list(length=None)
+        
+        # Convert ObjectId to string
+        for goal in goals:
+            goal["_id"] = str(goal["_id"])
+        
+        return {
+            "success": True,
+            "data": goals,
+            "count": len(goals)
+        }
+        
+    except Exception as e:
+        print(f"❌ Error fetching goals: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/goals/{goal_id}", response_model=Dict[str, Any])
+async def update_goal(
+    goal_id: str,
+    request: UpdateGoalRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """Update a goal"""
+    try:
+        goals_collection = get_user_goals_collection()
+        
+        # Validate ObjectId
+        if not ObjectId.is_valid(goal_id):
+            raise HTTPException(status_code=400, detail="Invalid goal ID")
+        
+        # Build update document
+        update_doc = {"updated_at": datetime.utcnow()}
+        
+        if request.status is not None:
+            update_doc["status"] = request.status
+            if request.status == "completed":
+                update_doc["completed_at"] = datetime.utcnow()
+                update_doc["progress_percentage"] = 100.0
+        
+        if request.progress_percentage is not None:
+            update_doc["progress_percentage"] = request.progress_percentage
+        
+        if request.current_value is not None:
+            update_doc["current_value"] = request.current_value
+        
+        updated_goal = await goals_collection.find_one_and_update(
+            {"_id": ObjectId(goal_id), "user_id": user_id},
+            {"$set": update_doc},
+            return_document=ReturnDocument.AFTER
+        )
+        
+        if not updated_goal:
+            raise HTTPException(status_code=404, detail="Goal not found")
+        
+        updated_goal["_id"] = str(updated_goal["_id"])
+        
+        return {
+            "success": True,
+            "message": "Goal updated successfully",
+            "data": updated_goal
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error updating goal: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/goals/{goal_id}", response_model=Dict[str, Any])
+async def delete_goal(
+    goal_id: str,
+    user_id: str = Depends(get_current_user)
+):
+    """Delete a goal"""
+    try:
+        goals_collection = get_user_goals_collection()
+        
+        # Validate ObjectId
+        if not ObjectId.is_valid(goal_id):
+            raise HTTPException(status_code=400, detail="Invalid goal ID")
+        
+        result = await goals_collection.delete_one(
+            {"_id": ObjectId(goal_id), "user_id": user_id}
+        )
+        
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Goal not found")
+        
+        return {
+            "success": True,
+            "message": "Goal deleted successfully"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Error deleting goal: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
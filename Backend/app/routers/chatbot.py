@@ -4,54 +4,36 @@ FastAPI router for chatbot endpoints
 """
 
 import asyncio
+import time
 import uuid
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 import logging
 import json
 
-def serialize_document(doc: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursively serialize MongoDB document to make it JSON serializable"""
-    if doc is None:
-        return None
-    
-    serialized = {}
-    for key, value in doc.items():
-        if key == "_id":
-            continue  # Skip MongoDB ObjectId
-        elif isinstance(value, datetime):
-            serialized[key] = value.isoformat()
-        elif isinstance(value, dict):
-            serialized[key] = serialize_document(value)
-        elif isinstance(value, list):
-            serialized[key] = [serialize_document(item) if isinstance(item, dict) else item for item in value]
-        else:
-            serialized[key] = value
-    
-    return serialized
-
 # Import database functions
-from app.database import (
-    get_database, 
-    get_profiles_collection, 
-    get_verbal_reports_collection,
-    get_nonverbal_reports_collection,
-    get_overall_reports_collection
-)
+from app.database import get_profiles_collection
 
 # Import authentication
 from app.routers.auth import get_current_user
 
 # Import chatbot service and models
-from app.chatbot.service import get_chatbot_service, ChatbotService
+from app.chatbot.service import wait_for_chatbot_service, chatbot_readiness, ChatbotService, LLM_MODEL_NAME
+from app.chatbot.embeddings import EMBEDDING_MODEL_NAME
+from app.chatbot.conversation_store import get_conversation_store
 from app.chatbot.models import (
     ChatRequest, 
     ChatResponse, 
     ConversationHistory, 
     ChatMessage,
-    ChatbotStatus
+    ChatbotStatus,
+    IngestRequest
 )
+from app.chatbot.ingestion import parse_document
+from app.chatbot.report_context import get_user_reports
+from app.chatbot.telemetry import stage, CHAT_STAGE_SECONDS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -59,91 +41,38 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
-# In-memory conversation storage (in production, use Redis or database)
-conversations: Dict[str, ConversationHistory] = {}
-
-async def get_user_reports(user_id: str) -> Dict[str, Any]:
-    """Fetch user's latest interview reports"""
-    try:
-        logger.info(f"Fetching reports for user: {user_id}")
-        db = get_database()
-        
-        # Get latest reports for the user
-        verbal_collection = get_verbal_reports_collection()
-        nonverbal_collection = get_nonverbal_reports_collection()
-        overall_collection = get_overall_reports_collection()
-        
-        logger.info("Collections retrieved, searching for reports...")
-        
-        # Find latest verbal report
-        verbal_report = await verbal_collection.find_one(
-            {"user_id": user_id},
-            sort=[("created_at", -1)]
-        )
-        
-        # Find latest non-verbal report
-        nonverbal_report = await nonverbal_collection.find_one(
-            {"user_id": user_id},
-            sort=[("created_at", -1)]
-        )
-        
-        # Find latest overall report
-        overall_report = await overall_collection.find_one(
-            {"user_id": user_id},
-            sort=[("created_at", -1)]
-        )
-        
-        logger.info(f"Found reports - Verbal: {bool(verbal_report)}, Non-verbal: {bool(nonverbal_report)}, Overall: {bool(overall_report)}")
-        
-        reports = {}
-        if verbal_report:
-            reports["verbal_report"] = serialize_document(verbal_report)
-            
-        if nonverbal_report:
-            reports["nonverbal_report"] = serialize_document(nonverbal_report)
-            
-        if overall_report:
-            reports["overall_report"] = serialize_document(overall_report)
-        
-        logger.info(f"Returning {len(reports)} reports for user {user_id}")
-        return reports
-        
-    except Exception as e:
-        logger.error(f"Error fetching user reports: {e}")
-        logger.exception("Full traceback:")
-        return {}
-
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_bot(
     request: ChatRequest,
     user_id: str = Depends(get_current_user)
 ):
     """Main chat endpoint for interacting with the chatbot"""
+    started = time.perf_counter()
     try:
         # Get chatbot service
-        chatbot = get_chatbot_service()
+        chatbot = await wait_for_chatbot_service()
+        
+        conversation_store = get_conversation_store()
         
         # Generate or use existing conversation ID
         conversation_id = request.conversation_id or str(uuid.uuid4())
         
         # Get or create conversation history
-        if conversation_id not in conversations:
-            conversations[conversation_id] = ConversationHistory(
-                conversation_id=conversation_id,
-                user_id=user_id,
-                messages=[]
-            )
-        
-        conversation = conversations[conversation_id]
+        with stage("conversation_load"):
+            conversation = await conversation_store.get(conversation_id)
+            if conversation is None:
+                conversation = await conversation_store.create(conversation_id, user_id)
+        if conversation.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Access denied")
         
-        # Add user message to conversation
+        # User message is persisted together with the reply once it's generated
         user_message = ChatMessage(role="user", content=request.message)
-        conversation.messages.append(user_message)
         
         # Get user reports if requested
         user_reports = {}
         if request.include_reports:
-            user_reports = await get_user_reports(user_id)
+            with stage("report_fetch"):
+                user_reports = await get_user_reports(user_id)
             logger.info(f"Fetched reports for user {user_id}: {len(user_reports)} reports found")
         
         # Prepare conversation history for context
@@ -170,26 +99,120 @@ async def chat_with_bot(
             logger.info(f"Using general Q&A mode for user {user_id}")
             bot_response = await chatbot.generate_response(
                 query=request.message,
-                conversation_history=conversation_history[:-1]  # Exclude current message
+                conversation_history=conversation_history,
+                conversation_summary=conversation.summary
             )
         
-        # Add bot response to conversation
+        # Append both messages to the stored conversation (also bumps updated_at)
         bot_message = ChatMessage(role="assistant", content=bot_response)
-        conversation.messages.append(bot_message)
-        
-        # Update conversation timestamp
-        conversation.updated_at = datetime.utcnow()
+        with stage("conversation_save"):
+            await conversation_store.append_messages(conversation_id, [user_message, bot_message])
         
+        CHAT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="chat_total")
         return ChatResponse(
             message=bot_response,
             conversation_id=conversation_id,
             sources=["SkillEdge-AI Knowledge Base"] if not request.include_reports else ["SkillEdge-AI Knowledge Base", "User Reports"]
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while processing your request")
 
+def _sse_event(payload: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_with_bot_stream(
+    request: ChatRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Streaming variant of /chat (server-sent events).
+    
+    Emits a "start" event with the conversation ID, one "token" event per
+    generated chunk and a final "done" event; the conversation is persisted
+    once the full answer has been streamed.
+    """
+    started = time.perf_counter()
+    try:
+        chatbot = await wait_for_chatbot_service()
+        conversation_store = get_conversation_store()
+        
+        conversation_id = request.conversation_id or str(uuid.uuid4())
+        
+        with stage("conversation_load"):
+            conversation = await conversation_store.get(conversation_id)
+            if conversation is None:
+                conversation = await conversation_store.create(conversation_id, user_id)
+        if conversation.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        
+        user_reports = {}
+        if request.include_reports:
+            with stage("report_fetch"):
+                user_reports = await get_user_reports(user_id)
+        
+        conversation_history = [
+            {"role": msg.role, "content": msg.content} 
+            for msg in conversation.messages[-10:]
+        ]
+        
+        sources = ["SkillEdge-AI Knowledge Base"] if not request.include_reports else ["SkillEdge-AI Knowledge Base", "User Reports"]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in chat stream endpoint: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while processing your request")
+    
+    async def answer_chunks():
+        if request.include_reports:
+            if not user_reports:
+                yield "I don't see any interview reports for your account yet. Please complete an interview first to get personalized insights about your performance. In the meantime, I can help you with general questions about SkillEdge-AI!"
+                return
+            async for chunk in chatbot.stream_user_report_analysis(request.message, user_reports):
+                yield chunk
+        else:
+            async for chunk in chatbot.stream_response(
+                query=request.message,
+                conversation_history=conversation_history,
+                conversation_summary=conversation.summary
+            ):
+                yield chunk
+    
+    async def event_stream():
+        yield _sse_event({"type": "start", "conversation_id": conversation_id, "sources": sources})
+        
+        chunks = []
+        try:
+            async for chunk in answer_chunks():
+                chunks.append(chunk)
+                yield _sse_event({"type": "token", "content": chunk})
+            
+            bot_response = "".join(chunks).strip()
+            with stage("conversation_save"):
+                await conversation_store.append_messages(conversation_id, [
+                    ChatMessage(role="user", content=request.message),
+                    ChatMessage(role="assistant", content=bot_response)
+                ])
+            
+            CHAT_STAGE_SECONDS.observe(time.perf_counter() - started, stage="chat_stream_total")
+            yield _sse_event({"type": "done", "conversation_id": conversation_id, "timestamp": datetime.utcnow().isoformat()})
+            
+        except Exception as e:
+            logger.error(f"Error while streaming chat response: {e}")
+            yield _sse_event({"type": "error", "detail": "An error occurred while processing your request"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/conversations/{conversation_id}", response_model=ConversationHistory)
 async def get_conversation(
     conversation_id: str,
@@ -197,11 +220,10 @@ async def get_conversation(
 ):
     """Get conversation history by ID"""
     try:
-        if conversation_id not in conversations:
+        conversation = await get_conversation_store().get(conversation_id)
+        if conversation is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        conversation = conversations[conversation_id]
-        
         # Verify user owns this conversation
         if conversation.user_id != user_id:
             raise HTTPException(status_code=403, detail="Access denied")
@@ -216,19 +238,12 @@ async def get_conversation(
 
 @router.get("/conversations", response_model=List[ConversationHistory])
 async def get_user_conversations(
+    limit: int = Query(default=50, ge=1, le=200),
     user_id: str = Depends(get_current_user)
 ):
-    """Get all conversations for the current user"""
+    """Get the current user's conversations, most recently updated first"""
     try:
-        user_conversations = [
-            conv for conv in conversations.values() 
-            if conv.user_id == user_id
-        ]
-        
-        # Sort by last updated
-        user_conversations.sort(key=lambda x: x.updated_at, reverse=True)
-        
-        return user_conversations
+        return await get_conversation_store().list_for_user(user_id, limit)
         
     except Exception as e:
         logger.error(f"Error getting user conversations: {e}")
@@ -241,17 +256,17 @@ async def delete_conversation(
 ):
     """Delete a conversation"""
     try:
-        if conversation_id not in conversations:
+        conversation_store = get_conversation_store()
+        conversation = await conversation_store.get(conversation_id)
+        if conversation is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        conversation = conversations[conversation_id]
-        
         # Verify user owns this conversation
         if conversation.user_id != user_id:
             raise HTTPException(status_code=403, detail="Access denied")
         
         # Delete conversation
-        del conversations[conversation_id]
+        await conversation_store.delete(conversation_id, user_id)
         
         return {"message": "Conversation deleted successfully"}
         
@@ -265,13 +280,28 @@ async def delete_conversation(
 async def get_chatbot_status():
     """Get chatbot service status and information"""
     try:
-        chatbot = get_chatbot_service()
+        readiness = chatbot_readiness()
+        
+        # Report progress instead of waiting while the service is still starting up
+        if readiness["state"] != "ready":
+            return ChatbotStatus(
+                status=readiness["state"],
+                knowledge_base_size=0,
+                embedding_model=EMBEDDING_MODEL_NAME,
+                llm_model=LLM_MODEL_NAME,
+                readiness=readiness
+            )
+        
+        chatbot = await wait_for_chatbot_service()
         
         return ChatbotStatus(
             status="active",
             knowledge_base_size=len(chatbot.knowledge_base),
-            embedding_model="sentence-transformers/all-MiniLM-L6-v2",
-            llm_model="gemini-2.0-flash-exp"
+            embedding_model=chatbot.embedding_service.model_name,
+            llm_model=chatbot.llm.model_name,
+            semantic_cache=chatbot.semantic_cache.stats(),
+            intent_router=chatbot.intent_router.stats(),
+            readiness=readiness
         )
         
     except Exception as e:
@@ -288,9 +318,9 @@ async def add_knowledge_entry(
     """Add new entry to knowledge base (admin function)"""
     try:
         # In production, add admin role check here
-        chatbot = get_chatbot_service()
+        chatbot = await wait_for_chatbot_service()
         
-        chatbot.add_to_knowledge_base(
+        await chatbot.add_to_knowledge_base(
             content=content,
             category=category,
             metadata=metadata or {}
@@ -302,17 +332,72 @@ async def add_knowledge_entry(
         logger.error(f"Error adding knowledge entry: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while adding knowledge entry")
 
+@router.post("/knowledge-base/bulk")
+async def bulk_ingest_knowledge(
+    request: IngestRequest,
+    user_id: str = Depends(get_current_user)
+):
+    """Chunk, embed and add a batch of documents to the knowledge base (admin function)"""
+    try:
+        # In production, add admin role check here
+        chatbot = await wait_for_chatbot_service()
+        
+        entries = []
+        for document in request.documents:
+            metadata = dict(document.metadata)
+            if document.source:
+                metadata["source"] = document.source
+            try:
+                entries.extend(parse_document(
+                    document.content,
+                    document.format,
+                    document.category,
+                    metadata,
+                    request.chunk_words,
+                    request.overlap_words
+                ))
+            except json.JSONDecodeError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON document {document.source or ''}: {e}")
+        
+        added = await chatbot.add_many_to_knowledge_base(entries)
+        
+        return {
+            "message": "Documents ingested successfully",
+            "documents": len(request.documents),
+            "chunks": len(entries),
+            "chunks_added": added,
+            "knowledge_base_size": len(chatbot.knowledge_base)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ingesting documents: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while ingesting documents")
+
 @router.get("/search")
 async def search_knowledge_base(
     query: str,
     top_k: int = 5,
+    category: Optional[List[str]] = Query(default=None, description="Only entries in these categories"),
+    importance: Optional[List[str]] = Query(default=None, description="Only entries with one of these metadata.importance values"),
+    entry_type: Optional[List[str]] = Query(default=None, alias="type", description="Only entries with one of these metadata.type values"),
+    role: Optional[List[str]] = Query(default=None, description="Only entries with one of these metadata.role values"),
+    source: Optional[List[str]] = Query(default=None, description="Only entries with one of these metadata.source values"),
     user_id: str = Depends(get_current_user)
 ):
     """Search knowledge base for relevant information"""
     try:
-        chatbot = get_chatbot_service()
+        chatbot = await wait_for_chatbot_service()
+        
+        # Values of one key are ORed, different keys are ANDed
+        metadata_filters = {
+            key: values
+            for key, values in (("importance", importance), ("type", entry_type), ("role", role), ("source", source))
+            if values
+        }
         
-        results = chatbot.search_knowledge_base(query, top_k)
+        results = await chatbot.search_knowledge_base(query, top_k, categories=category, metadata_filters=metadata_filters)
         
         return {
             "query": query,
@@ -320,6 +405,8 @@ async def search_knowledge_base(
             "total_found": len(results)
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching knowledge base: {e}")
         raise HTTPException(status_code=500, detail="An error occurred while searching knowledge base")
\ No newline at end of file
@@ -3,9 +3,12 @@
 API endpoints for interview report management (verbal, non-verbal, and overall reports)
 """
 
-from fastapi import APIRouter, HTTPException, Header, Depends
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Header, Depends, Query, BackgroundTasks
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
+from bson.objectid import ObjectId
+import base64
+import re
 
 from app.database import (
     get_interview_reports_collection,
@@ -21,12 +24,14 @@ from app.models import (
     SaveInterviewReportRequest,
 )
 from app.routers.auth import get_current_user
+from app.events import publish, INTERVIEW_SAVED
 
 router = APIRouter(prefix="/api/reports", tags=["Reports"])
 
 @router.post("/save-interview", response_model=Dict[str, Any])
 async def save_interview_report(
     request: SaveInterviewReportRequest,
+    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user)
 ):
     """Optimized save for interview metadata, verbal report, non-verbal report, and overall report."""
@@ -188,6 +193,19 @@ async def save_interview_report(
             print(f"⏱️ Backend Phase 4c - Overall DB write: {overall_save_time:.4f}s")
             print(f"✅ Overall report saved with ID: {response_data['overall_report_id']}")
 
+        # Notify consumers (goal engine, ...) after the response has been sent
+        background_tasks.add_task(
+            publish,
+            INTERVIEW_SAVED,
+            user_id=user_id,
+            interview_id=interview_id,
+            interview_type=request.interview_type,
+            role=request.role,
+            verbal_report=request.verbal_report,
+            nonverbal_report={"analytics": request.nonverbal_report} if request.nonverbal_report else None,
+            overall_report=request.overall_report,
+        )
+
         total_backend_time = time.time() - start_time
         print(f"🏁 TOTAL BACKEND PROCESSING TIME: {total_backend_time:.4f}s")
         print(f"✅ BACKEND PERFORMANCE BREAKDOWN: Setup={((setup_time - start_time)):.4f}s, DuplicateCheck={((duplicate_check_time - setup_time)):.4f}s, InterviewDB={((db_write_time - db_write_start)):.4f}s, VerbalDB={verbal_save_time:.4f}s, NonVerbalDB={nonverbal_save_time:.4f}s, OverallDB={overall_save_time:.4f}s, Total={total_backend_time:.4f}s")
@@ -203,27 +221,109 @@ async def save_interview_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Fields a client may request from /user-interviews via ?fields=
+INTERVIEW_LIST_FIELDS = {
+    "interview_type",
+    "role",
+    "created_at",
+    "session_id",
+    "question_count",
+    "questions",
+    "answers",
+}
+
+# Lightweight default listing projection - no questions/answers arrays
+DEFAULT_INTERVIEW_LIST_FIELDS = ["interview_type", "role", "created_at", "session_id", "question_count"]
+
+
+def _encode_interview_cursor(created_at: datetime, interview_id: ObjectId) -> str:
+    """Encode the (created_at, _id) position of the last returned interview as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{interview_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_interview_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Decode a cursor produced by _encode_interview_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at_str, interview_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at_str), ObjectId(interview_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _build_interview_projection(fields: Optional[str]) -> Dict[str, Any]:
+    """Build the find() projection for the interview listing from a comma separated field list"""
+    if fields:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in INTERVIEW_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        requested = DEFAULT_INTERVIEW_LIST_FIELDS
+    
+    # _id and created_at are always needed to build the next cursor
+    projection: Dict[str, Any] = {"_id": 1, "created_at": 1}
+    for field in requested:
+        if field == "question_count":
+            projection["question_count"] = {"$size": {"$ifNull": ["$questions", []]}}
+        else:
+            projection[field] = 1
+    return projection
+
+
 @router.get("/user-interviews", response_model=Dict[str, Any])
-async def get_user_interviews(user_id: str = Depends(get_current_user)):
-    """Get all interviews for the current user"""
+async def get_user_interviews(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    search: Optional[str] = Query(default=None, max_length=100, description="Case-insensitive match on role or interview type"),
+    interview_type: Optional[str] = None,
+    user_id: str = Depends(get_current_user)
+):
+    """
+    Get a page of interviews for the current user (newest first, keyset paginated on created_at/_id).
+    
+    search / interview_type are applied in the query, so filtered results span all pages;
+    the cursor must be reused with the same filters.
+    """
     try:
         interview_reports_collection = get_interview_reports_collection()
         
-        # Fetch all interviews for the user, sorted by creation date (newest first)
+        projection = _build_interview_projection(fields)
+        
+        query: Dict[str, Any] = {"user_id": user_id}
+        conditions = []
+        if interview_type:
+            query["interview_type"] = interview_type
+        if search and search.strip():
+            pattern = {"$regex": re.escape(search.strip()), "$options": "i"}
+            conditions.append({"$or": [{"role": pattern}, {"interview_type": pattern}]})
+        if cursor:
+            last_created_at, last_id = _decode_interview_cursor(cursor)
+            # Resume strictly after the last returned interview; _id breaks created_at ties
+            conditions.append({"$or": [
+                {"created_at": {"$lt": last_created_at}},
+                {"created_at": last_created_at, "_id": {"$lt": last_id}},
+            ]})
+        if conditions:
+            query["$and"] = conditions
+        
+        # Fetch one extra document to know whether another page exists
         interviews_cursor = interview_reports_collection.find(
-            {"user_id": user_id},
-            {
-                "_id": 1,
-                "interview_type": 1,
-                "role": 1,
-                "questions": 1,
-                "answers": 1,
-                "created_at": 1,
-                "session_id": 1
-            }
-        ).sort("created_at", -1)
+            query,
+            projection
+        ).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1)
+        
+        interviews = await interviews_cursor.to_list(length=limit + 1)
+        
+        has_more = len(interviews) > limit
+        interviews = interviews[:limit]
         
-        interviews = await interviews_cursor.to_list(length=None)
+        next_cursor = None
+        if has_more:
+            last = interviews[-1]
+            next_cursor = _encode_interview_cursor(last["created_at"], last["_id"])
         
         # Convert ObjectId to string for JSON serialization
         for interview in interviews:
@@ -232,9 +332,13 @@ async def get_user_interviews(user_id: str = Depends(get_current_user)):
         return {
             "success": True,
             "reports": interviews,
-            "count": len(interviews)
+            "count": len(interviews),
+            "has_more": has_more,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error fetching user interviews: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
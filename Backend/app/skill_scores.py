@@ -0,0 +1,130 @@
+# SkillEdge-API/app/skill_scores.py
+"""
+Per-interview skill score extraction from verbal and non-verbal reports.
+
+Single source of the skill formulas: the analytics dashboard, cohort rollups
+and goal updates all score a report through these functions, so they agree.
+"""
+
+from typing import Dict, Any, Optional
+
+# Ideal speaking pace used for the speaking speed score
+IDEAL_WPM = 140
+
+VERBAL_SKILLS = ["communication", "technical_knowledge", "clarity"]
+NONVERBAL_SKILLS = ["confidence", "filler_words", "speaking_speed"]
+
+
+def _metric_score(metrics: Dict[str, Any], name: str) -> float:
+    """Read a verbal metric score that may be stored as {"score": n} or as a bare number"""
+    value = metrics.get(name, {})
+    score = value.get("score", 0) if isinstance(value, dict) else value
+    return score if isinstance(score, (int, float)) else 0
+
+
+def _pair_average(metrics: Dict[str, Any], first: str, second: str) -> Optional[float]:
+    """Average two verbal metrics, or None if neither is present/positive"""
+    if first not in metrics or second not in metrics:
+        return None
+    a = _metric_score(metrics, first)
+    b = _metric_score(metrics, second)
+    if a > 0 or b > 0:
+        return (a + b) / 2
+    return None
+
+
+def wpm_to_score(wpm: float) -> float:
+    """Convert words per minute into a 0-100 score based on distance from the ideal pace"""
+    return max(0, 100 - (abs(wpm - IDEAL_WPM) / 2))
+
+
+def get_words_per_minute(analytics: Dict[str, Any]) -> Optional[float]:
+    """Words per minute from a non-verbal report's analytics, if available"""
+    speaking_data = analytics.get("speakingStats")
+    if not isinstance(speaking_data, dict):
+        return None
+    if "totalWordsSpoken" in speaking_data and "totalSpeakingTime" in speaking_data:
+        total_time_seconds = speaking_data.get("totalSpeakingTime", 0)
+        if total_time_seconds > 0:
+            return (speaking_data.get("totalWordsSpoken", 0) / total_time_seconds) * 60
+        return None
+    wpm = speaking_data.get("wordsPerMinute")
+    return wpm if isinstance(wpm, (int, float)) else None
+
+
+def get_filler_percentage(analytics: Dict[str, Any]) -> Optional[float]:
+    """Filler word percentage from a non-verbal report's analytics, if available"""
+    filler_data = analytics.get("fillerWordsBreakdown")
+    if not isinstance(filler_data, dict) or "percentage" not in filler_data:
+        return None
+    try:
+        return float(filler_data.get("percentage", "0"))
+    except (ValueError, TypeError):
+        return None
+
+
+def extract_verbal_skill_scores(verbal_report: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """Skill scores (communication, technical_knowledge, clarity) from a verbal report"""
+    scores: Dict[str, float] = {}
+    if not verbal_report or "metrics" not in verbal_report:
+        return scores
+
+    metrics = verbal_report.get("metrics") or {}
+
+    # Communication: Average of response_structure and vocabulary_richness
+    communication = _pair_average(metrics, "response_structure", "vocabulary_richness")
+    if communication is not None:
+        scores["communication"] = communication
+
+    # Technical Knowledge: Average of domain_knowledge and concepts_understanding
+    technical = _pair_average(metrics, "domain_knowledge", "concepts_understanding")
+    if technical is not None:
+        scores["technical_knowledge"] = technical
+
+    # Clarity: Average of answer_correctness and depth_of_explanation
+    clarity = _pair_average(metrics, "answer_correctness", "depth_of_explanation")
+    if clarity is not None:
+        scores["clarity"] = clarity
+
+    return scores
+
+
+def extract_nonverbal_skill_scores(nonverbal_report: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """Skill scores (confidence, filler_words, speaking_speed) from a non-verbal report"""
+    scores: Dict[str, float] = {}
+    if not nonverbal_report or "analytics" not in nonverbal_report:
+        return scores
+
+    analytics = nonverbal_report.get("analytics") or {}
+
+    # Confidence: overallConfidence, falling back to voiceModulationScore
+    confidence_data = analytics.get("confidenceScores")
+    if isinstance(confidence_data, dict):
+        if "overallConfidence" in confidence_data:
+            conf_score = confidence_data["overallConfidence"]
+            if isinstance(conf_score, (int, float)):
+                scores["confidence"] = conf_score
+        elif "voiceModulationScore" in confidence_data:
+            voice_score = confidence_data.get("voiceModulationScore", 0)
+            if isinstance(voice_score, (int, float)):
+                scores["confidence"] = voice_score
+
+    # Filler words: 0% fillers = 100 score, 10% fillers = 0 score
+    filler_data = analytics.get("fillerWordsBreakdown")
+    if isinstance(filler_data, dict):
+        filler_pct = get_filler_percentage(analytics)
+        if filler_pct is not None:
+            scores["filler_words"] = max(0, 100 - (filler_pct * 10))
+        elif "percentage" not in filler_data:
+            if "totalCount" in filler_data:
+                if filler_data.get("totalCount", 0) == 0:
+                    scores["filler_words"] = 100
+            elif "fillerPercentage" in filler_data:
+                scores["filler_words"] = max(0, 100 - (filler_data.get("fillerPercentage", 0) * 2))
+
+    # Speaking speed: proximity to the ideal WPM
+    wpm = get_words_per_minute(analytics)
+    if wpm is not None:
+        scores["speaking_speed"] = wpm_to_score(wpm)
+
+    return scores
@@ -0,0 +1,413 @@
+# SkillEdge-API/benchmarks/bench_api.py
+"""
+Benchmark harness for the analytics and reports routers.
+
+Seeds a MongoDB database with synthetic users whose interviews carry verbal,
+non-verbal and overall reports shaped like the ones the frontend saves (and
+analytics.py parses), then drives the read and write endpoints concurrently
+and reports latency percentiles, Mongo commands per request and documents
+examined per request.
+
+Usage (from the Backend directory):
+    # Against a local mongod (uses a throwaway database, dropped afterwards)
+    python -m benchmarks.bench_api --users 20 --interviews 200 --concurrency 16 --requests 400
+
+    # Fully in-process with mongomock-motor (pip install mongomock-motor);
+    # no docs-examined numbers and no $dateTrunc support
+    python -m benchmarks.bench_api --mock
+
+Only the analytics and reports routers are mounted, so the LLM and the local
+question generation model are never loaded.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import string
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Callable
+
+import httpx
+from fastapi import FastAPI
+from pymongo import monitoring
+
+from app.database import mongodb, ensure_indexes
+from app.routers import analytics, reports
+from app.routers.auth import create_access_token
+
+ENDPOINTS = ["dashboard", "skill-trends", "progress-history", "user-interviews", "save-interview"]
+
+ROLES = ["Software Engineer", "DevOps Engineer", "Data Scientist", "Frontend Developer", "Product Manager"]
+INTERVIEW_TYPES = ["technical", "behavioral", "resume"]
+READINESS = ["not ready", "needs improvement", "ready", "excellent"]
+VERBAL_METRICS = [
+    "answer_correctness",
+    "concepts_understanding",
+    "domain_knowledge",
+    "response_structure",
+    "depth_of_explanation",
+    "vocabulary_richness",
+]
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts Mongo commands issued by the driver (find, aggregate, insert, getMore, ...)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(words)
+    ).capitalize() + "."
+
+
+def build_interview_payload(rng: random.Random, question_count: int = 5) -> Dict[str, Any]:
+    """A save-interview request body with realistic verbal / non-verbal / overall report shapes"""
+    questions = [_sentence(rng, 14) for _ in range(question_count)]
+    answers = [_sentence(rng, rng.randint(60, 160)) for _ in range(question_count)]
+
+    metric_scores = {name: rng.randint(35, 95) for name in VERBAL_METRICS}
+    verbal_score = round(statistics.mean(metric_scores.values()), 1)
+    verbal_report = {
+        "overall_score": verbal_score,
+        "summary": _sentence(rng, 40),
+        "metrics": {
+            "answer_correctness": {
+                "score": metric_scores["answer_correctness"],
+                "description": _sentence(rng, 20),
+                "details": [_sentence(rng, 15) for _ in range(question_count)],
+            },
+            "concepts_understanding": {
+                "score": metric_scores["concepts_understanding"],
+                "description": _sentence(rng, 20),
+                "key_concepts": [_sentence(rng, 2) for _ in range(4)],
+                "missing_concepts": [_sentence(rng, 2) for _ in range(3)],
+            },
+            "domain_knowledge": {
+                "score": metric_scores["domain_knowledge"],
+                "description": _sentence(rng, 20),
+                "strengths": [_sentence(rng, 6) for _ in range(3)],
+                "gaps": [_sentence(rng, 6) for _ in range(2)],
+            },
+            "response_structure": {
+                "score": metric_scores["response_structure"],
+                "description": _sentence(rng, 20),
+                "logical_flow": _sentence(rng, 12),
+                "completeness": _sentence(rng, 12),
+            },
+            "depth_of_explanation": {
+                "score": metric_scores["depth_of_explanation"],
+                "description": _sentence(rng, 20),
+                "examples_used": rng.random() > 0.5,
+                "technical_depth": rng.choice(["shallow", "moderate", "deep"]),
+            },
+            "vocabulary_richness": {
+                "score": metric_scores["vocabulary_richness"],
+                "description": _sentence(rng, 20),
+                "technical_terms_used": [_sentence(rng, 1) for _ in range(8)],
+                "repetitive_words": [_sentence(rng, 1) for _ in range(3)],
+                "vocabulary_level": rng.choice(["basic", "intermediate", "advanced"]),
+            },
+        },
+        "individual_answers": [
+            {
+                "question_number": i + 1,
+                "correctness": rng.randint(30, 100),
+                "strengths": [_sentence(rng, 8) for _ in range(2)],
+                "improvements": [_sentence(rng, 8) for _ in range(2)],
+                "key_points_covered": [_sentence(rng, 5) for _ in range(3)],
+                "missing_points": [_sentence(rng, 5) for _ in range(2)],
+            }
+            for i in range(question_count)
+        ],
+        "recommendations": [_sentence(rng, 12) for _ in range(4)],
+        "interview_readiness": rng.choice(READINESS),
+    }
+
+    total_time = rng.randint(120, 600)
+    total_words = int(total_time / 60 * rng.randint(90, 190))
+    filler_pct = round(rng.uniform(0, 8), 1)
+    overall_confidence = rng.randint(50, 95)
+    nonverbal_report = {
+        "analytics": {
+            "totalWords": total_words,
+            "totalTime": total_time,
+            "wordsPerMinute": round(total_words / total_time * 60),
+            "fillerWords": int(total_words * filler_pct / 100),
+            "fillerPercentage": str(filler_pct),
+            "questionCount": question_count,
+        },
+        "confidenceScores": {
+            "voiceModulationScore": rng.randint(50, 95),
+            "speechrate": rng.choice([65, 85]),
+            "fluency": rng.randint(50, 95),
+            "overallConfidence": overall_confidence,
+        },
+        "insights": {
+            "strengths": [_sentence(rng, 8) for _ in range(5)],
+            "improvements": [_sentence(rng, 8) for _ in range(5)],
+        },
+        "feedback": _sentence(rng, 40),
+        "pitchProfile": {"average": rng.randint(100, 250), "range": rng.randint(20, 90), "level": "medium", "trend": "stable", "consistency": rng.randint(40, 90)},
+        "voiceQuality": {"overall": "good", "score": rng.randint(50, 95), "clarity": rng.randint(50, 95), "warmth": rng.randint(50, 95)},
+        "fillerWordsBreakdown": {
+            "totalCount": int(total_words * filler_pct / 100),
+            "percentage": str(filler_pct),
+            "detectedWords": {"um": rng.randint(0, 10), "uh": rng.randint(0, 10), "like": rng.randint(0, 10)},
+            "categories": ["um", "uh", "like"],
+        },
+        "speakingStats": {
+            "totalSpeakingTime": total_time,
+            "totalWordsSpoken": total_words,
+            "questionsAnswered": question_count,
+            "avgWordsPerAnswer": total_words // question_count,
+        },
+    }
+
+    nonverbal_score = overall_confidence
+    overall_report = {
+        "overall_score": round((verbal_score + nonverbal_score) / 2, 1),
+        "verbal_score": verbal_score,
+        "nonverbal_score": nonverbal_score,
+        "interview_readiness": rng.choice(READINESS),
+        "correlations": {"verbal_nonverbal": round(rng.uniform(-1, 1), 2)},
+        "action_items": [{"title": _sentence(rng, 4), "description": _sentence(rng, 15)} for _ in range(3)],
+        "insights": {"summary": _sentence(rng, 25)},
+        "summary": _sentence(rng, 40),
+    }
+
+    return {
+        "interview_type": rng.choice(INTERVIEW_TYPES),
+        "role": rng.choice(ROLES),
+        "questions": questions,
+        "answers": answers,
+        "verbal_report": verbal_report,
+        "nonverbal_report": nonverbal_report,
+        "overall_report": overall_report,
+    }
+
+
+async def seed_database(db, users: int, interviews_per_user: int, seed: int) -> List[str]:
+    """Insert synthetic interviews and their three reports for each user; returns the user ids"""
+    rng = random.Random(seed)
+    user_ids = [f"bench-user-{i:04d}" for i in range(users)]
+    now = datetime.utcnow()
+
+    for user_id in user_ids:
+        interview_docs, verbal_docs, nonverbal_docs, overall_docs = [], [], [], []
+        for n in range(interviews_per_user):
+            payload = build_interview_payload(rng)
+            created_at = now - timedelta(minutes=(interviews_per_user - n) * rng.randint(60, 600))
+            interview_docs.append({
+                "user_id": user_id,
+                "interview_type": payload["interview_type"],
+                "role": payload["role"],
+                "questions": payload["questions"],
+                "answers": payload["answers"],
+                "created_at": created_at,
+            })
+            verbal_docs.append({**payload["verbal_report"], "user_id": user_id, "created_at": created_at})
+            nonverbal_docs.append({"user_id": user_id, "analytics": payload["nonverbal_report"], "created_at": created_at})
+            overall_docs.append({**payload["overall_report"], "user_id": user_id, "created_at": created_at})
+
+        result = await db["interview_reports"].insert_many(interview_docs)
+        for docs in (verbal_docs, nonverbal_docs, overall_docs):
+            for doc, inserted_id in zip(docs, result.inserted_ids):
+                doc["interview_id"] = str(inserted_id)
+        await db["verbal_reports"].insert_many(verbal_docs)
+        await db["nonverbal_reports"].insert_many(nonverbal_docs)
+        await db["overall_reports"].insert_many(overall_docs)
+
+    return user_ids
+
+
+def build_app() -> FastAPI:
+    """App with only the routers under test"""
+    app = FastAPI()
+    app.include_router(reports.router)
+    app.include_router(analytics.router)
+    return app
+
+
+def endpoint_request(endpoint: str, rng: random.Random) -> Callable[[httpx.AsyncClient, Dict[str, str]], Any]:
+    """Coroutine factory issuing one request against the named endpoint"""
+    if endpoint == "save-interview":
+        async def call(client, headers):
+            payload = build_interview_payload(rng)
+            payload["session_id"] = f"bench-{rng.getrandbits(64):x}"
+            return await client.post("/api/reports/save-interview", json=payload, headers=headers)
+        return call
+
+    paths = {
+        "dashboard": "/api/analytics/dashboard",
+        "skill-trends": "/api/analytics/skill-trends",
+        "progress-history": "/api/analytics/progress-history?days=3650",
+        "user-interviews": "/api/reports/user-interviews",
+    }
+
+    async def call(client, headers):
+        return await client.get(paths[endpoint], headers=headers)
+    return call
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    tokens: List[str],
+    total_requests: int,
+    concurrency: int,
+    rng: random.Random
+) -> Dict[str, Any]:
+    """Issue total_requests against one endpoint with bounded concurrency, spread across users"""
+    call = endpoint_request(endpoint, rng)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        headers = {"Authorization": f"Bearer {tokens[i % len(tokens)]}"}
+        async with semaphore:
+            start = time.perf_counter()
+            response = await call(client, headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total_requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "requests": total_requests,
+        "errors": errors,
+        "throughput": total_requests / wall if wall > 0 else 0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+async def docs_examined_per_request(
+    db,
+    client: httpx.AsyncClient,
+    endpoint: str,
+    tokens: List[str],
+    samples: int,
+    rng: random.Random
+) -> Optional[float]:
+    """Average docsExamined per request from the database profiler (real mongod only)"""
+    call = endpoint_request(endpoint, rng)
+    try:
+        await db.command("profile", 0)
+        await db["system.profile"].drop()
+        await db.command("profile", 2)
+    except Exception:
+        return None
+
+    try:
+        for i in range(samples):
+            await call(client, {"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+    finally:
+        await db.command("profile", 0)
+
+    pipeline = [
+        {"$match": {"ns": {"$regex": r"\.(interview_reports|verbal_reports|nonverbal_reports|overall_reports|user_goals)$"}}},
+        {"$group": {"_id": None, "docs": {"$sum": {"$ifNull": ["$docsExamined", 0]}}}},
+    ]
+    result = await db["system.profile"].aggregate(pipeline).to_list(length=1)
+    total = result[0]["docs"] if result else 0
+    return total / samples
+
+
+async def main(args):
+    command_counter = CommandCounter()
+
+    if args.mock:
+        from mongomock_motor import AsyncMongoMockClient
+        mongodb.client = AsyncMongoMockClient()
+    else:
+        # The listener is registered before the client is created so every command is counted
+        from motor.motor_asyncio import AsyncIOMotorClient
+        mongodb.client = AsyncIOMotorClient(args.mongo_url, maxPoolSize=max(10, args.concurrency), event_listeners=[command_counter])
+
+    db_name = f"skilledge_bench_{int(time.time())}"
+    mongodb.database = mongodb.client[db_name]
+    db = mongodb.database
+
+    try:
+        if not args.mock:
+            await ensure_indexes()
+
+        seed_start = time.perf_counter()
+        user_ids = await seed_database(db, args.users, args.interviews, args.seed)
+        print(f"🌱 Seeded {args.users} users x {args.interviews} interviews in {time.perf_counter() - seed_start:.1f}s ({db_name})")
+
+        tokens = [create_access_token({"sub": user_id}) for user_id in user_ids]
+        rng = random.Random(args.seed + 1)
+        endpoints = args.endpoints.split(",") if args.endpoints else ENDPOINTS
+
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            print(f"\n{'endpoint':<18}{'reqs':>6}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'cmds/req':>10}{'docs/req':>10}")
+            for endpoint in endpoints:
+                commands_before = command_counter.count
+                stats = await run_load(client, endpoint, tokens, args.requests, args.concurrency, rng)
+                commands_per_request = (command_counter.count - commands_before) / args.requests
+
+                docs = None
+                if not args.mock:
+                    docs = await docs_examined_per_request(db, client, endpoint, tokens, args.profile_samples, rng)
+
+                print(
+                    f"{endpoint:<18}{stats['requests']:>6}{stats['errors']:>5}{stats['throughput']:>9.1f}"
+                    f"{stats['p50']:>9.1f}{stats['p95']:>9.1f}{stats['p99']:>9.1f}"
+                    f"{(f'{commands_per_request:.1f}' if not args.mock else 'n/a'):>10}"
+                    f"{(f'{docs:.0f}' if docs is not None else 'n/a'):>10}"
+                )
+    finally:
+        if not args.keep:
+            await mongodb.client.drop_database(db_name)
+        mongodb.client.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the analytics and reports routers")
+    parser.add_argument("--mongo-url", default="mongodb://localhost:27017", help="MongoDB URL (ignored with --mock)")
+    parser.add_argument("--mock", action="store_true", help="Use mongomock-motor instead of a real mongod")
+    parser.add_argument("--users", type=int, default=10, help="Number of synthetic users")
+    parser.add_argument("--interviews", type=int, default=100, help="Interviews per user")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent in-flight requests")
+    parser.add_argument("--profile-samples", type=int, default=10, help="Sequential requests used to measure docs examined")
+    parser.add_argument("--endpoints", default="", help=f"Comma separated subset of: {','.join(ENDPOINTS)}")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for synthetic data")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark database afterwards")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,138 @@
+# SkillEdge-API/benchmarks/bench_embeddings.py
+"""
+Latency/throughput/memory report for the embedding backends.
+
+Each backend runs in its own subprocess so resident memory is measured in
+isolation: PyTorch + sentence-transformers, ONNX Runtime (fp32) and ONNX
+Runtime (int8 dynamic quantization). Reported per backend:
+    load s        model load time
+    RSS MB        process resident set size after load and warm-up
+    p50/p99 ms    single-query encode latency (the chat path)
+    texts/s       bulk throughput at --batch-size (the ingestion path)
+    cosine        min cosine similarity to the PyTorch embeddings
+
+Queries and passages come from QA_dataset.json (questions and answers).
+
+Usage (from the Backend directory, after `python -m app.chatbot.onnx_embeddings`):
+    python -m benchmarks.bench_embeddings --queries 200 --passages 512 --threads 4
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+BACKENDS = {
+    "torch": {"EMBEDDING_BACKEND": "torch"},
+    "onnx": {"EMBEDDING_BACKEND": "onnx", "EMBEDDING_ONNX_QUANTIZED": "0"},
+    "onnx-int8": {"EMBEDDING_BACKEND": "onnx", "EMBEDDING_ONNX_QUANTIZED": "1"},
+}
+
+
+def load_texts(path: str, queries: int, passages: int) -> Tuple[List[str], List[str]]:
+    with open(path, encoding="utf-8") as f:
+        items = [item for item in json.load(f) if item.get("question") and item.get("answer")]
+    if not items:
+        raise SystemExit(f"No question/answer items in {path}")
+    questions = [items[i % len(items)]["question"] for i in range(queries)]
+    answers = [items[i % len(items)]["answer"] for i in range(passages)]
+    return questions, answers
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_worker(args):
+    """Benchmark the backend selected by the environment; prints one JSON line"""
+    import psutil
+
+    from app.chatbot.embeddings import EmbeddingService
+
+    questions, answers = load_texts(args.dataset, args.queries, args.passages)
+    service = EmbeddingService()
+
+    start = time.perf_counter()
+    service.load()
+    load_seconds = time.perf_counter() - start
+    service.encode_batch(questions[:8])
+
+    latencies = []
+    query_embeddings = []
+    for question in questions:
+        start = time.perf_counter()
+        query_embeddings.append(service.encode_batch([question])[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    start = time.perf_counter()
+    service.encode_batch(answers, batch_size=args.batch_size)
+    throughput = len(answers) / (time.perf_counter() - start)
+
+    np.save(args.output, np.vstack(query_embeddings))
+    print(json.dumps({
+        "load_seconds": load_seconds,
+        "rss_mb": psutil.Process().memory_info().rss / 1e6,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "throughput": throughput,
+    }))
+
+
+def main(args):
+    print(f"🧮 {args.queries} single queries, {args.passages} passages at batch {args.batch_size}, {args.threads} thread(s)")
+    print(f"\n{'backend':<11}{'load s':>8}{'RSS MB':>9}{'p50 ms':>9}{'p99 ms':>9}{'texts/s':>10}{'cosine':>9}")
+
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in args.backends.split(","):
+            output = os.path.join(tmp, f"{backend}.npy")
+            env = {**os.environ, **BACKENDS[backend], "EMBEDDING_NUM_THREADS": str(args.threads)}
+            command = [
+                sys.executable, "-m", "benchmarks.bench_embeddings", "--worker",
+                "--dataset", args.dataset, "--queries", str(args.queries), "--passages", str(args.passages),
+                "--batch-size", str(args.batch_size), "--output", output,
+            ]
+            result = subprocess.run(command, env=env, capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{backend:<11}  failed: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else result.returncode}")
+                continue
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+
+            embeddings = np.load(output)
+            if backend == "torch":
+                reference = embeddings
+            cosine = f"{(embeddings * reference).sum(axis=1).min():.4f}" if reference is not None else "n/a"
+
+            print(
+                f"{backend:<11}{stats['load_seconds']:>8.2f}{stats['rss_mb']:>9.0f}"
+                f"{stats['p50_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['throughput']:>10.0f}{cosine:>9}"
+            )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the PyTorch and ONNX embedding backends")
+    parser.add_argument("--dataset", default="QA_dataset.json", help="Question/answer JSON used as queries and passages")
+    parser.add_argument("--queries", type=int, default=200, help="Single-text encodes for the latency percentiles")
+    parser.add_argument("--passages", type=int, default=512, help="Texts encoded in bulk for throughput")
+    parser.add_argument("--batch-size", type=int, default=64, help="Bulk encode batch size")
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8", help="Comma separated backends; torch first gives the cosine baseline")
+    parser.add_argument("--threads", type=int, default=1, help="Intra-op CPU threads")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.worker:
+        run_worker(args)
+    else:
+        main(args)
@@ -0,0 +1,131 @@
+# SkillEdge-API/benchmarks/bench_index.py
+"""
+Recall/latency report for the knowledge base index types.
+
+Builds every index type from app.chatbot.index_factory over the same
+vectors, runs single-query searches (the chatbot's access pattern) and
+compares each one against the exact flat index: recall@k, p50/p99 search
+latency, build time and serialized size.
+
+Usage (from the Backend directory):
+    # Synthetic clustered unit vectors shaped like MiniLM embeddings
+    python -m benchmarks.bench_index --vectors 100000 --queries 500
+
+    # Vectors from the stored knowledge base snapshot (must be a flat index)
+    python -m benchmarks.bench_index --from-kb
+
+No embedding model or LLM is loaded.
+"""
+
+import argparse
+import time
+from typing import List
+
+import faiss
+import numpy as np
+
+from app.chatbot import index_factory
+from app.chatbot.embeddings import EMBEDDING_DIMENSION
+
+
+def synthetic_vectors(n: int, dimension: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """L2-normalized vectors around random topic centroids (real embeddings are far from uniform)"""
+    centroids = rng.standard_normal((clusters, dimension)).astype("float32")
+    assignments = rng.integers(0, clusters, size=n)
+    vectors = centroids[assignments] + 0.6 * rng.standard_normal((n, dimension)).astype("float32")
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def knowledge_base_vectors() -> np.ndarray:
+    """Exact vectors of the stored knowledge base"""
+    from app.chatbot.kb_store import KnowledgeBaseStore
+
+    store = KnowledgeBaseStore("app/chatbot/faiss_index", "app/chatbot/knowledge_base")
+    stored = store.load()
+    if stored is None:
+        raise SystemExit("No stored knowledge base found")
+    index, _ = stored
+    if index_factory.index_kind(index) != "flat":
+        raise SystemExit("The stored index is approximate; exact vectors are only available from a flat index")
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def make_queries(vectors: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Perturbed corpus vectors, so queries have near (but not identical) neighbours"""
+    picks = vectors[rng.integers(0, len(vectors), size=count)]
+    queries = picks + 0.3 * rng.standard_normal(picks.shape).astype("float32") / np.sqrt(picks.shape[1])
+    faiss.normalize_L2(queries)
+    return queries
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main(args):
+    faiss.omp_set_num_threads(args.threads)
+    rng = np.random.default_rng(args.seed)
+
+    if args.from_kb:
+        vectors = knowledge_base_vectors()
+    else:
+        vectors = synthetic_vectors(args.vectors, EMBEDDING_DIMENSION, args.clusters, rng)
+    queries = make_queries(vectors, args.queries, rng)
+    print(f"🧮 {len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}, {args.threads} thread(s)")
+
+    # Approximate types are benchmarked at any size, regardless of the production threshold
+    index_factory.MIN_VECTORS = 0
+
+    ground_truth = None
+    print(f"\n{'index':<8}{'build s':>9}{'size MB':>9}{'p50 ms':>9}{'p99 ms':>9}{f'recall@{args.k}':>11}")
+    for index_type in args.types.split(","):
+        build_start = time.perf_counter()
+        try:
+            index = index_factory.build_index(vectors, index_type)
+        except RuntimeError as e:
+            # e.g. IVF-PQ needs at least 256 training vectors
+            print(f"{index_type:<8}  build failed: {e}")
+            continue
+        build_seconds = time.perf_counter() - build_start
+        size_mb = faiss.serialize_index(index).nbytes / 1e6
+
+        latencies = []
+        results = np.empty((len(queries), args.k), dtype="int64")
+        for i, query in enumerate(queries):
+            start = time.perf_counter()
+            _, ids = index.search(query.reshape(1, -1), args.k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results[i] = ids[0]
+        latencies.sort()
+
+        if index_type == "flat":
+            ground_truth = results
+        if ground_truth is not None:
+            hits = sum(len(set(results[i]) & set(ground_truth[i])) for i in range(len(queries)))
+            recall = f"{hits / ground_truth.size:.3f}"
+        else:
+            recall = "n/a"
+
+        print(
+            f"{index_type:<8}{build_seconds:>9.2f}{size_mb:>9.1f}"
+            f"{percentile(latencies, 50):>9.3f}{percentile(latencies, 99):>9.3f}{recall:>11}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare knowledge base index types against the flat baseline")
+    parser.add_argument("--vectors", type=int, default=100000, help="Synthetic corpus size")
+    parser.add_argument("--clusters", type=int, default=500, help="Topic clusters in the synthetic corpus")
+    parser.add_argument("--from-kb", action="store_true", help="Use the stored knowledge base vectors instead")
+    parser.add_argument("--queries", type=int, default=500, help="Number of single-vector searches per index")
+    parser.add_argument("--k", type=int, default=5, help="Neighbours per search")
+    parser.add_argument("--types", default="flat,hnsw,ivfpq", help="Comma separated index types; flat first gives the recall baseline")
+    parser.add_argument("--threads", type=int, default=1, help="FAISS OpenMP threads")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
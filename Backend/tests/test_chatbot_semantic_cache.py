@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+np = pytest.importorskip("numpy")
+service_module = pytest.importorskip("app.chatbot.service")
+
+from app.chatbot import semantic_cache as semantic_cache_module
+from app.chatbot.semantic_cache import SemanticCache
+from app.llm_client import LLMResponse
+
+DIMENSION = 4
+
+
+class FixedEmbeddingService:
+    """Every query maps to the same vector, so any cached answer would match"""
+
+    async def encode(self, text):
+        vector = np.zeros(DIMENSION, dtype="float32")
+        vector[0] = 1.0
+        return vector
+
+
+class NoIntents:
+    def route(self, query, embedding, user_reports):
+        return None
+
+
+class EchoLLM:
+    """Answers with the per-request part of the prompt (history, context, question)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        return LLMResponse(prompt.dynamic)
+
+
+def make_service():
+    service = service_module.ChatbotService.__new__(service_module.ChatbotService)
+    service.embedding_service = FixedEmbeddingService()
+    service.intent_router = NoIntents()
+    service.semantic_cache = SemanticCache(DIMENSION)
+    service.kb_version = 0
+    service.llm = EchoLLM()
+
+    async def no_context(query, query_embedding, top_k=3):
+        return []
+
+    service._hybrid_search = no_context
+    return service
+
+
+def test_answer_from_history_is_not_served_to_another_user():
+    service = make_service()
+    question = "What did I just say?"
+
+    first = asyncio.run(service.generate_response(
+        question,
+        conversation_history=[{"role": "user", "content": "My salary expectation is 90k"}],
+    ))
+    second = asyncio.run(service.generate_response(
+        question,
+        conversation_history=[{"role": "user", "content": "I applied for a frontend role"}],
+    ))
+    without_history = asyncio.run(service.generate_response(question))
+
+    assert "90k" in first
+    assert "90k" not in second
+    assert "90k" not in without_history
+    assert service.llm.calls == 3
+
+
+def test_answer_from_summary_is_not_cached():
+    service = make_service()
+
+    asyncio.run(service.generate_response(
+        "Remind me what we discussed",
+        conversation_summary="- user: prefers system design questions",
+    ))
+    answer = asyncio.run(service.generate_response("Remind me what we discussed"))
+
+    assert "system design" not in answer
+    assert service.llm.calls == 2
+
+
+def test_general_answer_is_cached():
+    service = make_service()
+
+    first = asyncio.run(service.generate_response("What is SkillEdge-AI?"))
+    second = asyncio.run(service.generate_response("What is SkillEdge-AI?"))
+
+    assert first == second
+    assert service.llm.calls == 1
+
+
+def test_expired_entry_does_not_hide_a_fresh_one(monkeypatch):
+    cache = SemanticCache(DIMENSION, ttl=10)
+    embedding = asyncio.run(FixedEmbeddingService().encode("What is SkillEdge-AI?"))
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache_module.time, "time", lambda: now[0])
+
+    cache.store(embedding, "What is SkillEdge-AI?", "old answer", kb_version=0)
+    now[0] += 11
+    assert cache.lookup(embedding, kb_version=0) is None
+
+    cache.store(embedding, "What is SkillEdge-AI?", "new answer", kb_version=0)
+    assert cache.lookup(embedding, kb_version=0) == "new answer"
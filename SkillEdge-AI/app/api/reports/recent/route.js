@@ -14,8 +14,12 @@ export async function GET(request) {
       );
     }
 
+    // Forward pagination params (limit, cursor, fields) to the backend
+    const { searchParams } = new URL(request.url);
+    const query = searchParams.toString();
+
     // Call the Python backend API with JWT token
-    const backendResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/reports/user-interviews`, {
+    const backendResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/reports/user-interviews${query ? `?${query}` : ''}`, {
       method: 'GET',
       headers: {
         'Authorization': `Bearer ${token}`,
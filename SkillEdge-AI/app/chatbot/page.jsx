@@ -24,6 +24,7 @@ const ChatbotPage = () => {
   ]);
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [streamingMessageId, setStreamingMessageId] = useState(null);
   const [conversationId, setConversationId] = useState(null);
   const [includeReports, setIncludeReports] = useState(false);
   const [conversations, setConversations] = useState([]);
@@ -79,7 +80,7 @@ const ChatbotPage = () => {
 
     try {
       const token = localStorage.getItem('auth_token');
-      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/chatbot/chat`, {
+      const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/chatbot/chat/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -92,22 +93,53 @@ const ChatbotPage = () => {
         }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error('Failed to send message');
       }
 
-      const data = await response.json();
-      
-      const assistantMessage = {
-        id: Date.now().toString() + '_assistant',
-        role: 'assistant',
-        content: data.message,
-        timestamp: new Date(data.timestamp),
-        sources: data.sources
-      };
+      // Read server-sent events and grow the assistant message as tokens arrive
+      const assistantId = Date.now().toString() + '_assistant';
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let finished = false;
+
+      while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
 
-      setMessages(prev => [...prev, assistantMessage]);
-      setConversationId(data.conversation_id);
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+
+        for (const rawEvent of events) {
+          if (!rawEvent.startsWith('data: ')) continue;
+          const event = JSON.parse(rawEvent.slice(6));
+
+          if (event.type === 'start') {
+            setConversationId(event.conversation_id);
+            setStreamingMessageId(assistantId);
+            setMessages(prev => [...prev, {
+              id: assistantId,
+              role: 'assistant',
+              content: '',
+              timestamp: new Date(),
+              sources: event.sources
+            }]);
+          } else if (event.type === 'token') {
+            setMessages(prev => prev.map(msg =>
+              msg.id === assistantId ? { ...msg, content: msg.content + event.content } : msg
+            ));
+          } else if (event.type === 'done') {
+            setMessages(prev => prev.map(msg =>
+              msg.id === assistantId ? { ...msg, timestamp: new Date(event.timestamp) } : msg
+            ));
+            finished = true;
+          } else if (event.type === 'error') {
+            throw new Error(event.detail);
+          }
+        }
+      }
 
     } catch (error) {
       console.error('Error sending message:', error);
@@ -124,6 +156,7 @@ const ChatbotPage = () => {
       setMessages(prev => [...prev, errorMessage]);
     } finally {
       setIsLoading(false);
+      setStreamingMessageId(null);
     }
   };
 
@@ -369,7 +402,7 @@ const ChatbotPage = () => {
                       </motion.div>
                     ))}
                     
-                    {isLoading && (
+                    {isLoading && !streamingMessageId && (
                       <motion.div
                         initial={{ opacity: 0, y: 10 }}
                         animate={{ opacity: 1, y: 0 }}
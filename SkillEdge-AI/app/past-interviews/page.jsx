@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useRouter } from "next/navigation";
 import { motion } from "framer-motion";
 import { 
@@ -19,17 +19,40 @@ import { toast } from "sonner";
 export default function PastInterviewsPage() {
   const [interviews, setInterviews] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [filterType, setFilterType] = useState("all");
+  const latestRequest = useRef(0);
   const router = useRouter();
 
+  // Wait for the user to stop typing before querying the backend
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(searchTerm.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  // Search and type filter run server-side, so a change restarts from the first page
   useEffect(() => {
     fetchInterviews();
-  }, []);
+  }, [debouncedSearch, filterType]);
 
-  const fetchInterviews = async () => {
+  const fetchInterviews = async (cursor = null) => {
+    const requestId = ++latestRequest.current;
     try {
-      const response = await fetch("/api/reports/recent", {
+      const params = new URLSearchParams({ limit: "20" });
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
+      if (debouncedSearch) {
+        params.set("search", debouncedSearch);
+      }
+      if (filterType !== "all") {
+        params.set("interview_type", filterType);
+      }
+
+      const response = await fetch(`/api/reports/recent?${params.toString()}`, {
         headers: {
           "Content-Type": "application/json",
         },
@@ -40,7 +63,11 @@ export default function PastInterviewsPage() {
       }
 
       const data = await response.json();
-      setInterviews(data.reports || []);
+      // A newer request (filters changed) supersedes this one
+      if (requestId !== latestRequest.current) return;
+      const page = data.reports || [];
+      setInterviews((prev) => (cursor ? [...prev, ...page] : page));
+      setNextCursor(data.next_cursor || null);
     } catch (error) {
       console.error("Error fetching interviews:", error);
       toast.error("Failed to load past interviews");
@@ -49,16 +76,12 @@ export default function PastInterviewsPage() {
     }
   };
 
-  const filteredInterviews = interviews.filter((interview) => {
-    const matchesSearch = 
-      interview.role?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      interview.interview_type?.toLowerCase().includes(searchTerm.toLowerCase());
-    
-    const matchesFilter = 
-      filterType === "all" || interview.interview_type === filterType;
-
-    return matchesSearch && matchesFilter;
-  });
+  const loadMoreInterviews = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    await fetchInterviews(nextCursor);
+    setLoadingMore(false);
+  };
 
   const getInterviewTypeColor = (type) => {
     switch (type) {
@@ -186,7 +209,7 @@ export default function PastInterviewsPage() {
         </motion.div>
 
         {/* Interviews Grid */}
-        {filteredInterviews.length === 0 ? (
+        {interviews.length === 0 ? (
           <motion.div
             initial={{ opacity: 0 }}
             animate={{ opacity: 1 }}
@@ -216,7 +239,7 @@ export default function PastInterviewsPage() {
             animate="visible"
             className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6"
           >
-            {filteredInterviews.map((interview, index) => (
+            {interviews.map((interview, index) => (
               <motion.div
                 key={interview._id}
                 variants={itemVariants}
@@ -256,7 +279,7 @@ export default function PastInterviewsPage() {
                 <div className="flex items-center gap-4 text-gray-400 text-sm">
                   <div className="flex items-center gap-1">
                     <FileText className="w-4 h-4" />
-                    <span>{interview.questions?.length || 0} Questions</span>
+                    <span>{interview.question_count ?? interview.questions?.length ?? 0} Questions</span>
                   </div>
                   <div className="flex items-center gap-1">
                     <Clock className="w-4 h-4" />
@@ -274,7 +297,21 @@ export default function PastInterviewsPage() {
             ))}
           </motion.div>
         )}
+
+        {/* Load More */}
+        {!loading && nextCursor && (
+          <div className="flex justify-center mt-8">
+            <button
+              onClick={loadMoreInterviews}
+              disabled={loadingMore}
+              className="flex items-center gap-2 px-6 py-2 rounded-lg bg-indigo-600 hover:bg-indigo-500 text-white disabled:opacity-50 transition-colors"
+            >
+              {loadingMore && <Loader2 className="w-4 h-4 animate-spin" />}
+              Load more
+            </button>
+          </div>
+        )}
       </motion.div>
     </div>
   );
-}
\ No newline at end of file
+}